@@ -0,0 +1,33 @@
+"""
+Build the template database cloned on first start.
+
+Runs the schema, the default data and all migrations once, so new
+installations copy a ready database instead of running the scripts.
+Run again whenever a script in sql/ changes.
+
+Usage:
+    python build_template.py [--output PATH]
+"""
+import argparse
+import os
+from database_module import DatabaseModule
+
+SQL_PATH: str = os.path.join(
+    os.path.dirname(os.path.realpath(__file__)), "sql")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--output",
+                        default=os.path.join(SQL_PATH, "template.sqlite"))
+    args = parser.parse_args()
+
+    DatabaseModule.build_template(
+        os.path.join(SQL_PATH, "init_schema.sql"),
+        os.path.join(SQL_PATH, "standard_data.sql"),
+        args.output)
+    print(f"Template written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,13 @@
+import hashlib
+import json
+import math
+from collections import Counter
+from collections.abc import Callable
 from enum import Enum
-from typing import Any, cast
+from typing import Any
 import numpy as np
 from scipy.interpolate import CubicSpline
-from scipy.optimize import curve_fit, brentq
+from scipy.optimize import curve_fit
 
 
 class FitType(Enum):
@@ -19,11 +24,838 @@ class FitType(Enum):
     POWER_LAW = 8      # y = a * x^b
 
 
+class InverseTable:
+    """
+    Dense deflection to tension table of a fitted model, answering
+    lookups by binary search and monotone cubic (Fritsch-Carlson)
+    interpolation in O(log n).
+
+    The table spans the deflection extrapolation range on an even grid.
+    Its size is doubled until the interpolated tension at every cell
+    midpoint is within ``tolerance`` of the exact inverse, or until
+    ``max_size`` is reached. Cells failing the check, like cells around
+    a jump of the inverse or without a solution, are answered by the
+    exact solver instead. A jump occurs where the lowest tension of a
+    non-monotone model moves to another monotone piece.
+    ``error_bound`` is the largest midpoint error of the interpolated
+    cells, at most ``tolerance``.
+
+    :param solve:
+        Exact vectorized inverse, NaN where there is no tension.
+    :param d_lower: Lowest deflection of the table.
+    :param d_upper: Highest deflection of the table.
+    :param tolerance: Allowed interpolation error in Newtons.
+    :param size: Initial number of grid points.
+    :param max_size: Largest number of grid points.
+    """
+
+    def __init__(self,
+                 solve: Callable[[np.ndarray], np.ndarray],
+                 d_lower: float,
+                 d_upper: float,
+                 tolerance: float,
+                 size: int,
+                 max_size: int) -> None:
+        self.__solve = solve
+        self.__d_lower: float = d_lower
+        self.__d_upper: float = d_upper
+        self.error_bound: float = 0.0
+        with np.errstate(invalid="ignore"):
+            while True:
+                self.__build(size)
+                error: np.ndarray = self.__midpoint_error()
+                inexact: np.ndarray = error > tolerance
+                if size >= max_size or not inexact.any():
+                    break
+                size = 2 * size - 1
+            # Comparisons with NaN are False, so unchecked cells count too
+            self.__exact: np.ndarray = ~(error <= tolerance)
+            checked: np.ndarray = error[~self.__exact]
+            self.error_bound = float(checked.max()) if checked.size else 0.0
+
+    def __len__(self) -> int:
+        return len(self.__deflections)
+
+    def __build(self, size: int) -> None:
+        """
+        Tabulate the exact inverse and its Fritsch-Carlson slopes.
+        """
+        self.__deflections: np.ndarray = np.linspace(
+            self.__d_lower, self.__d_upper, size)
+        self.__step: float = float(
+            self.__deflections[1] - self.__deflections[0])
+        self.__tensions: np.ndarray = self.__solve(self.__deflections)
+        secants: np.ndarray = np.diff(self.__tensions) / self.__step
+        slopes: np.ndarray = np.zeros(size)
+        slopes[0] = secants[0]
+        slopes[-1] = secants[-1]
+        before: np.ndarray = secants[:-1]
+        after: np.ndarray = secants[1:]
+        # Harmonic mean of the neighbouring secants keeps every cell
+        # monotone, a change of direction gets a flat slope
+        same_direction: np.ndarray = before * after > 0
+        with np.errstate(divide="ignore"):
+            slopes[1:-1] = np.where(
+                same_direction, 2.0 / (1.0 / before + 1.0 / after), 0.0)
+        # Keep NaN cells NaN, so they are never interpolated
+        slopes[1:-1][np.isnan(before) | np.isnan(after)] = np.nan
+        self.__slopes: np.ndarray = slopes
+
+    def __midpoint_error(self) -> np.ndarray:
+        """
+        Return the interpolation error at the midpoint of every cell,
+        NaN where the exact inverse or the table has no tension.
+        """
+        midpoints: np.ndarray = self.__deflections[:-1] + 0.5 * self.__step
+        cells: np.ndarray = np.arange(len(midpoints))
+        return np.abs(self.__interpolate(midpoints, cells)
+                      - self.__solve(midpoints))
+
+    def __interpolate(self,
+                      deflections: np.ndarray,
+                      cells: np.ndarray) -> np.ndarray:
+        """
+        Evaluate the cubic Hermite interpolant of the given cells.
+        """
+        s: np.ndarray = (deflections - self.__deflections[cells]) / self.__step
+        t0: np.ndarray = self.__tensions[cells]
+        t1: np.ndarray = self.__tensions[cells + 1]
+        m0: np.ndarray = self.__slopes[cells] * self.__step
+        m1: np.ndarray = self.__slopes[cells + 1] * self.__step
+        s2: np.ndarray = s * s
+        s3: np.ndarray = s2 * s
+        return ((2 * s3 - 3 * s2 + 1) * t0 + (s3 - 2 * s2 + s) * m0
+                + (3 * s2 - 2 * s3) * t1 + (s3 - s2) * m1)
+
+    def lookup(self, deflections: np.ndarray) -> np.ndarray:
+        """
+        Return the tensions of the given deflections, NaN outside the
+        table or where there is no tension.
+
+        :param deflections: The deflections (in mm).
+        :type deflections: np.ndarray
+        :return: The tensions (in Newtons).
+        :rtype: np.ndarray
+        """
+        deflections = np.asarray(deflections, dtype=float)
+        tensions: np.ndarray = np.full(deflections.shape, np.nan)
+        inside: np.ndarray = ((deflections >= self.__d_lower) &
+                              (deflections <= self.__d_upper))
+        values: np.ndarray = deflections[inside]
+        cells: np.ndarray = np.clip(
+            np.searchsorted(self.__deflections, values, side="right") - 1,
+            0, len(self.__deflections) - 2)
+        exact: np.ndarray = self.__exact[cells]
+        found: np.ndarray = np.empty(values.shape)
+        found[~exact] = self.__interpolate(values[~exact], cells[~exact])
+        if exact.any():
+            found[exact] = self.__solve(values[exact])
+        tensions[inside] = found
+        return tensions
+
+    def lookup_one(self, deflection: float) -> float:
+        """
+        Scalar :meth:`lookup` without the array overhead.
+
+        :param deflection: The deflection (in mm).
+        :type deflection: float
+        :return: The tension (in Newtons), NaN if there is none.
+        :rtype: float
+        """
+        if not self.__d_lower <= deflection <= self.__d_upper:
+            return np.nan
+        cell: int = min(max(int(np.searchsorted(
+            self.__deflections, deflection, side="right")) - 1, 0),
+            len(self.__deflections) - 2)
+        if self.__exact[cell]:
+            return float(self.__solve(np.array([deflection]))[0])
+        s: float = (deflection - float(self.__deflections[cell])) / self.__step
+        t0: float = float(self.__tensions[cell])
+        t1: float = float(self.__tensions[cell + 1])
+        m0: float = float(self.__slopes[cell]) * self.__step
+        m1: float = float(self.__slopes[cell + 1]) * self.__step
+        return ((2 * s - 3) * s * s * (t0 - t1) + t0
+                + ((s - 2) * s + 1) * s * m0 + (s - 1) * s * s * m1)
+
+
+class FitModel:
+    """
+    A fitted tension–deflection model. The extrapolation bounds are
+    computed once, ``predict``, ``derivative`` and ``invert`` work on
+    arrays. Polynomial and spline models answer :meth:`tension` from
+    an :class:`InverseTable` built on first use.
+
+    Models pickle and serialize to JSON through :meth:`to_dict`, without
+    their inverse table.
+
+    :param fit_type: The FitType of the model.
+    :param t_min: Minimum tension in the fitted data.
+    :param t_max: Maximum tension in the fitted data.
+    :param d_min: Minimum deflection in the fitted data.
+    :param d_max: Maximum deflection in the fitted data.
+    :param extrapolation_factor:
+        Fraction of the tension and deflection ranges to allow for
+        extrapolation beyond the fitted data.
+    """
+
+    __slots__ = ("fit_type", "t_min", "t_max", "d_min", "d_max",
+                 "extrapolation_factor", "t_lower", "t_upper",
+                 "d_lower", "d_upper", "__inverse_table")
+
+    # Iteration cap and relative tolerance of the vectorized root search,
+    # every iteration at least halves the bracket
+    INVERT_MAX_ITERATIONS: int = 60
+    INVERT_TOLERANCE: float = 1e-12
+    # Allowed interpolation error of the inverse tables in Newtons,
+    # and their initial and largest number of grid points
+    INVERSE_TABLE_TOLERANCE: float = 0.01
+    INVERSE_TABLE_SIZE: int = 257
+    INVERSE_TABLE_MAX_SIZE: int = 4097
+    # Models with a closed form inverse need no inverse table
+    CLOSED_FORM: bool = False
+
+    def __init__(self,
+                 fit_type: FitType,
+                 t_min: float,
+                 t_max: float,
+                 d_min: float,
+                 d_max: float,
+                 extrapolation_factor: float) -> None:
+        self.fit_type: FitType = fit_type
+        self.t_min: float = t_min
+        self.t_max: float = t_max
+        self.d_min: float = d_min
+        self.d_max: float = d_max
+        self.extrapolation_factor: float = extrapolation_factor
+        t_margin: float = extrapolation_factor * (t_max - t_min)
+        d_margin: float = extrapolation_factor * (d_max - d_min)
+        self.t_lower: float = t_min - t_margin
+        self.t_upper: float = t_max + t_margin
+        self.d_lower: float = d_min - d_margin
+        self.d_upper: float = d_max + d_margin
+        self.__inverse_table: InverseTable | None = None
+
+    def predict(self, tensions: np.ndarray) -> np.ndarray:
+        """
+        Return the deflections (in mm) of the given tensions (in Newtons).
+        """
+        raise NotImplementedError
+
+    def derivative(self, tensions: np.ndarray) -> np.ndarray:
+        """
+        Return the slope of the deflection over tension (in mm/N)
+        at the given tensions.
+        """
+        raise NotImplementedError
+
+    def critical_points(self) -> np.ndarray:
+        """
+        Return the tensions where the derivative is zero, the model is
+        monotone between them.
+        """
+        return np.empty(0)
+
+    def invert(self, deflections: np.ndarray) -> np.ndarray:
+        """
+        Return the tensions of an array of deflections. Deflections
+        outside the extrapolation range and deflections without a
+        solution give NaN.
+
+        Unless the model has a closed form inverse, it is split into
+        monotone pieces at its critical points, every piece is solved
+        for all deflections at once with a bracketed Newton iteration.
+        Where a deflection is reached more than once in the allowed
+        tension range, the lowest tension is returned.
+
+        :param deflections: The deflections (in mm).
+        :type deflections: np.ndarray
+        :return: The tensions (in Newtons).
+        :rtype: np.ndarray
+        """
+        deflections = np.asarray(deflections, dtype=float)
+        tensions: np.ndarray = np.full(deflections.shape, np.nan)
+        # NaN deflections fail both comparisons
+        valid: np.ndarray = ((deflections >= self.d_lower) &
+                             (deflections <= self.d_upper))
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            tensions[valid] = self._solve(deflections[valid])
+        # NaN tensions fail both comparisons and stay NaN
+        tensions[(tensions < self.t_lower) | (tensions > self.t_upper)] = (
+            np.nan)
+        return tensions
+
+    def tension(self, deflection: float) -> float | None:
+        """
+        Return the tension of a single deflection, from the inverse
+        table where the model has one.
+
+        :param deflection: The deflection (in mm).
+        :type deflection: float
+        :return:
+            The tension (in Newtons), or None if out of extrapolation
+            range or no real solution is available.
+        :rtype: float or None
+        """
+        table: InverseTable | None = self.get_inverse_table()
+        tension: float = (
+            table.lookup_one(deflection) if table is not None
+            else float(self.invert(np.array([deflection], dtype=float))[0]))
+        return None if np.isnan(tension) else tension
+
+    def get_inverse_table(self) -> InverseTable | None:
+        """
+        Return the inverse table, building it on first use.
+
+        :return: The table, None for models with a closed form inverse.
+        :rtype: InverseTable | None
+        """
+        if self.CLOSED_FORM:
+            return None
+        if self.__inverse_table is None:
+            self.__inverse_table = InverseTable(
+                self.invert, self.d_lower, self.d_upper,
+                self.INVERSE_TABLE_TOLERANCE,
+                self.INVERSE_TABLE_SIZE,
+                self.INVERSE_TABLE_MAX_SIZE)
+        return self.__inverse_table
+
+    def params(self) -> dict[str, Any]:
+        """
+        Return the model parameters as JSON compatible values.
+        """
+        raise NotImplementedError
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Return the model as JSON compatible dictionary,
+        restored by :meth:`from_dict`.
+        """
+        return {
+            "fit_type": self.fit_type.value,
+            "t_min": self.t_min,
+            "t_max": self.t_max,
+            "d_min": self.d_min,
+            "d_max": self.d_max,
+            "extrapolation_factor": self.extrapolation_factor,
+            **self.params()
+        }
+
+    def to_json(self) -> str:
+        """
+        Serialize the model as JSON, restored by :meth:`from_json`.
+        """
+        return json.dumps(self.to_dict())
+
+    @staticmethod
+    def from_dict(params: dict[str, Any]) -> "FitModel":
+        """
+        Restore a model from :meth:`to_dict`.
+
+        :param params: The dictionary representation.
+        :type params: dict[str, Any]
+        :return: The model.
+        :rtype: FitModel
+        :raises ValueError: If the fit type is unknown.
+        """
+        fit_type: FitType = FitType(params["fit_type"])
+        limits: tuple[float, ...] = tuple(float(params[key]) for key in (
+            "t_min", "t_max", "d_min", "d_max", "extrapolation_factor"))
+        model: np.ndarray = np.asarray(params["model"], dtype=float)
+        match fit_type:
+            case (FitType.LINEAR |
+                  FitType.QUADRATIC |
+                  FitType.CUBIC |
+                  FitType.QUARTIC):
+                return PolynomialModel(*limits, model)
+            case FitType.SPLINE:
+                return SplineModel(*limits, CubicSpline.construct_fast(
+                    model, np.asarray(params["breakpoints"], dtype=float)))
+            case FitType.EXPONENTIAL:
+                return ExponentialModel(*limits, *map(float, model))
+            case FitType.LOGARITHMIC:
+                return LogarithmicModel(*limits, *map(float, model))
+            case FitType.POWER_LAW:
+                return PowerLawModel(*limits, *map(float, model))
+        raise ValueError(f"Unsupported FitType: {fit_type}")
+
+    @staticmethod
+    def from_json(params: str) -> "FitModel":
+        """
+        Restore a model serialized by :meth:`to_json`.
+        """
+        return FitModel.from_dict(json.loads(params))
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        # Pickle the parameters only, the inverse table is rebuilt
+        return FitModel.from_dict, (self.to_dict(),)
+
+    def _solve(self, deflections: np.ndarray) -> np.ndarray:
+        """
+        Solve predict(t) = d on the allowed tension range for every
+        deflection, see :meth:`invert`.
+        """
+        inner: np.ndarray = self.critical_points()
+        inner = inner[(inner > self.t_lower) & (inner < self.t_upper)]
+        edges: np.ndarray = np.unique(
+            np.concatenate(([self.t_lower], inner, [self.t_upper])))
+        tolerance: float = self.INVERT_TOLERANCE * (
+            self.t_upper - self.t_lower)
+        result: np.ndarray = np.full(deflections.shape, np.nan)
+
+        for left, right in zip(edges[:-1], edges[1:]):
+            f_left: float = float(self.predict(left))
+            f_right: float = float(self.predict(right))
+            pending: np.ndarray = (
+                np.isnan(result) &
+                (deflections >= min(f_left, f_right)) &
+                (deflections <= max(f_left, f_right)))
+            if not pending.any():
+                continue
+            targets: np.ndarray = deflections[pending]
+            if f_left == f_right:
+                result[pending] = left
+                continue
+
+            rising: bool = f_right > f_left
+            low: np.ndarray = np.full(targets.shape, left)
+            high: np.ndarray = np.full(targets.shape, right)
+            # Start from the chord through both ends
+            t: np.ndarray = left + (targets - f_left) * (
+                (right - left) / (f_right - f_left))
+            for _ in range(self.INVERT_MAX_ITERATIONS):
+                residual: np.ndarray = self.predict(t) - targets
+                # Shrink the bracket to the side holding the root
+                above: np.ndarray = (residual > 0) == rising
+                high = np.where(above, t, high)
+                low = np.where(above, low, t)
+                t_next: np.ndarray = t - residual / self.derivative(t)
+                outside: np.ndarray = ~((t_next >= low) & (t_next <= high))
+                t_next = np.where(outside, 0.5 * (low + high), t_next)
+                converged: bool = bool(
+                    np.all(np.abs(t_next - t) <= tolerance))
+                t = t_next
+                if converged:
+                    break
+            result[pending] = t
+        return result
+
+
+class PolynomialModel(FitModel):
+    """
+    Polynomial of degree 1 to 4, the degree gives the FitType.
+
+    :param coefficients: Coefficients as returned by np.polyfit.
+    """
+
+    __slots__ = ("coefficients", "__slope")
+
+    def __init__(self,
+                 t_min: float,
+                 t_max: float,
+                 d_min: float,
+                 d_max: float,
+                 extrapolation_factor: float,
+                 coefficients: np.ndarray) -> None:
+        super().__init__(FitType(len(coefficients) - 1),
+                         t_min, t_max, d_min, d_max, extrapolation_factor)
+        self.coefficients: np.ndarray = np.asarray(coefficients, dtype=float)
+        self.__slope: np.ndarray = np.polyder(self.coefficients)
+
+    def predict(self, tensions: np.ndarray) -> np.ndarray:
+        return np.polyval(self.coefficients, tensions)
+
+    def derivative(self, tensions: np.ndarray) -> np.ndarray:
+        return np.polyval(self.__slope, tensions)
+
+    def critical_points(self) -> np.ndarray:
+        roots: np.ndarray = np.roots(self.__slope)
+        return roots[np.abs(roots.imag) < 1e-14].real
+
+    def params(self) -> dict[str, Any]:
+        return {"model": self.coefficients.tolist()}
+
+
+class SplineModel(FitModel):
+    """
+    Cubic spline through the measured points.
+
+    :param spline: The fitted CubicSpline.
+    """
+
+    __slots__ = ("spline", "__slope")
+
+    def __init__(self,
+                 t_min: float,
+                 t_max: float,
+                 d_min: float,
+                 d_max: float,
+                 extrapolation_factor: float,
+                 spline: CubicSpline) -> None:
+        super().__init__(FitType.SPLINE,
+                         t_min, t_max, d_min, d_max, extrapolation_factor)
+        self.spline: CubicSpline = spline
+        self.__slope = spline.derivative()
+
+    def predict(self, tensions: np.ndarray) -> np.ndarray:
+        return self.spline(tensions)
+
+    def derivative(self, tensions: np.ndarray) -> np.ndarray:
+        return self.__slope(tensions)
+
+    def critical_points(self) -> np.ndarray:
+        roots: np.ndarray = self.__slope.roots(
+            discontinuity=False, extrapolate=True)
+        return roots[np.isfinite(roots)]
+
+    def params(self) -> dict[str, Any]:
+        # Breakpoints and piecewise coefficients restore the spline
+        # without refitting
+        return {"breakpoints": self.spline.x.tolist(),
+                "model": self.spline.c.tolist()}
+
+
+class TwoParameterModel(FitModel):
+    """
+    Base of the models with parameters a and b and a closed form inverse.
+    """
+
+    __slots__ = ("a", "b")
+
+    CLOSED_FORM: bool = True
+    FIT_TYPE: FitType
+
+    def __init__(self,
+                 t_min: float,
+                 t_max: float,
+                 d_min: float,
+                 d_max: float,
+                 extrapolation_factor: float,
+                 a: float,
+                 b: float) -> None:
+        super().__init__(self.FIT_TYPE,
+                         t_min, t_max, d_min, d_max, extrapolation_factor)
+        self.a: float = a
+        self.b: float = b
+
+    def params(self) -> dict[str, Any]:
+        return {"model": [self.a, self.b]}
+
+
+class ExponentialModel(TwoParameterModel):
+    """
+    d = a * exp(b * t)
+    """
+
+    __slots__ = ()
+
+    FIT_TYPE: FitType = FitType.EXPONENTIAL
+
+    def predict(self, tensions: np.ndarray) -> np.ndarray:
+        return self.a * np.exp(self.b * tensions)
+
+    def derivative(self, tensions: np.ndarray) -> np.ndarray:
+        return self.a * self.b * np.exp(self.b * tensions)
+
+    def _solve(self, deflections: np.ndarray) -> np.ndarray:
+        tensions: np.ndarray = np.full(deflections.shape, np.nan)
+        if self.a > 0 and self.b != 0:
+            positive: np.ndarray = deflections > 0
+            tensions[positive] = np.log(
+                deflections[positive] / self.a) / self.b
+        return tensions
+
+
+class LogarithmicModel(TwoParameterModel):
+    """
+    d = a + b * ln(t), NaN for tensions <= 0
+    """
+
+    __slots__ = ()
+
+    FIT_TYPE: FitType = FitType.LOGARITHMIC
+
+    def predict(self, tensions: np.ndarray) -> np.ndarray:
+        safe_tensions = np.where(tensions <= 0, np.nan, tensions)
+        return self.a + self.b * np.log(safe_tensions)
+
+    def derivative(self, tensions: np.ndarray) -> np.ndarray:
+        safe_tensions = np.where(tensions <= 0, np.nan, tensions)
+        return self.b / safe_tensions
+
+    def _solve(self, deflections: np.ndarray) -> np.ndarray:
+        if self.b == 0:
+            return np.full(deflections.shape, np.nan)
+        tensions: np.ndarray = np.exp((deflections - self.a) / self.b)
+        tensions[tensions <= 0] = np.nan
+        return tensions
+
+
+class PowerLawModel(TwoParameterModel):
+    """
+    d = a * t^b, NaN for tensions < 0
+    """
+
+    __slots__ = ()
+
+    FIT_TYPE: FitType = FitType.POWER_LAW
+
+    def predict(self, tensions: np.ndarray) -> np.ndarray:
+        safe_tensions = np.where(tensions < 0, np.nan, tensions)
+        return self.a * (safe_tensions ** self.b)
+
+    def derivative(self, tensions: np.ndarray) -> np.ndarray:
+        safe_tensions = np.where(tensions < 0, np.nan, tensions)
+        return self.a * self.b * (safe_tensions ** (self.b - 1))
+
+    def _solve(self, deflections: np.ndarray) -> np.ndarray:
+        tensions: np.ndarray = np.full(deflections.shape, np.nan)
+        if self.a > 0 and self.b != 0:
+            positive: np.ndarray = deflections > 0
+            tensions[positive] = (
+                (deflections[positive] / self.a) ** (1.0 / self.b))
+        return tensions
+
+
+class IncrementalPolynomialFit:
+    """
+    Least-squares polynomial fit updated one point at a time.
+
+    Keeps the triangular factor R of the QR decomposition of the
+    Vandermonde matrix and Q^T applied to the deflections. Adding a
+    point rotates its row into R with Givens rotations, removing one
+    downdates R like LINPACK dchdd. Both cost O(degree²), as does the
+    back substitution for the coefficients. The result equals
+    np.polyfit of the same points up to rounding.
+
+    The factor holds at most 5x5 values, so it is kept in Python lists,
+    which beats numpy's per call overhead at that size.
+    Tensions are centred and scaled before building the rows to keep R
+    well conditioned. Downdates lose some accuracy, so the factor is
+    rebuilt from the held points once the removals since the last
+    rebuild exceed both REBUILD_REMOVALS and the number of points,
+    keeping removals O(degree²) amortized. A removal that would leave
+    the factor rank deficient rebuilds it as well.
+
+    :param degree: Degree of the polynomial.
+    :param center: Tension subtracted before scaling (N).
+    :param scale: Tension span mapped to 1 (N).
+    """
+
+    # Minimum removals before the factor is rebuilt from the held points
+    REBUILD_REMOVALS: int = 32
+
+    def __init__(self,
+                 degree: int,
+                 center: float = 1000.0,
+                 scale: float = 500.0) -> None:
+        self.degree: int = degree
+        self.__size: int = degree + 1
+        self.__center: float = center
+        self.__scale: float = scale
+        self.__points: Counter[tuple[float, float]] = Counter()
+        self.__count: int = 0
+        # Points per distinct tension, the polynomial is determined
+        # by at least degree + 1 of them
+        self.__tensions: Counter[float] = Counter()
+        self.__removals: int = 0
+        self.__r: list[list[float]] = [[0.0] * self.__size
+                                       for _ in range(self.__size)]
+        self.__z: list[float] = [0.0] * self.__size
+
+    def __len__(self) -> int:
+        return self.__count
+
+    def __row(self, tension: float) -> list[float]:
+        """
+        Return the Vandermonde row of a tension, highest power first.
+        """
+        x: float = (tension - self.__center) / self.__scale
+        row: list[float] = [1.0] * self.__size
+        for k in range(self.degree - 1, -1, -1):
+            row[k] = row[k + 1] * x
+        return row
+
+    def add(self, tension: float, deflection: float) -> None:
+        """
+        Add a point to the fit.
+        """
+        self.__points[(tension, deflection)] += 1
+        self.__count += 1
+        self.__tensions[tension] += 1
+        self.__rotate_in(self.__row(tension), deflection)
+
+    def remove(self, tension: float, deflection: float) -> None:
+        """
+        Remove a previously added point from the fit.
+
+        :raises KeyError: If the point was not added.
+        """
+        point: tuple[float, float] = (tension, deflection)
+        if self.__points[point] <= 0:
+            raise KeyError(point)
+        self.__points[point] -= 1
+        self.__count -= 1
+        if not self.__points[point]:
+            del self.__points[point]
+        self.__tensions[tension] -= 1
+        if not self.__tensions[tension]:
+            del self.__tensions[tension]
+        self.__removals += 1
+        if (self.__removals > max(self.REBUILD_REMOVALS, len(self)) or
+                not self.__rotate_out(self.__row(tension), deflection)):
+            self.__rebuild()
+
+    def update(self, points: list[tuple[float, float]]) -> bool:
+        """
+        Add and remove points until the fit holds exactly the given
+        points. Only the difference to the held points is applied,
+        unless it is larger than refitting everything.
+
+        :param points: The (tension, deflection) pairs.
+        :type points: list[tuple[float, float]]
+        :return: False if the fit already held these points.
+        :rtype: bool
+        """
+        distinct: set[tuple[float, float]] = set(points)
+        added: Counter[tuple[float, float]]
+        removed: Counter[tuple[float, float]]
+        if (len(distinct) == len(points) and
+                len(self.__points) == self.__count):
+            # Without repeated points the set difference is the
+            # difference, and the set operations run in C
+            added = Counter(distinct - self.__points.keys())
+            removed = Counter(self.__points.keys() - distinct)
+        else:
+            target: Counter[tuple[float, float]] = Counter(points)
+            added = target - self.__points
+            removed = self.__points - target
+        if not added and not removed:
+            return False
+        if added.total() + removed.total() >= len(points):
+            self.__points = Counter(points)
+            self.__count = len(points)
+            self.__tensions = Counter(tension for tension, _ in points)
+            self.__rebuild()
+            return True
+        # Add first, so the removals downdate a larger factor
+        for tension, deflection in added.elements():
+            self.add(tension, deflection)
+        for tension, deflection in removed.elements():
+            self.remove(tension, deflection)
+        return True
+
+    def coefficients(self) -> np.ndarray | None:
+        """
+        Return the polynomial coefficients in tension, highest power
+        first like np.polyfit.
+
+        :return: The coefficients, None while the held points do not
+                 determine the polynomial.
+        :rtype: np.ndarray | None
+        """
+        r: list[list[float]] = self.__r
+        size: int = self.__size
+        if len(self.__tensions) < size:
+            return None
+        # Back substitution R w = z
+        scaled: list[float] = [0.0] * size
+        for i in range(size - 1, -1, -1):
+            total: float = self.__z[i]
+            for j in range(i + 1, size):
+                total -= r[i][j] * scaled[j]
+            scaled[i] = total / r[i][i]
+        # Expand the polynomial in x = (t - center) / scale with
+        # Horner's rule, multiplying by x is a shift plus a scaled copy
+        slope: float = 1.0 / self.__scale
+        offset: float = -self.__center / self.__scale
+        poly: list[float] = [scaled[0]]
+        for coefficient in scaled[1:]:
+            poly = ([slope * poly[0]]
+                    + [slope * poly[k] + offset * poly[k - 1]
+                       for k in range(1, len(poly))]
+                    + [offset * poly[-1] + coefficient])
+        return np.array(poly)
+
+    def __rotate_in(self, row: list[float], deflection: float) -> None:
+        """
+        Rotate a row into R with Givens rotations.
+        """
+        r: list[list[float]] = self.__r
+        z: list[float] = self.__z
+        for k in range(self.__size):
+            if row[k] == 0.0:
+                continue
+            r_k: list[float] = r[k]
+            rho: float = math.hypot(r_k[k], row[k])
+            c: float = r_k[k] / rho
+            s: float = row[k] / rho
+            r_k[k] = rho
+            for j in range(k + 1, self.__size):
+                upper: float = r_k[j]
+                r_k[j] = c * upper + s * row[j]
+                row[j] = c * row[j] - s * upper
+            z[k], deflection = (c * z[k] + s * deflection,
+                                c * deflection - s * z[k])
+
+    def __rotate_out(self, row: list[float], deflection: float) -> bool:
+        """
+        Remove a row from R, following LINPACK dchdd.
+
+        :return: False if R would become rank deficient, R is
+                 unchanged then.
+        """
+        r: list[list[float]] = self.__r
+        z: list[float] = self.__z
+        size: int = self.__size
+        if any(r[k][k] <= 0.0 for k in range(size)):
+            return False
+        # Forward substitution R^T a = row
+        a: list[float] = [0.0] * size
+        for j in range(size):
+            total: float = row[j]
+            for i in range(j):
+                total -= r[i][j] * a[i]
+            a[j] = total / r[j][j]
+        norm: float = math.fsum(value * value for value in a)
+        if norm >= 1.0:
+            return False
+        alpha: float = math.sqrt(1.0 - norm)
+        c: list[float] = [0.0] * size
+        s: list[float] = [0.0] * size
+        for i in range(size - 1, -1, -1):
+            rho: float = math.hypot(alpha, a[i])
+            c[i] = alpha / rho
+            s[i] = a[i] / rho
+            alpha = rho
+        for j in range(size):
+            carry: float = 0.0
+            for i in range(j, -1, -1):
+                rotated: float = c[i] * carry + s[i] * r[i][j]
+                r[i][j] = c[i] * r[i][j] - s[i] * carry
+                carry = rotated
+        zeta: float = deflection
+        for i in range(size):
+            z[i] = (z[i] - s[i] * zeta) / c[i]
+            zeta = c[i] * zeta - s[i] * z[i]
+        return True
+
+    def __rebuild(self) -> None:
+        """
+        Refactor R from the held points.
+        """
+        for r_k in self.__r:
+            r_k[:] = [0.0] * self.__size
+        self.__z[:] = [0.0] * self.__size
+        self.__removals = 0
+        for tension, deflection in self.__points.elements():
+            self.__rotate_in(self.__row(tension), deflection)
+
+
 class TensionDeflectionFitter:
     """
-    A class for fitting tension–deflection data
-    to various models and then computing tension
-    for a given deflection (with optional extrapolation).
+    A class for fitting tension–deflection data to various models.
+    The fitted :class:`FitModel` computes tension for a given deflection
+    (with optional extrapolation).
 
     :param extrapolation_factor:
         Fraction of deflection range to allow for
@@ -31,57 +863,139 @@ class TensionDeflectionFitter:
     :type extrapolation_factor: float
     """
 
+    # Bump whenever fit_data returns different models for the same data
+    # or their serialization changes, serialized fits of other versions
+    # are not used anymore
+    FITTER_VERSION: int = 2
+    # Maximum number of fitted models kept by fit_data
+    CACHE_SIZE: int = 64
+
     def __init__(self, extrapolation_factor: float = 0.1) -> None:
         """
         Constructor. Stores an extrapolation factor used in calculating
         tension outside the fitted deflection range.
         """
         self.extrapolation_factor = extrapolation_factor
+        # Fitted models by fit type, extrapolation factor, fitter
+        # version and digest of the sorted points, ordered from least
+        # to most recently used
+        self.__cache: dict[tuple[FitType, float, int, bytes], FitModel] = {}
+        self.__cache_hits: int = 0
+        self.__cache_misses: int = 0
+        # Polynomial fit of the points passed to fit_stream
+        # and the model returned for them
+        self.__stream: IncrementalPolynomialFit | None = None
+        self.__stream_model: FitModel | None = None
+
+    def get_cache_stats(self) -> dict[str, int]:
+        """
+        Return the hit and miss counters of the fit cache.
+        """
+        return {
+            "hits": self.__cache_hits,
+            "misses": self.__cache_misses,
+            "entries": len(self.__cache),
+        }
+
+    def clear_cache(self) -> None:
+        """
+        Drop all fitted models kept by fit_data.
+        """
+        self.__cache.clear()
 
     def fit_data(self,
-                 data: list[tuple[float, float]], fit_type: FitType) -> dict:
+                 data: list[tuple[float, float]] | np.ndarray,
+                 fit_type: FitType) -> FitModel:
         """
         Fit the provided tension–deflection data with the given model type.
+        The last CACHE_SIZE models are kept by the content of the data
+        and the extrapolation factor, so refitting unchanged data returns
+        the same model instance, which callers must not modify.
 
         :param data:
-            A list of (tension, deflection) pairs
-        :type data: list[tuple[float, float]]
+            A list of (tension, deflection) pairs or an array of shape (n, 2)
+        :type data: list[tuple[float, float]] | np.ndarray
         :param fit_type:
             The type of model to use for fitting
         :type fit_type: FitType
         :return:
-            A dictionary encapsulating the fitted model and metadata:
-
-            - **"fit_type"**: The FitType used.
-            - **"model"**: The fitted coefficients or model object.
-            - **"t_min"**: Minimum tension in the input data.
-            - **"t_max"**: Maximum tension in the input data.
-            - **"d_min"**: Minimum deflection in the input data.
-            - **"d_max"**: Maximum deflection in the input data.
-            - **"scaling_params"**: If Chebyshev, a tuple for
-              min/max tension used in normalization.
-        :rtype: dict
-        """
-        # Sort by ascending tension for internal consistency
-        data_sorted: list[tuple[float, float]] = sorted(
-            data, key=lambda x: x[0])
-        tensions = np.array([pt[0] for pt in data_sorted], dtype=float)
-        deflections = np.array([pt[1] for pt in data_sorted], dtype=float)
-
-        # Determine the domain for tension and deflection in the input data
-        t_min, t_max = tensions[0], tensions[-1]
-        d_min, d_max = min(deflections), max(deflections)
-
-        # Prepare a dict to store the result
-        fit_model: dict[str, Any] = {
-            "fit_type": fit_type,
-            "t_min": t_min,
-            "t_max": t_max,
-            "d_min": d_min,
-            "d_max": d_max,
-            "model": None,
-            "scaling_params": None
-        }
+            The fitted model, holding the tension and deflection ranges
+            of the input data.
+        :rtype: FitModel
+        """
+        # Sort by ascending tension, then deflection, for internal
+        # consistency and a key independent of the point order
+        points: np.ndarray = np.asarray(data, dtype=float).reshape(-1, 2)
+        points = points[np.lexsort((points[:, 1], points[:, 0]))]
+        key: tuple[FitType, float, int, bytes] = (
+            fit_type, self.extrapolation_factor, self.FITTER_VERSION,
+            hashlib.blake2b(points.tobytes()).digest())
+        fit_model: FitModel | None = self.__cache.pop(key, None)
+        if fit_model is not None:
+            self.__cache_hits += 1
+        else:
+            self.__cache_misses += 1
+            fit_model = self.__fit_points(points, fit_type)
+        self.__cache[key] = fit_model
+        # Evict the least recently used models first
+        while len(self.__cache) > self.CACHE_SIZE:
+            del self.__cache[next(iter(self.__cache))]
+        return fit_model
+
+    def fit_stream(self,
+                   data: list[tuple[float, float]],
+                   fit_type: FitType) -> FitModel:
+        """
+        Fit data that changes a few points at a time, like the table of
+        a running measurement. Polynomials are updated incrementally
+        from the previous call, see :class:`IncrementalPolynomialFit`.
+        Other fit types and underdetermined polynomials go through
+        :meth:`fit_data`.
+
+        :param data: A list of (tension, deflection) pairs.
+        :type data: list[tuple[float, float]]
+        :param fit_type: The type of model to use for fitting.
+        :type fit_type: FitType
+        :return: The fitted model.
+        :rtype: FitModel
+        """
+        if fit_type not in (FitType.LINEAR,
+                            FitType.QUADRATIC,
+                            FitType.CUBIC,
+                            FitType.QUARTIC):
+            return self.fit_data(data, fit_type)
+        if self.__stream is None or self.__stream.degree != fit_type.value:
+            self.__stream = IncrementalPolynomialFit(fit_type.value)
+            self.__stream_model = None
+        if (not self.__stream.update(data) and self.__stream_model and
+                self.__stream_model.extrapolation_factor ==
+                self.extrapolation_factor):
+            return self.__stream_model
+        coefs: np.ndarray | None = self.__stream.coefficients()
+        if coefs is None:
+            self.__stream_model = None
+            return self.fit_data(data, fit_type)
+        deflections: list[float] = [point[1] for point in data]
+        self.__stream_model = PolynomialModel(
+            float(min(data)[0]), float(max(data)[0]),
+            float(min(deflections)), float(max(deflections)),
+            self.extrapolation_factor, coefs)
+        return self.__stream_model
+
+    def __fit_points(self,
+                     points: np.ndarray,
+                     fit_type: FitType) -> FitModel:
+        """
+        Fit points sorted by tension, see fit_data.
+        """
+        tensions = points[:, 0]
+        deflections = points[:, 1]
+
+        # The domain for tension and deflection in the input data
+        limits: tuple[float, ...] = (
+            float(tensions[0]), float(tensions[-1]),
+            float(min(deflections)), float(max(deflections)),
+            self.extrapolation_factor)
 
         match fit_type:
             case (FitType.LINEAR |
@@ -90,26 +1004,25 @@ class TensionDeflectionFitter:
                   FitType.QUARTIC):
                 # np.polyfit => standard polynomial coefficients
                 coefs = np.polyfit(tensions, deflections, fit_type.value)
-                fit_model["model"] = coefs
+                return PolynomialModel(*limits, coefs)
 
             case FitType.SPLINE:
                 # Cubic Spline
-                spline = CubicSpline(tensions, deflections)
-                fit_model["model"] = spline
+                return SplineModel(*limits, CubicSpline(tensions, deflections))
 
             case FitType.EXPONENTIAL:
                 # y = a * exp(bx)
                 def exponential(x, a, b):
                     return a * np.exp(b * x)
                 coefs, _ = curve_fit(exponential, tensions, deflections)
-                fit_model["model"] = coefs  # (a, b)
+                return ExponentialModel(*limits, *map(float, coefs))
 
             case FitType.LOGARITHMIC:
                 # y = a + b ln(x)
                 def logarithmic(x, a, b):
                     return a + b * np.log(x)
                 coefs, _ = curve_fit(logarithmic, tensions, deflections)
-                fit_model["model"] = coefs  # (a, b)
+                return LogarithmicModel(*limits, *map(float, coefs))
 
             case FitType.POWER_LAW:
                 # y = a * x^b
@@ -118,156 +1031,7 @@ class TensionDeflectionFitter:
                 log_deflections = np.log(deflections)
                 b, log_a = np.polyfit(log_tensions, log_deflections, 1)
                 a = np.exp(log_a)
-                fit_model["model"] = (a, b)
+                return PowerLawModel(*limits, float(a), float(b))
 
             case _:
                 raise ValueError(f"Unsupported FitType: {fit_type}")
-        return fit_model
-
-    def calculate_tension(self,
-                          fit_model: dict, deflection: float) -> float | None:
-        """
-        Given a fitted model (from fit_data) and a desired deflection,
-        return the predicted tension. Extrapolates beyond the deflection
-        range up to ``extrapolation_factor * 100%`` outside the original
-        bounds. Returns ``None`` if the request is beyond that
-        extrapolation limit or no real solution is found.
-
-        :param fit_model:
-            Dictionary returned by :meth:`fit_data`.
-        :type fit_model: dict
-        :param deflection:
-            The deflection (in mm) for tension calculation.
-        :type deflection: float
-        :return:
-            The corresponding tension (in Newtons), or None if out of
-            extrapolation range or no real solution is available.
-        :rtype: float or None
-        """
-        fit_type = fit_model["fit_type"]
-        d_min = fit_model["d_min"]
-        d_max = fit_model["d_max"]
-        model = fit_model["model"]
-        t_min = fit_model["t_min"]
-        t_max = fit_model["t_max"]
-
-        # Determine allowable deflection range for extrapolation
-        d_range = d_max - d_min
-        d_lower = d_min - self.extrapolation_factor * d_range
-        d_upper = d_max + self.extrapolation_factor * d_range
-
-        # Deflection outside limits
-        if deflection < d_lower or deflection > d_upper:
-            return None
-
-        match fit_type:
-            # Polynomial models (LINEAR, QUADRATIC, CUBIC, QUARTIC)
-            case (FitType.LINEAR |
-                  FitType.QUADRATIC |
-                  FitType.CUBIC |
-                  FitType.QUARTIC):
-                coefs = model  # np.polyfit(...) => array of coefficients
-                poly = np.poly1d(coefs) - deflection
-                roots = np.roots(poly)
-
-                t_range = t_max - t_min
-                t_lower = t_min - self.extrapolation_factor * t_range
-                t_upper = t_max + self.extrapolation_factor * t_range
-
-                # Filter real solutions in [t_lower, t_upper]
-                real_candidates = [r.real
-                                   for r in roots
-                                   if abs(r.imag) < 1e-14]
-                valid_tensions = [t
-                                  for t
-                                  in real_candidates
-                                  if t_lower <= t <= t_upper]
-
-                if valid_tensions:
-                    # If multiple are valid, pick the first
-                    return valid_tensions[0]
-                else:
-                    return None
-
-            # Spline (CubicSpline)
-            case FitType.SPLINE:
-                spline = model  # CubicSpline object
-
-                t_range = t_max - t_min
-                t_lower = t_min - self.extrapolation_factor * t_range
-                t_upper = t_max + self.extrapolation_factor * t_range
-
-                def f(t: float) -> float:
-                    return spline(t) - deflection
-
-                steps = 200
-                ts = np.linspace(t_lower, t_upper, steps)
-                fs = [f(x) for x in ts]
-
-                solution: float | None = None
-
-                for i in range(steps - 1):
-                    # If the function is exactly zero at fs[i]
-                    if fs[i] == 0.0:
-                        solution = ts[i]
-                        break
-
-                    # If there's a sign change between fs[i] and fs[i+1],
-                    # brentq can bracket that root
-                    if fs[i] * fs[i + 1] < 0.0:
-                        try:
-                            solution = cast(float, brentq(f, ts[i], ts[i + 1]))
-                            break
-                        except ValueError:
-                            pass
-
-                return solution  # Either float or None
-
-            # Exponential (y = a * exp(bx))
-            case FitType.EXPONENTIAL:
-                a, b = model
-                if deflection <= 0 or a <= 0:
-                    return None
-                tension = np.log(deflection / a) / b
-
-                t_range = t_max - t_min
-                t_lower = t_min - self.extrapolation_factor * t_range
-                t_upper = t_max + self.extrapolation_factor * t_range
-                if t_lower <= tension <= t_upper:
-                    return tension
-                else:
-                    return None
-
-            # Logarithmic (y = a + b ln(x))
-            case FitType.LOGARITHMIC:
-                a, b = model
-                if b == 0:
-                    return None
-                tension = np.exp((deflection - a) / b)
-                if tension <= 0:
-                    return None
-
-                t_range = t_max - t_min
-                t_lower = t_min - self.extrapolation_factor * t_range
-                t_upper = t_max + self.extrapolation_factor * t_range
-                if t_lower <= tension <= t_upper:
-                    return tension
-                else:
-                    return None
-
-            # Power-law (y = a * x^b)
-            case FitType.POWER_LAW:
-                a, b = model
-                if a <= 0 or deflection <= 0:
-                    return None
-                tension = (deflection / a) ** (1.0 / b)
-
-                t_range = t_max - t_min
-                t_lower = t_min - self.extrapolation_factor * t_range
-                t_upper = t_max + self.extrapolation_factor * t_range
-                if t_lower <= tension <= t_upper:
-                    return tension
-                else:
-                    return None
-            case _:
-                return None
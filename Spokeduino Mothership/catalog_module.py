@@ -0,0 +1,463 @@
+import csv
+import json
+import logging
+import re
+import sqlite3
+from collections.abc import Callable, Iterator
+from enum import Enum
+from typing import Any, TextIO
+from database_module import DatabaseModule
+from sql_queries import SQLQueries
+
+
+class CatalogKind(Enum):
+    SPOKES = "spokes"
+    HUBS = "hubs"
+    RIMS = "rims"
+
+
+class CatalogFormat(Enum):
+    CSV = "csv"
+    JSON = "json"
+
+
+# Marks fields every imported row has to provide
+REQUIRED: object = object()
+
+
+def _to_bool(value: Any) -> bool:
+    if isinstance(value, bool):
+        return value
+    text: str = str(value).strip().lower()
+    if text in ("1", "true", "yes", "y"):
+        return True
+    if text in ("0", "false", "no", "n"):
+        return False
+    raise ValueError(f"'{value}' is not a boolean")
+
+
+# Model and manufacturer table of every catalog
+CATALOG_TABLES: dict[CatalogKind, tuple[str, str]] = {
+    CatalogKind.SPOKES: ("spoke_models", "spoke_manufacturers"),
+    CatalogKind.HUBS: ("hub_models", "hub_manufacturers"),
+    CatalogKind.RIMS: ("rim_models", "rim_manufacturers"),
+}
+
+# Fields of a catalog entry as (name, converter, default).
+# The names are the column names of the model table, except for
+# the lookups below, which are stored as references by name.
+CATALOG_FIELDS: dict[CatalogKind,
+                     list[tuple[str, Callable[[Any], Any], Any]]] = {
+    CatalogKind.SPOKES: [
+        ("manufacturer", str, REQUIRED),
+        ("name", str, REQUIRED),
+        ("type", str, REQUIRED),
+        ("gauge", int, REQUIRED),
+        ("weight", float, 0.0),
+        ("dimensions", str, REQUIRED),
+        ("comment", str, ""),
+    ],
+    CatalogKind.HUBS: [
+        ("manufacturer", str, REQUIRED),
+        ("name", str, REQUIRED),
+        ("axle_type", str, REQUIRED),
+        ("old", int, REQUIRED),
+        ("pcd_left", float, REQUIRED),
+        ("pcd_right", float, REQUIRED),
+        ("wl", float, None),
+        ("wr", float, None),
+        ("spoke_hole_diameter_left", float, 2.5),
+        ("spoke_hole_diameter_right", float, 2.5),
+        ("boost_classification", str, None),
+        ("is_front", _to_bool, True),
+        ("is_disc", _to_bool, True),
+        ("is_centerlock", _to_bool, True),
+        ("is_jbend", _to_bool, REQUIRED),
+        ("comment", str, ""),
+    ],
+    CatalogKind.RIMS: [
+        ("manufacturer", str, REQUIRED),
+        ("name", str, REQUIRED),
+        ("etrto_bsd", int, REQUIRED),
+        ("etrto_width", int, REQUIRED),
+        ("outer_width", float, None),
+        ("erd", float, REQUIRED),
+        ("nipple_offset_left", float, 0.0),
+        ("nipple_offset_right", float, 0.0),
+        ("rim_depth", float, REQUIRED),
+        ("is_disc", _to_bool, True),
+        ("comment", str, ""),
+    ],
+}
+
+# Fields referencing another table by name as
+# field: (table, name column, model column).
+# Manufacturers are created on import, unknown other names are errors.
+CATALOG_LOOKUPS: dict[CatalogKind, dict[str, tuple[str, str, str]]] = {
+    CatalogKind.SPOKES: {
+        "manufacturer": ("spoke_manufacturers", "name", "manufacturer_id"),
+        "type": ("spoke_types", "type", "type_id"),
+    },
+    CatalogKind.HUBS: {
+        "manufacturer": ("hub_manufacturers", "name", "manufacturer_id"),
+        "axle_type": ("axle_types", "name", "axle_type_id"),
+        "boost_classification": (
+            "boost_classifications", "name", "boost_classification_id"),
+    },
+    CatalogKind.RIMS: {
+        "manufacturer": ("rim_manufacturers", "name", "manufacturer_id"),
+    },
+}
+
+# Fields identifying a model besides its manufacturer. Names alone are
+# not unique, e.g. a spoke model comes in several gauges.
+CATALOG_KEYS: dict[CatalogKind, list[str]] = {
+    CatalogKind.SPOKES: ["name", "dimensions"],
+    CatalogKind.HUBS: ["name", "axle_type", "old"],
+    CatalogKind.RIMS: ["name", "etrto_bsd", "etrto_width"],
+}
+
+# Kind encoded in the rowid of the catalog_search index
+CATALOG_SEARCH_KINDS: dict[CatalogKind, int] = {
+    CatalogKind.SPOKES: 1,
+    CatalogKind.HUBS: 2,
+    CatalogKind.RIMS: 3,
+}
+
+
+class CatalogModule:
+    """
+    Streaming import and export of the spoke, hub and rim catalogs.
+
+    Imports read the file row by row and pass it on in chunks of
+    CHUNK_SIZE rows. Every chunk is written into a staging temp table
+    and merged into the model table within one transaction, models
+    are matched by manufacturer, name and the fields in CATALOG_KEYS.
+    Exports write every row as it is fetched. Memory use does not
+    depend on the file size.
+    Runs on the calling thread, submit it to the database worker
+    when called from the GUI.
+    """
+    CHUNK_SIZE: int = 500
+
+    def __init__(self, db: DatabaseModule) -> None:
+        self.__db: DatabaseModule = db
+
+    @staticmethod
+    def __staging_table(kind: CatalogKind) -> str:
+        return f"catalog_staging_{kind.value}"
+
+    @staticmethod
+    def get_field_names(kind: CatalogKind) -> list[str]:
+        """
+        Return the field names of a catalog in file order.
+        """
+        return [field[0] for field in CATALOG_FIELDS[kind]]
+
+    def search(
+            self,
+            text: str,
+            kind: CatalogKind | None = None,
+            limit: int = 50
+            ) -> list[tuple[CatalogKind, int, str, str, str]]:
+        """
+        Search the catalogs of all manufacturers for models matching
+        every word of the text as a prefix, in name, dimensions,
+        comment or manufacturer.
+        :param text: The search text, e.g. "sap cx 2.0".
+        :param kind: Restrict the search to one catalog.
+        :param limit: Maximum number of results.
+        :return: Best matches first as (kind, model id, name,
+                 dimensions, manufacturer).
+        """
+        words: list[str] = re.findall(r"\w+", text)
+        if not words:
+            return []
+        # Quoted, so words like AND or NEAR are not read as operators
+        match: str = " ".join(f'"{word}"*' for word in words)
+        kind_code: int | None = (
+            None if kind is None else CATALOG_SEARCH_KINDS[kind])
+        kinds: dict[int, CatalogKind] = {
+            code: catalog for catalog, code in CATALOG_SEARCH_KINDS.items()}
+        return [
+            (kinds[row[0]], *row[1:])
+            for row in self.__db.execute_select_cached(
+                SQLQueries.SEARCH_CATALOG,
+                (match, kind_code, kind_code, limit))]
+
+    def import_catalog(
+            self,
+            kind: CatalogKind,
+            file: TextIO,
+            file_format: CatalogFormat,
+            error_callback: Callable[[int, str], None] | None = None
+            ) -> dict[str, int]:
+        """
+        Import catalog entries, updating models with the same
+        manufacturer, name and variant and inserting the others.
+        Rows failing validation are skipped and reported, the rest
+        of the import goes on. A later row for the same model wins.
+        :param kind: The catalog to import into.
+        :param file: Text file with a header row for CSV, or a JSON
+                     array or JSON lines of objects with the field names.
+        :param file_format: The format of the file.
+        :param error_callback: Called with the 1-based row number and
+                               the problem of every rejected row.
+                               Problems are logged if not given.
+        :return: Counts of inserted, updated and failed rows.
+        """
+        if error_callback is None:
+            error_callback = self.__log_error
+        counts: dict[str, int] = {"inserted": 0, "updated": 0, "failed": 0}
+
+        def report(row_number: int, message: str) -> None:
+            counts["failed"] += 1
+            error_callback(row_number, message)
+
+        rows: Iterator[dict[str, Any]] = (
+            self.__read_csv(file) if file_format == CatalogFormat.CSV
+            else self.__read_json(file))
+        connection: sqlite3.Connection = self.__db.get_connection()
+        self.__create_staging_table(connection, kind)
+        try:
+            chunk: list[tuple[Any, ...]] = []
+            for row_number, row in enumerate(rows, 1):
+                try:
+                    chunk.append(
+                        (row_number, *self.__convert_row(kind, row)))
+                except ValueError as e:
+                    report(row_number, str(e))
+                if len(chunk) >= self.CHUNK_SIZE:
+                    self.__merge_chunk(connection, kind, chunk,
+                                       counts, report)
+                    chunk = []
+            if chunk:
+                self.__merge_chunk(connection, kind, chunk, counts, report)
+        except (csv.Error, json.JSONDecodeError) as e:
+            logging.error(f"Catalog import stopped, unreadable file: {e}")
+            raise
+        finally:
+            connection.execute(
+                f"DROP TABLE IF EXISTS temp.{self.__staging_table(kind)};")
+        if counts["inserted"] or counts["updated"]:
+            self.__db.db_changed = True
+        return counts
+
+    @staticmethod
+    def __log_error(row_number: int, message: str) -> None:
+        logging.warning(f"Catalog row {row_number} skipped: {message}")
+
+    @staticmethod
+    def __read_csv(file: TextIO) -> Iterator[dict[str, Any]]:
+        reader = csv.DictReader(file)
+        for row in reader:
+            yield {key.strip(): value for key, value in row.items()
+                   if key is not None}
+
+    @staticmethod
+    def __read_json(file: TextIO) -> Iterator[dict[str, Any]]:
+        """
+        Yield the objects of a JSON array or of JSON lines
+        without loading the whole file.
+        """
+        decoder = json.JSONDecoder()
+        buffer: str = ""
+        position: int = 0
+        eof: bool = False
+        while True:
+            # Skip whitespace and the array punctuation between objects
+            while position < len(buffer) and buffer[position] in " \t\r\n,[]":
+                position += 1
+            if position >= len(buffer):
+                if eof:
+                    return
+                buffer = file.read(65536)
+                position = 0
+                eof = not buffer
+                continue
+            try:
+                item, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                # The object continues in the next block
+                data: str = file.read(65536)
+                eof = not data
+                buffer = buffer[position:] + data
+                position = 0
+                continue
+            position = end
+            if not isinstance(item, dict):
+                raise json.JSONDecodeError(
+                    "Catalog entries must be objects", buffer, position)
+            yield item
+
+    @staticmethod
+    def __convert_row(kind: CatalogKind,
+                      row: dict[str, Any]) -> list[Any]:
+        """
+        Validate a row and convert it to the staging column order.
+        :raises ValueError: If a field is missing or invalid.
+        """
+        values: list[Any] = []
+        for name, converter, default in CATALOG_FIELDS[kind]:
+            value: Any = row.get(name)
+            if isinstance(value, str):
+                value = value.strip()
+            if value is None or value == "":
+                if default is REQUIRED:
+                    raise ValueError(f"Missing {name}")
+                values.append(default)
+                continue
+            try:
+                values.append(converter(value))
+            except (TypeError, ValueError):
+                raise ValueError(f"Invalid {name} '{value}'")
+        return values
+
+    def __create_staging_table(self,
+                               connection: sqlite3.Connection,
+                               kind: CatalogKind) -> None:
+        table: str = self.__staging_table(kind)
+        columns: str = ", ".join(self.get_field_names(kind))
+        connection.execute(f"DROP TABLE IF EXISTS temp.{table};")
+        connection.execute(
+            f"CREATE TEMP TABLE {table} "
+            f"(row_number INTEGER PRIMARY KEY, {columns});")
+        # Finds the rows of the same model within a chunk
+        connection.execute(
+            f"CREATE INDEX temp.{table}_model ON {table} "
+            f"(manufacturer, {', '.join(CATALOG_KEYS[kind])});")
+
+    def __merge_chunk(self,
+                      connection: sqlite3.Connection,
+                      kind: CatalogKind,
+                      chunk: list[tuple[Any, ...]],
+                      counts: dict[str, int],
+                      report: Callable[[int, str], None]) -> None:
+        """
+        Merge a chunk of converted rows into the model table
+        within a single transaction.
+        """
+        staging: str = self.__staging_table(kind)
+        model_table, manufacturer_table = CATALOG_TABLES[kind]
+        fields: list[str] = self.get_field_names(kind)
+        lookups: dict[str, tuple[str, str, str]] = CATALOG_LOOKUPS[kind]
+
+        with self.__db.transaction():
+            self.__db.mark_written(model_table, manufacturer_table)
+            connection.executemany(
+                f"INSERT INTO temp.{staging} VALUES "
+                f"({', '.join('?' for _ in range(len(fields) + 1))});",
+                chunk)
+            connection.execute(
+                f"INSERT OR IGNORE INTO {manufacturer_table} (name) "
+                f"SELECT DISTINCT manufacturer FROM temp.{staging};")
+
+            # Reject rows naming unknown reference data
+            for field, (table, name_column, _) in lookups.items():
+                if table == manufacturer_table:
+                    continue
+                rejected: list[Any] = connection.execute(
+                    f"SELECT row_number, {field} FROM temp.{staging} "
+                    f"WHERE {field} IS NOT NULL AND {field} NOT IN "
+                    f"(SELECT {name_column} FROM {table});").fetchall()
+                for row_number, value in rejected:
+                    report(row_number, f"Unknown {field} '{value}'")
+                connection.executemany(
+                    f"DELETE FROM temp.{staging} WHERE row_number = ?;",
+                    ((row[0],) for row in rejected))
+
+            # The last row for a model wins
+            keys: list[str] = ["manufacturer", *CATALOG_KEYS[kind]]
+            same_model: str = " AND ".join(
+                f"later.{key} = s.{key}" for key in keys)
+            connection.execute(
+                f"DELETE FROM temp.{staging} AS s WHERE EXISTS ("
+                f"SELECT 1 FROM temp.{staging} AS later "
+                f"WHERE {same_model} "
+                "AND later.row_number > s.row_number);")
+
+            # Staging rows with the references resolved to ids
+            model_columns: list[str] = []
+            values: list[str] = []
+            joins: list[str] = []
+            for index, field in enumerate(fields):
+                if field in lookups:
+                    table, name_column, model_column = lookups[field]
+                    joins.append(
+                        f"LEFT JOIN {table} AS l{index} "
+                        f"ON l{index}.{name_column} = s.{field}")
+                    model_columns.append(model_column)
+                    values.append(f"l{index}.id AS {model_column}")
+                else:
+                    model_columns.append(field)
+                    values.append(f"s.{field}")
+            resolved: str = (
+                f"SELECT {', '.join(values)} "
+                f"FROM temp.{staging} AS s {' '.join(joins)}")
+
+            key_columns: list[str] = [
+                lookups[key][2] if key in lookups else key for key in keys]
+            match: str = " AND ".join(
+                f"m.{column} = r.{column}" for column in key_columns)
+            assignments: str = ", ".join(
+                f"{column} = r.{column}" for column in model_columns
+                if column not in key_columns)
+            cursor: sqlite3.Cursor = connection.execute(
+                f"UPDATE {model_table} AS m SET {assignments} "
+                f"FROM ({resolved}) AS r WHERE {match};")
+            counts["updated"] += cursor.rowcount
+            cursor = connection.execute(
+                f"INSERT INTO {model_table} ({', '.join(model_columns)}) "
+                f"SELECT * FROM ({resolved}) AS r "
+                f"WHERE NOT EXISTS (SELECT 1 FROM {model_table} AS m "
+                f"WHERE {match});")
+            counts["inserted"] += cursor.rowcount
+            connection.execute(f"DELETE FROM temp.{staging};")
+
+    def export_catalog(self,
+                       kind: CatalogKind,
+                       file: TextIO,
+                       file_format: CatalogFormat) -> int:
+        """
+        Write all entries of a catalog in the import format.
+        :param kind: The catalog to export.
+        :param file: Text file to write to, opened with newline=""
+                     for CSV.
+        :param file_format: The format to write.
+        :return: The number of exported entries.
+        """
+        fields: list[str] = self.get_field_names(kind)
+        model_table, _ = CATALOG_TABLES[kind]
+        lookups: dict[str, tuple[str, str, str]] = CATALOG_LOOKUPS[kind]
+        values: list[str] = []
+        joins: list[str] = []
+        for index, field in enumerate(fields):
+            if field in lookups:
+                table, name_column, model_column = lookups[field]
+                joins.append(f"LEFT JOIN {table} AS l{index} "
+                             f"ON l{index}.id = m.{model_column}")
+                values.append(f"l{index}.{name_column}")
+            else:
+                values.append(f"m.{field}")
+        cursor: sqlite3.Cursor = self.__db.get_connection().execute(
+            f"SELECT {', '.join(values)} FROM {model_table} AS m "
+            f"{' '.join(joins)} ORDER BY m.id;")
+
+        count: int = 0
+        if file_format == CatalogFormat.CSV:
+            writer = csv.writer(file)
+            writer.writerow(fields)
+            while rows := cursor.fetchmany(self.CHUNK_SIZE):
+                writer.writerows(rows)
+                count += len(rows)
+        else:
+            file.write("[")
+            while rows := cursor.fetchmany(self.CHUNK_SIZE):
+                for row in rows:
+                    file.write(",\n" if count else "\n")
+                    file.write(json.dumps(dict(zip(fields, row))))
+                    count += 1
+            file.write("\n]\n")
+        return count
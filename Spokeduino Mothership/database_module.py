@@ -1,52 +1,850 @@
 import inspect
 import logging
 import os
+import re
 import sqlite3
-from typing import Any
+import sys
+import threading
+import time
+import uuid
+from array import array
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import closing, contextmanager
+from datetime import datetime
+from enum import Enum
+from functools import partial
+from typing import Any, TypeVar
+from sql_queries import SQLQueries
+
+T = TypeVar("T")
+
+# Table names following the keywords of a read or a write statement
+READ_TABLES_PATTERN = re.compile(r"\b(?:FROM|JOIN)\s+(\w+)", re.IGNORECASE)
+WRITE_TABLES_PATTERN = re.compile(
+    r"\b(?:(?:INSERT|REPLACE)(?:\s+OR\s+\w+)?\s+INTO"
+    r"|UPDATE(?:\s+OR\s+\w+)?|DELETE\s+FROM)\s+(\w+)",
+    re.IGNORECASE)
+
+
+class PragmaProfile(Enum):
+    """
+    Named sets of connection pragmas, stored in the settings table.
+    """
+    BALANCED = "balanced"  # WAL, relaxed syncing, memory mapped reads
+    SAFE = "safe"          # WAL, fsync on every commit
+    LEGACY = "legacy"      # Rollback journal, e.g. for network drives
+
+
+PRAGMA_PROFILES: dict[PragmaProfile, dict[str, str | int]] = {
+    PragmaProfile.BALANCED: {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "mmap_size": 64 * 1024 * 1024,
+        "cache_size": -16 * 1024,  # Negative values are KiB
+    },
+    PragmaProfile.SAFE: {
+        "journal_mode": "WAL",
+        "synchronous": "FULL",
+        "mmap_size": 0,
+        "cache_size": -4 * 1024,
+    },
+    PragmaProfile.LEGACY: {
+        "journal_mode": "DELETE",
+        "synchronous": "FULL",
+        "mmap_size": 0,
+        "cache_size": -2 * 1024,
+    },
+}
 
 
 class DatabaseModule:
     """
     Handles all database interactions for the Spokeduino application.
+
+    Every thread gets its own long-lived connection which is opened
+    on first use and kept until close() is called. Prepared statements
+    are cached per connection by the sqlite3 module.
+    Each connection is configured with the pragma profile
+    stored under the "db_profile" setting.
+    Work submitted with submit() runs on a dedicated worker thread
+    with its own connection, so the GUI thread never waits on SQLite.
+
+    Results of execute_select_cached() are kept until one of the tables
+    read by the query is written. Every table has a write generation
+    which is bumped when a transaction writing to it, to a table
+    cascading into it or to a table with triggers writing into it
+    commits. Cached results remember the generations they were read at.
     """
-    def __init__(self, db_path: str) -> None:
+    PROFILE_SETTING: str = "db_profile"
+    # Identifies the database when merging it into another one
+    DATABASE_UUID_SETTING: str = "database_uuid"
+    # Maximum number of cached query results
+    CACHE_SIZE: int = 256
+    # Free pages are reclaimed once they exceed this share of the file
+    FREELIST_THRESHOLD: float = 0.1
+    FREELIST_MIN_PAGES: int = 64
+    # Upper bound of pages reclaimed per maintenance run
+    INCREMENTAL_VACUUM_PAGES: int = 2048
+    # Rows sampled per index by PRAGMA optimize, keeps it fast
+    ANALYSIS_LIMIT: int = 400
+    # Online backups copy this many pages per step and sleep in between,
+    # so writers on other connections are never locked out for long
+    BACKUP_PAGES_PER_STEP: int = 256
+    BACKUP_STEP_SLEEP: float = 0.01
+    # Number of backup snapshots kept
+    BACKUP_COUNT: int = 5
+    # Element type of the packed measurement points, for np.frombuffer
+    POINTS_DTYPE: str = "<f8"
+    # Version of the schema created by init_schema.sql
+    SCHEMA_BASE_VERSION: int = 1
+
+    def __init__(self,
+                 db_path: str,
+                 statement_cache_size: int = 256,
+                 profile: PragmaProfile | None = None) -> None:
+        """
+        :param db_path: Path to the SQLite database file.
+        :param statement_cache_size: Number of prepared statements
+                                     cached per connection.
+        :param profile: Pragma profile overriding the stored setting.
+        """
         self.__db_path: str = db_path
+        self.__statement_cache_size: int = statement_cache_size
+        self.__profile: PragmaProfile | None = profile
+        self.__local = threading.local()
+        self.__connections: list[sqlite3.Connection] = []
+        self.__connections_lock = threading.Lock()
+        self.__executor: ThreadPoolExecutor | None = None
+        self.__executor_lock = threading.Lock()
+        self.__cache: dict[tuple[str, tuple | None],
+                           tuple[tuple[int, ...], list[Any]]] = {}
+        self.__generations: dict[str, int] = {}
+        # Tables read by each cached query
+        self.__read_tables: dict[str, tuple[str, ...]] = {}
+        # Tables whose contents change when the key table is written
+        self.__affected_tables: dict[str, set[str]] | None = None
+        self.__cache_hits: int = 0
+        self.__cache_misses: int = 0
+        self.__cache_lock = threading.Lock()
+        # Connections running long checks, interrupted on close()
+        self.__long_running: set[sqlite3.Connection] = set()
+        # Background checks and backups, joined on shutdown()
+        self.__threads: set[threading.Thread] = set()
+        self.__interrupted: bool = False
+        self.db_changed: bool = False
 
     def _get_line_info(self) -> str:
         return f"{inspect.stack()[1][2]}:{inspect.stack()[1][3]}"
 
-    def initialize_database(self, schema_file: str, data_file: str) -> None:
+    def get_connection(self) -> sqlite3.Connection:
+        """
+        Return the connection owned by the calling thread,
+        opening it on first use.
+        :return: The thread's sqlite3 connection.
+        """
+        connection: sqlite3.Connection | None = getattr(
+            self.__local, "connection", None)
+        if connection is not None:
+            return connection
+
+        # The connection never leaves its thread, the check is disabled
+        # only so close() can release it from the GUI thread on shutdown
+        connection = sqlite3.connect(
+            self.__db_path,
+            cached_statements=self.__statement_cache_size,
+            check_same_thread=False)
+        connection.execute("PRAGMA foreign_keys = ON;")
+        self.__apply_profile(connection)
+        self.__local.connection = connection
+        with self.__connections_lock:
+            self.__connections.append(connection)
+        return connection
+
+    def __load_profile(self, connection: sqlite3.Connection) -> PragmaProfile:
+        """
+        Read the pragma profile from the settings table.
+        Falls back to the balanced profile if it is missing or unknown.
+        """
+        try:
+            row = connection.execute(
+                SQLQueries.GET_SINGLE_SETTING,
+                (self.PROFILE_SETTING,)).fetchone()
+        except sqlite3.Error:
+            # Settings table does not exist yet
+            return PragmaProfile.BALANCED
+        if not row:
+            return PragmaProfile.BALANCED
+        try:
+            return PragmaProfile(row[0])
+        except ValueError:
+            logging.warning(f"Unknown database profile '{row[0]}'. "
+                            f"Using {PragmaProfile.BALANCED.value}.")
+            return PragmaProfile.BALANCED
+
+    def __apply_profile(self, connection: sqlite3.Connection) -> None:
+        """
+        Apply the pragmas of the current profile to a connection.
+        """
+        if self.__profile is None:
+            self.__profile = self.__load_profile(connection)
+        for pragma, value in PRAGMA_PROFILES[self.__profile].items():
+            try:
+                connection.execute(f"PRAGMA {pragma} = {value};")
+            except sqlite3.Error as e:
+                logging.error(f"Failed to set PRAGMA {pragma}: {e}")
+
+    def get_profile(self) -> PragmaProfile:
+        """
+        Return the pragma profile used for new connections.
+        """
+        if self.__profile is None:
+            self.get_connection()
+        return self.__profile or PragmaProfile.BALANCED
+
+    def set_profile(self, profile: PragmaProfile) -> None:
+        """
+        Store a pragma profile in the settings and apply it.
+        Open connections are closed so every thread reconnects
+        with the new pragmas. The setting is written on the worker
+        after the settings queued before, the GUI goes through
+        SetupModule.set_db_profile() to keep its settings cache in step.
+        Must not be called from the worker.
+        """
+        self.submit(
+            self.execute_query,
+            SQLQueries.UPSERT_SETTING,
+            (self.PROFILE_SETTING, profile.value)).result()
+        self.__profile = profile
+        self.close()
+
+    def submit(self, func: Callable[..., T], *args: Any) -> Future[T]:
+        """
+        Run a function on the database worker thread.
+        The worker owns its connection, so func may call any of the
+        query methods. Tasks run one at a time in submission order.
+        :param func: The function to run.
+        :param args: Arguments passed to func.
+        :return: Future holding the result or the raised exception.
+        """
+        with self.__executor_lock:
+            if self.__executor is None:
+                self.__executor = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix="database")
+            return self.__executor.submit(func, *args)
+
+    def execute_select_async(
+            self,
+            query: str,
+            params: tuple | list[Any] | None,
+            row_type: type[tuple] | None = None) -> Future[list[Any]]:
+        """
+        Execute a SELECT query on the worker thread.
+        """
+        return self.submit(self.execute_select, query, params, row_type)
+
+    def execute_query_async(
+            self,
+            query: str,
+            params: tuple = ()) -> Future[int | None]:
+        """
+        Execute an INSERT, UPDATE, or DELETE query on the worker thread.
+        """
+        return self.submit(self.execute_query, query, params)
+
+    def interrupt(self) -> None:
+        """
+        Abort running maintenance and integrity checks and skip
+        the queued ones, so closing never waits on work that
+        scales with the file size.
+        """
+        self.__interrupted = True
+        with self.__connections_lock:
+            for connection in self.__long_running:
+                connection.interrupt()
+
+    def shutdown(self) -> None:
+        """
+        Close the database for good. A modified database gets
+        a maintenance pass first, bounded by INCREMENTAL_VACUUM_PAGES.
+        Interrupted background threads are waited for, so none of them
+        reports back or touches the database afterwards.
+        """
+        self.interrupt()
+        with self.__connections_lock:
+            threads: list[threading.Thread] = list(self.__threads)
+        for thread in threads:
+            thread.join()
+        self.close()
+        self.__interrupted = False
+        if self.db_changed:
+            self.run_maintenance()
+            self.close()
+
+    def close(self) -> None:
+        """
+        Finish the queued work and close the connections of all threads.
+        A later query transparently opens a new connection.
+        """
+        with self.__executor_lock:
+            executor: ThreadPoolExecutor | None = self.__executor
+            self.__executor = None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+        with self.__connections_lock:
+            for connection in self.__connections:
+                try:
+                    connection.close()
+                except sqlite3.Error as e:
+                    logging.error(f"Failed to close connection: {e}")
+            self.__connections.clear()
+            # Drop the stale references held by every thread
+            self.__local = threading.local()
+
+    def release_connection(self) -> None:
+        """
+        Close the connection of the calling thread.
+        Used by short-lived background threads when they finish.
+        """
+        connection: sqlite3.Connection | None = getattr(
+            self.__local, "connection", None)
+        if connection is None:
+            return
+        self.__local.connection = None
+        with self.__connections_lock:
+            if connection in self.__connections:
+                self.__connections.remove(connection)
+        connection.close()
+
+    @contextmanager
+    def __long_running_task(self) -> Iterator[sqlite3.Connection]:
+        """
+        Mark the calling thread's connection as interruptible
+        by interrupt() while the block runs.
+        :raises sqlite3.OperationalError: If interrupt() has been
+                                          called already.
+        """
+        connection: sqlite3.Connection = self.get_connection()
+        with self.__connections_lock:
+            self.__long_running.add(connection)
+        try:
+            if self.__interrupted:
+                raise sqlite3.OperationalError("interrupted")
+            yield connection
+        finally:
+            with self.__connections_lock:
+                self.__long_running.discard(connection)
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """
+        Group several writes into a single transaction.
+        Commits when the block exits normally and rolls back
+        if it raises. Nested blocks join the outermost transaction.
+        :return: The connection of the calling thread.
+        """
+        connection: sqlite3.Connection = self.get_connection()
+        depth: int = getattr(self.__local, "transaction_depth", 0)
+        self.__local.transaction_depth = depth + 1
+        if depth == 0:
+            self.__local.written_tables = set()
+        try:
+            if depth == 0 and not connection.in_transaction:
+                connection.execute("BEGIN;")
+            yield connection
+            if depth == 0:
+                connection.commit()
+                self.__bump_generations(self.__local.written_tables)
+        except BaseException:
+            if depth == 0 and connection.in_transaction:
+                connection.rollback()
+            raise
+        finally:
+            self.__local.transaction_depth = depth
+            if depth == 0:
+                self.__local.written_tables = set()
+
+    def __mark_written(self, query: str) -> None:
+        """
+        Remember the tables written by a query of the current
+        transaction, their generations are bumped on commit.
+        """
+        self.__local.written_tables.update(
+            table.lower() for table in WRITE_TABLES_PATTERN.findall(query))
+
+    def mark_written(self, *tables: str) -> None:
         """
-        Check for database existence and integrity, and recreate if necessary.
+        Record tables written through the raw connection, so cached
+        results read from them are not served anymore. Inside a
+        transaction their generations are bumped on commit, otherwise
+        right away.
+        :param tables: Names of the written tables.
+        """
+        names: set[str] = {table.lower() for table in tables}
+        if getattr(self.__local, "transaction_depth", 0):
+            self.__local.written_tables.update(names)
+        else:
+            self.__bump_generations(names)
+
+    def __load_affected_tables(self) -> dict[str, set[str]]:
+        """
+        Collect for every table the tables changed along with it
+        through foreign key actions and triggers.
+        """
+        connection: sqlite3.Connection = self.get_connection()
+        direct: dict[str, set[str]] = {}
+        tables: list[str] = [
+            row[0].lower() for row in connection.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table';")]
+        for table in tables:
+            for foreign_key in connection.execute(
+                    f"PRAGMA foreign_key_list('{table}');"):
+                direct.setdefault(foreign_key[2].lower(), set()).add(table)
+        for table, sql in connection.execute(
+                "SELECT tbl_name, sql FROM sqlite_master "
+                "WHERE type = 'trigger';"):
+            body: str = sql.split("BEGIN", 1)[-1]
+            direct.setdefault(table.lower(), set()).update(
+                name.lower() for name in WRITE_TABLES_PATTERN.findall(body))
+
+        affected: dict[str, set[str]] = {}
+        for table in direct:
+            found: set[str] = set()
+            pending: list[str] = [table]
+            while pending:
+                for child in direct.get(pending.pop(), set()):
+                    if child not in found:
+                        found.add(child)
+                        pending.append(child)
+            affected[table] = found
+        return affected
+
+    def __bump_generations(self, tables: set[str]) -> None:
+        """
+        Invalidate the cached results read from the given tables.
+        """
+        if not tables:
+            return
+        with self.__cache_lock:
+            affected_tables: dict[str, set[str]] | None = \
+                self.__affected_tables
+        if affected_tables is None:
+            try:
+                affected_tables = self.__load_affected_tables()
+            except sqlite3.Error as e:
+                logging.error(f"Failed to read the table relations: {e}")
+                self.invalidate_cache()
+                return
+        with self.__cache_lock:
+            self.__affected_tables = affected_tables
+            for table in set(tables).union(
+                    *(affected_tables.get(table, set()) for table in tables)):
+                self.__generations[table] = \
+                    self.__generations.get(table, 0) + 1
+
+    def invalidate_cache(self) -> None:
+        """
+        Drop all cached results, e.g. after the schema changed.
+        """
+        with self.__cache_lock:
+            self.__cache.clear()
+            self.__affected_tables = None
+
+    def get_cache_stats(self) -> dict[str, int]:
+        """
+        Return the hit and miss counters of the query cache.
+        """
+        with self.__cache_lock:
+            return {
+                "hits": self.__cache_hits,
+                "misses": self.__cache_misses,
+                "entries": len(self.__cache),
+            }
+
+    def initialize_database(self,
+                            schema_file: str,
+                            data_file: str,
+                            migrations_path: str | None = None,
+                            template_file: str | None = None) -> None:
+        """
+        Check for database existence and integrity, recreate if necessary
+        and bring the schema up to date.
         :param schema_file: Path to the SQL schema initialization file.
         :param data_file: Path to the SQL default data initialization file.
+        :param migrations_path: Directory with the numbered migration
+                                scripts. Defaults to "migrations" next to
+                                the schema file.
+        :param template_file: Prebuilt database cloned instead of running
+                              the scripts. Defaults to "template.sqlite"
+                              next to the schema file.
         """
+        if migrations_path is None:
+            migrations_path = os.path.join(
+                os.path.dirname(schema_file), "migrations")
+        if template_file is None:
+            template_file = os.path.join(
+                os.path.dirname(schema_file), "template.sqlite")
+
         if not os.path.exists(self.__db_path):
             logging.warning(f"Database file not found at {self.__db_path}. "
                             f"Creating a new one.")
-            self.recreate_database(schema_file, data_file)
+            self.provision_database(schema_file, data_file, template_file)
         else:
-            # Check database integrity
+            # Only the quick check runs on startup, the full check is
+            # deferred with check_integrity_in_background()
             if not self.check_integrity():
                 logging.error("Database integrity check failed. "
                               "Recreating database.")
-                self.recreate_database(schema_file, data_file)
+                self.provision_database(schema_file, data_file, template_file)
+        self.migrate(migrations_path)
+        self.__enable_incremental_vacuum()
+        self.get_database_uuid()
 
-    def check_integrity(self) -> bool:
+    def provision_database(self,
+                           schema_file: str,
+                           data_file: str,
+                           template_file: str) -> None:
         """
-        Check the database integrity using PRAGMA integrity_check.
-        :return: True if the database is valid, False otherwise.
+        Replace the database contents with the prebuilt template,
+        falling back to the scripts if the template is missing
+        or cannot be copied.
+        """
+        if os.path.exists(template_file) and \
+                self.clone_template(template_file):
+            return
+        self.recreate_database(schema_file, data_file)
+
+    def clone_template(self, template_file: str) -> bool:
+        """
+        Copy a prebuilt template over the database with the
+        SQLite backup API, which replaces every page at once.
+        :param template_file: Path to the template database.
+        :return: True if the template was copied, False otherwise.
+        """
+        try:
+            source: sqlite3.Connection = sqlite3.connect(
+                f"file:{template_file}?mode=ro", uri=True)
+            try:
+                source.backup(self.get_connection())
+            finally:
+                source.close()
+        except sqlite3.Error as e:
+            logging.error(f"Failed to copy the database template: {e}")
+            return False
+        self.invalidate_cache()
+        logging.info("Database created from the template.")
+        return True
+
+    @staticmethod
+    def build_template(schema_file: str,
+                       data_file: str,
+                       template_file: str,
+                       migrations_path: str | None = None) -> None:
+        """
+        Build the template database from the scripts and all
+        migrations. The template is written next to its final path
+        and moved into place once complete.
+        :raises RuntimeError: If the scripts or migrations fail.
+        """
+        if migrations_path is None:
+            migrations_path = os.path.join(
+                os.path.dirname(schema_file), "migrations")
+        build_file: str = f"{template_file}.build"
+        if os.path.exists(build_file):
+            os.remove(build_file)
+
+        # A rollback journal keeps the template in a single file
+        db = DatabaseModule(build_file, profile=PragmaProfile.LEGACY)
+        try:
+            db.recreate_database(schema_file, data_file)
+            if not db.migrate(migrations_path) or not db.check_integrity():
+                raise RuntimeError("Failed to build the database template")
+            db.get_connection().execute("VACUUM;")
+        finally:
+            db.close()
+        os.replace(build_file, template_file)
+
+    def get_database_uuid(self) -> str:
+        """
+        Return the UUID identifying this database, creating it on
+        first use. It is never part of the template, so every
+        provisioned database gets its own.
+        :return: The UUID as a string.
+        """
+        rows: list[Any] = self.execute_select(
+            SQLQueries.GET_SINGLE_SETTING, (self.DATABASE_UUID_SETTING,))
+        if rows:
+            return rows[0][0]
+        database_uuid: str = str(uuid.uuid4())
+        self.execute_query(
+            SQLQueries.UPSERT_SETTING,
+            (self.DATABASE_UUID_SETTING, database_uuid))
+        return database_uuid
+
+    def get_schema_version(self) -> int:
+        """
+        Return the schema version stored in PRAGMA user_version.
+        Databases created before versioning report the base version.
+        """
+        connection: sqlite3.Connection = self.get_connection()
+        version: int = connection.execute(
+            "PRAGMA user_version;").fetchone()[0]
+        if version == 0 and connection.execute(
+                "SELECT 1 FROM sqlite_master "
+                "WHERE type = 'table' AND name = 'settings';").fetchone():
+            return self.SCHEMA_BASE_VERSION
+        return version
+
+    @staticmethod
+    def get_migrations(migrations_path: str) -> list[tuple[int, str]]:
+        """
+        List the migration scripts, named <version>_<description>.sql,
+        in ascending version order.
+        :param migrations_path: Directory with the migration scripts.
+        :return: List of (version, path) tuples.
+        """
+        if not os.path.isdir(migrations_path):
+            return []
+
+        migrations: list[tuple[int, str]] = []
+        for filename in os.listdir(migrations_path):
+            version, _, _ = filename.partition("_")
+            if not filename.endswith(".sql") or not version.isdigit():
+                continue
+            migrations.append(
+                (int(version), os.path.join(migrations_path, filename)))
+        migrations.sort()
+        return migrations
+
+    def migrate(self, migrations_path: str) -> bool:
+        """
+        Upgrade the schema step by step by running every migration
+        newer than the stored version. Each step runs in its own
+        transaction together with the version bump, so a failing
+        step leaves the database at the previous version.
+        :param migrations_path: Directory with the migration scripts.
+        :return: True if the schema is up to date, False otherwise.
         """
         try:
-            with sqlite3.connect(self.__db_path) as connection:
-                result = connection.execute(
-                    "PRAGMA integrity_check;"
-                    ).fetchone()
-                return result and result[0] == "ok"
+            version: int = self.get_schema_version()
         except sqlite3.Error as e:
-            logging.error(f"Failed to perform integrity check: {e}")
+            logging.error(f"Failed to read the schema version: {e}")
             return False
 
+        pending: list[tuple[int, str]] = [
+            migration
+            for migration in self.get_migrations(migrations_path)
+            if migration[0] > version]
+        if not pending:
+            return True
+
+        connection: sqlite3.Connection = self.get_connection()
+        for target_version, migration_file in pending:
+            try:
+                with open(migration_file, "r") as f:
+                    script: str = f.read()
+                connection.executescript(
+                    f"BEGIN;\n{script}\n"
+                    f"PRAGMA user_version = {target_version};\n"
+                    "COMMIT;")
+                logging.info(f"Database migrated to version "
+                             f"{target_version}.")
+            except (sqlite3.Error, IOError) as e:
+                if connection.in_transaction:
+                    connection.rollback()
+                logging.error(f"Migration {migration_file} failed: {e}")
+                return False
+        self.invalidate_cache()
+        self.db_changed = True
+        return True
+
+    def get_integrity_errors(self, full: bool = False) -> list[str]:
+        """
+        Check the database integrity.
+        :param full: Run PRAGMA integrity_check instead of the much
+                     faster PRAGMA quick_check, which skips verifying
+                     that indexes match their tables.
+        :return: The reported problems, empty if the database is valid.
+        """
+        pragma: str = "integrity_check" if full else "quick_check"
+        try:
+            result: list[Any] = self.get_connection().execute(
+                f"PRAGMA {pragma};"
+                ).fetchall()
+        except sqlite3.Error as e:
+            logging.error(f"Failed to perform {pragma}: {e}")
+            return [str(e)]
+        if len(result) == 1 and result[0][0] == "ok":
+            return []
+        return [row[0] for row in result]
+
+    def check_integrity(self, full: bool = False) -> bool:
+        """
+        Check the database integrity using PRAGMA quick_check
+        or PRAGMA integrity_check.
+        :param full: Run the full integrity check.
+        :return: True if the database is valid, False otherwise.
+        """
+        return not self.get_integrity_errors(full)
+
+    def check_integrity_in_background(
+            self,
+            callback: Callable[[list[str]], None]) -> threading.Thread:
+        """
+        Run the full integrity check on a background thread.
+        The check uses its own connection, so the caller keeps working
+        while it runs. The database is never recreated from here,
+        the callback decides how to report problems.
+        :param callback: Called from the background thread with the
+                         reported problems, empty if the database is valid.
+        :return: The started thread.
+        """
+        def run() -> None:
+            try:
+                with self.__long_running_task():
+                    errors: list[str] = self.get_integrity_errors(full=True)
+            except sqlite3.Error as e:
+                errors = [str(e)]
+            finally:
+                self.release_connection()
+            if self.__interrupted:
+                return
+            if errors:
+                logging.error("Database integrity check failed: "
+                              f"{'; '.join(errors)}")
+            callback(errors)
+
+        return self.__start_thread(run)
+
+    def __start_thread(self, run: Callable[[], None]) -> threading.Thread:
+        """
+        Start run on a daemon thread that shutdown() waits for.
+        """
+        def target() -> None:
+            try:
+                run()
+            finally:
+                with self.__connections_lock:
+                    self.__threads.discard(thread)
+
+        thread = threading.Thread(target=target, daemon=True)
+        with self.__connections_lock:
+            self.__threads.add(thread)
+        thread.start()
+        return thread
+
+    def __get_backup_name(self) -> str:
+        return os.path.splitext(os.path.basename(self.__db_path))[0]
+
+    def get_backups(self, backup_dir: str) -> list[str]:
+        """
+        Return the backup snapshots of the database, oldest first.
+        """
+        if not os.path.isdir(backup_dir):
+            return []
+        prefix: str = f"{self.__get_backup_name()}-"
+        return sorted(
+            os.path.join(backup_dir, name)
+            for name in os.listdir(backup_dir)
+            if name.startswith(prefix) and name.endswith(".sqlite"))
+
+    def backup(self,
+               backup_dir: str,
+               keep: int = BACKUP_COUNT,
+               progress: Callable[[int, int], None] | None = None
+               ) -> tuple[str, float] | None:
+        """
+        Write a snapshot of the database while it stays in use.
+        The pages are copied in steps of BACKUP_PAGES_PER_STEP with
+        BACKUP_STEP_SLEEP seconds in between. A read transaction held
+        for the whole copy pins the snapshot, so writes from other
+        connections go on in WAL mode without restarting the copy.
+        The snapshot only gets its final name once complete and only
+        the newest keep snapshots are kept.
+        :param backup_dir: Directory for the snapshots.
+        :param keep: Number of snapshots to keep.
+        :param progress: Called after every step with the number of
+                         copied pages and the total number of pages.
+        :return: Path and duration in seconds of the snapshot,
+                 None if the backup failed or was interrupted.
+        """
+        def report(status: int, remaining: int, total: int) -> None:
+            if self.__interrupted:
+                raise InterruptedError("Backup interrupted")
+            if progress is not None:
+                progress(total - remaining, total)
+            # sqlite3 only sleeps on its own while the database is locked
+            if remaining:
+                time.sleep(self.BACKUP_STEP_SLEEP)
+
+        os.makedirs(backup_dir, exist_ok=True)
+        timestamp: str = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+        backup_file: str = os.path.join(
+            backup_dir, f"{self.__get_backup_name()}-{timestamp}.sqlite")
+        partial_file: str = f"{backup_file}.part"
+        start: float = time.perf_counter()
+        try:
+            with closing(sqlite3.connect(partial_file)) as target:
+                with self.__long_running_task() as connection:
+                    connection.execute("BEGIN;")
+                    try:
+                        connection.execute(
+                            "SELECT 1 FROM sqlite_master LIMIT 1;"
+                            ).fetchall()
+                        connection.backup(
+                            target,
+                            pages=self.BACKUP_PAGES_PER_STEP,
+                            progress=report,
+                            sleep=self.BACKUP_STEP_SLEEP)
+                    finally:
+                        connection.rollback()
+                # Keep the snapshot a single self-contained file
+                target.execute("PRAGMA journal_mode = DELETE;")
+            os.replace(partial_file, backup_file)
+        except (sqlite3.Error, OSError) as e:
+            if os.path.exists(partial_file):
+                os.remove(partial_file)
+            if self.__interrupted:
+                logging.info("Database backup interrupted.")
+            else:
+                logging.error(f"Database backup failed: {e}")
+            return None
+        duration: float = time.perf_counter() - start
+
+        for old_backup in self.get_backups(backup_dir)[:-max(keep, 1)]:
+            try:
+                os.remove(old_backup)
+            except OSError as e:
+                logging.error(f"Failed to remove old backup: {e}")
+        logging.info(f"Database backed up to {backup_file} "
+                     f"in {duration:.2f} s.")
+        return backup_file, duration
+
+    def backup_in_background(
+            self,
+            backup_dir: str,
+            callback: Callable[[tuple[str, float] | None], None],
+            keep: int = BACKUP_COUNT,
+            progress: Callable[[int, int], None] | None = None
+            ) -> threading.Thread:
+        """
+        Run backup() on a background thread with its own connection.
+        :param callback: Called from the background thread with the
+                         result of backup().
+        :return: The started thread.
+        """
+        def run() -> None:
+            try:
+                result: tuple[str, float] | None = self.backup(
+                    backup_dir, keep, progress)
+            finally:
+                self.release_connection()
+            if not self.__interrupted:
+                callback(result)
+
+        return self.__start_thread(run)
+
     def recreate_database(self, schema_file: str, data_file: str) -> None:
         """
         Recreate the database by executing
@@ -55,67 +853,239 @@ class DatabaseModule:
         :param data_file: Path to the SQL data file.
         """
         try:
-            with sqlite3.connect(self.__db_path) as connection:
-                cursor = connection.cursor()
-                connection.execute("PRAGMA foreign_keys = ON;")
-                # Load schema
-                with open(schema_file, "r") as f:
-                    cursor.executescript(f.read())
-                logging.info("Database schema applied successfully.")
+            connection: sqlite3.Connection = self.get_connection()
+            cursor = connection.cursor()
+            # Load schema
+            with open(schema_file, "r") as f:
+                cursor.executescript(f.read())
+            logging.info("Database schema applied successfully.")
 
-                # Load default data
-                with open(data_file, "r") as f:
-                    cursor.executescript(f.read())
-                logging.info("Default data applied successfully.")
+            # Load default data
+            with open(data_file, "r") as f:
+                cursor.executescript(f.read())
+            logging.info("Default data applied successfully.")
 
-                connection.commit()
+            connection.commit()
+            # Cheap while the database only holds the default data
+            self.__enable_incremental_vacuum()
         except (sqlite3.Error, IOError) as e:
             logging.error(f"Failed to recreate the database: {e}")
+        self.invalidate_cache()
 
     def execute_select(self,
                        query: str,
-                       params: tuple | list[Any] | None) -> list[Any]:
+                       params: tuple | list[Any] | None,
+                       row_type: type[tuple] | None = None) -> list[Any]:
         """
         Execute a SELECT query and return all results.
+        :param row_type: NamedTuple class to return the rows as, its
+                         fields in the order of the selected columns.
+                         The fetched tuples are rebuilt with tuple.__new__,
+                         which is far cheaper than a sqlite3 row_factory
+                         called from C for every row.
         """
         try:
-            with sqlite3.connect(self.__db_path) as connection:
-                connection.execute("PRAGMA foreign_keys = ON;")
-                cursor: sqlite3.Cursor = connection.cursor()
-                if params is None:
-                    cursor.execute(query)
-                else:
-                    cursor.execute(query, params)
+            cursor: sqlite3.Cursor = self.get_connection().cursor()
+            if params is None:
+                cursor.execute(query)
+            else:
+                cursor.execute(query, params)
+            if row_type is None:
                 return cursor.fetchall()
+            return list(map(partial(tuple.__new__, row_type),
+                            cursor.fetchall()))
+        except sqlite3.Error as e:
+            logging.error(f"{self._get_line_info()}: "
+                          f"SQL error: {e}\nQuery: {query}")
+            return []
+
+    def execute_select_cached(
+            self,
+            query: str,
+            params: tuple | list[Any] | None) -> list[Any]:
+        """
+        Execute a SELECT query through the query cache.
+        Meant for reference data which is read far more often
+        than written, like types, manufacturers and tensiometers.
+        """
+        key: tuple[str, tuple | None] = (
+            query, None if params is None else tuple(params))
+        tables: tuple[str, ...] | None = self.__read_tables.get(query)
+        if tables is None:
+            tables = tuple(sorted({
+                table.lower()
+                for table in READ_TABLES_PATTERN.findall(query)}))
+            self.__read_tables[query] = tables
+        # Uncommitted writes of this thread must not end up in the cache
+        if self.get_connection().in_transaction:
+            return self.execute_select(query, params)
+
+        with self.__cache_lock:
+            generations: tuple[int, ...] = tuple(
+                self.__generations.get(table, 0) for table in tables)
+            entry: tuple[tuple[int, ...], list[Any]] | None = \
+                self.__cache.get(key)
+            if entry is not None and entry[0] == generations:
+                self.__cache_hits += 1
+                return list(entry[1])
+            self.__cache_misses += 1
+
+        try:
+            cursor: sqlite3.Cursor = self.get_connection().cursor()
+            if params is None:
+                cursor.execute(query)
+            else:
+                cursor.execute(query, params)
+            result: list[Any] = cursor.fetchall()
         except sqlite3.Error as e:
             logging.error(f"{self._get_line_info()}: "
                           f"SQL error: {e}\nQuery: {query}")
             return []
 
+        with self.__cache_lock:
+            self.__cache.pop(key, None)
+            self.__cache[key] = (generations, result)
+            # Evict the oldest entries first
+            while len(self.__cache) > self.CACHE_SIZE:
+                del self.__cache[next(iter(self.__cache))]
+        return list(result)
+
     def execute_query(self, query: str, params: tuple = ()) -> int | None:
         """
         Execute an INSERT, UPDATE, or DELETE query and return the last row ID.
         """
         try:
-            with sqlite3.connect(self.__db_path) as connection:
-                connection.execute("PRAGMA foreign_keys = ON;")
-                cursor: sqlite3.Cursor = connection.cursor()
-                cursor.execute(query, params)
-                connection.commit()
-                self.db_changed = True
-                return cursor.lastrowid
+            with self.transaction() as connection:
+                cursor: sqlite3.Cursor = connection.execute(query, params)
+                self.__mark_written(query)
+            self.db_changed = True
+            return cursor.lastrowid
         except sqlite3.Error as e:
             logging.error(f"{self._get_line_info()}: "
                           f"SQL error: {e}\nQuery: {query}")
             return None
 
+    def execute_many(self,
+                     query: str,
+                     params_seq: Iterable[tuple]) -> int | None:
+        """
+        Execute an INSERT, UPDATE, or DELETE query once per parameter tuple
+        within a single transaction and return the number of affected rows.
+        """
+        try:
+            with self.transaction() as connection:
+                cursor: sqlite3.Cursor = connection.executemany(
+                    query, params_seq)
+                self.__mark_written(query)
+            self.db_changed = True
+            return cursor.rowcount
+        except sqlite3.Error as e:
+            logging.error(f"{self._get_line_info()}: "
+                          f"SQL error: {e}\nQuery: {query}")
+            return None
+
+    def run_maintenance(self) -> None:
+        """
+        Reclaim free pages and refresh the query planner statistics.
+        Free pages are released with PRAGMA incremental_vacuum once they
+        exceed FREELIST_THRESHOLD of the file, at most
+        INCREMENTAL_VACUUM_PAGES per run, so every run takes bounded time.
+        Meant to run on the database worker thread. Databases without
+        incremental auto vacuum are switched over on startup by
+        initialize_database(), until then only the statistics are
+        refreshed.
+        """
+        if self.__interrupted:
+            return
+        try:
+            with self.__long_running_task() as connection:
+                self.db_changed = False
+                auto_vacuum: int = connection.execute(
+                    "PRAGMA auto_vacuum;").fetchone()[0]
+                if auto_vacuum == 2:
+                    page_count: int = connection.execute(
+                        "PRAGMA page_count;").fetchone()[0]
+                    freelist_count: int = connection.execute(
+                        "PRAGMA freelist_count;").fetchone()[0]
+                    if freelist_count > max(
+                            self.FREELIST_MIN_PAGES,
+                            page_count * self.FREELIST_THRESHOLD):
+                        # sqlite3 steps a PRAGMA only once, which frees
+                        # a single page, executescript() runs it to the end
+                        connection.executescript(
+                            "PRAGMA incremental_vacuum("
+                            f"{self.INCREMENTAL_VACUUM_PAGES});")
+                        logging.info(f"Database released up to "
+                                     f"{self.INCREMENTAL_VACUUM_PAGES} of "
+                                     f"{freelist_count} free pages.")
+                connection.execute(
+                    f"PRAGMA analysis_limit = {self.ANALYSIS_LIMIT};")
+                connection.execute("PRAGMA optimize;")
+        except sqlite3.Error as e:
+            self.db_changed = True
+            if self.__interrupted:
+                logging.info("Database maintenance interrupted.")
+            else:
+                logging.error(f"Database maintenance failed: {e}")
+
+    def __enable_incremental_vacuum(self) -> None:
+        """
+        Switch the database to incremental auto vacuum if it is not
+        yet. Once tables exist, and always in WAL mode, this takes a
+        full VACUUM, so it only runs on startup next to the migrations.
+        """
+        try:
+            with self.__long_running_task() as connection:
+                auto_vacuum: int = connection.execute(
+                    "PRAGMA auto_vacuum;").fetchone()[0]
+                if auto_vacuum == 2:
+                    return
+                connection.execute("PRAGMA auto_vacuum = INCREMENTAL;")
+                connection.execute("VACUUM;")
+            logging.info("Database switched to incremental vacuum.")
+        except sqlite3.Error as e:
+            logging.error(f"Failed to enable incremental vacuum: {e}")
+
+    @staticmethod
+    def pack_points(points: Iterable[tuple[float, float]]) -> bytes:
+        """
+        Pack (tension, deflection) pairs as little-endian float64.
+        """
+        values = array("d", (value for point in points for value in point))
+        if sys.byteorder == "big":
+            values.byteswap()
+        return values.tobytes()
+
+    def get_measurement_points(self, set_id: int) -> bytes:
+        """
+        Return the points of a measurement set packed as POINTS_DTYPE
+        (tension, deflection) pairs ordered by tension, for decoding
+        with np.frombuffer(points, POINTS_DTYPE).reshape(-1, 2).
+        Sets without a packed copy are packed from their rows.
+        :return: The packed points, empty if the set does not exist.
+        """
+        rows: list[Any] = self.execute_select(
+            SQLQueries.GET_MEASUREMENT_POINTS, (set_id,))
+        if not rows:
+            return b""
+        if rows[0][0] is not None:
+            return rows[0][0]
+
+        # Read and store in one transaction, a concurrent change of the
+        # rows makes the store fail instead of saving a stale copy
+        with self.transaction():
+            points: bytes = self.pack_points(self.execute_select(
+                SQLQueries.GET_MEASUREMENTS_BY_ID, (set_id,)))
+            self.execute_query(
+                SQLQueries.SET_MEASUREMENT_POINTS, (points, set_id))
+        return points
+
     def vacuum(self) -> None:
         """
         Optimize the database by running VACUUM.
         """
         try:
-            with sqlite3.connect(self.__db_path) as connection:
-                connection.execute("VACUUM;")
-                logging.info("Database vacuumed successfully.")
+            self.get_connection().execute("VACUUM;")
+            logging.info("Database vacuumed successfully.")
         except sqlite3.Error as e:
             logging.error(f"DatabaseManager.vacuum error: {e}")
@@ -0,0 +1,573 @@
+"""
+Database benchmarks for Spokeduino Mothership.
+
+Runs against a scratch database created from the scripts in sql/,
+so the real spokeduino.sqlite is never touched.
+
+The suite times every SQLQueries constant against a synthetic database
+from db_generator.py, writes the results as JSON and compares them with
+a stored baseline. Record the baseline on the machine the suite runs on.
+
+Usage:
+    python db_benchmark.py [--iterations N] [--entries N]
+    python db_benchmark.py --check-plans
+    python db_benchmark.py --startup [--iterations N]
+    python db_benchmark.py --suite [--iterations N] [--output FILE]
+                           [--baseline FILE] [--save-baseline]
+                           [--sets N] [--spokes N] [--seed N] ...
+    python db_benchmark.py --memory [--sets N] [--spokes N] ...
+"""
+import argparse
+import json
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from contextlib import closing
+from dataclasses import asdict
+from typing import Any
+from database_module import DatabaseModule, PragmaProfile
+from db_generator import add_scale_arguments, generate_database, get_scale
+from repository_module import HubRow, MeasurementRow, RimRow, SpokeRow
+from sql_queries import SQLQueries
+
+SQL_PATH: str = os.path.join(
+    os.path.dirname(os.path.realpath(__file__)), "sql")
+
+# Suite results compared against by default
+BASELINE_FILE: str = os.path.join(
+    os.path.dirname(os.path.realpath(__file__)), "benchmark_baseline.json")
+
+# Suite timings slower than the baseline by this factor are regressions,
+# unless they differ by less than REGRESSION_MIN_US of timer noise
+REGRESSION_FACTOR: float = 1.5
+REGRESSION_MIN_US: float = 5.0
+
+# Timed batches per suite case, the fastest batch is recorded
+SUITE_REPEATS: int = 3
+
+# Representative read paths fired on tab switches and spoke selection
+HOT_QUERIES: list[tuple[str, str, tuple]] = [
+    ("GET_SINGLE_SETTING", SQLQueries.GET_SINGLE_SETTING,
+     ("tensiometer_id",)),
+    ("GET_TENSIOMETERS", SQLQueries.GET_TENSIOMETERS, ()),
+    ("GET_SPOKE_TYPES", SQLQueries.GET_SPOKE_TYPES, ()),
+    ("GET_SPOKES_BY_MANUFACTURER", SQLQueries.GET_SPOKES_BY_MANUFACTURER,
+     (1,)),
+    ("GET_SPOKES_BY_ID", SQLQueries.GET_SPOKES_BY_ID, (1,)),
+    ("GET_MEASUREMENT_SETS", SQLQueries.GET_MEASUREMENT_SETS, (1, 1)),
+    ("GET_MEASUREMENTS_BY_ID", SQLQueries.GET_MEASUREMENTS_BY_ID, (1,)),
+    ("GET_MEASUREMENT_SETS_GROUPED",
+     SQLQueries.GET_MEASUREMENT_SETS_GROUPED, (1, 1, 50, 0)),
+]
+
+# Plan rows of scans that do not read a table
+SUBQUERY_SCANS: tuple[str, ...] = ("SCAN (subquery", "SCAN CONSTANT ROW")
+
+# Queries that must be answered through an index, never a full SCAN
+HOT_PLAN_QUERIES: set[str] = {
+    "GET_SINGLE_SETTING",
+    "GET_SPOKES_BY_MANUFACTURER",
+    "GET_SPOKES_BY_ID",
+    "GET_MEASUREMENT_SETS",
+    "GET_MEASUREMENTS_BY_ID",
+    "GET_MEASUREMENT_SETS_GROUPED",
+    "GET_HUBS_BY_MANUFACTURER",
+    "GET_HUBS_BY_ID",
+    "GET_RIMS_BY_MANUFACTURER",
+    "GET_RIMS_BY_ID",
+    "MODIFY_SPOKE",
+    "MODIFY_HUB",
+    "MODIFY_RIM",
+    "DELETE_SPOKE",
+    "DELETE_HUB",
+    "DELETE_RIM",
+    "DELETE_MEASUREMENT",
+    "DELETE_MEASUREMENT_SET",
+    "UPSERT_SETTING",
+}
+
+def create_database(directory: str) -> str:
+    """
+    Create a scratch database with the standard and test data.
+    :param directory: Directory to place the database file in.
+    :return: Path to the database file.
+    """
+    db_path: str = os.path.join(directory, "benchmark.sqlite")
+    db = DatabaseModule(db_path)
+    db.initialize_database(
+        os.path.join(SQL_PATH, "init_schema.sql"),
+        os.path.join(SQL_PATH, "standard_data.sql"))
+    with open(os.path.join(SQL_PATH, "testdata.sql"), "r") as f:
+        db.get_connection().executescript(f.read())
+    db.close()
+    return db_path
+
+
+def time_calls(func: Callable[[], Any], iterations: int) -> float:
+    """
+    Call func repeatedly and return the mean latency in microseconds.
+    """
+    func()  # Warm up caches
+    start: float = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+class Rollback(Exception):
+    """
+    Raised inside a transaction to discard the writes of a timed call.
+    """
+
+
+def rolled_back(db: DatabaseModule, func: Callable[[], Any]) -> None:
+    """
+    Call func in a transaction that is rolled back afterwards,
+    so write paths can be timed repeatedly on the same data.
+    """
+    try:
+        with db.transaction():
+            func()
+            raise Rollback()
+    except Rollback:
+        pass
+
+
+def get_suite_cases(db: DatabaseModule) -> dict[str, Callable[[], Any]]:
+    """
+    Build a timed call for every SQLQueries constant and for the
+    composite save and load paths of the measurement tab.
+    Reads target the spoke and tensiometer with the most measurement
+    sets, writes run rolled back.
+    :return: The calls by query or path name.
+    """
+    spoke_id, tensiometer_id = db.execute_select(
+        """SELECT spoke_id, tensiometer_id FROM spoke_measurement_sets
+        GROUP BY spoke_id, tensiometer_id ORDER BY COUNT(*) DESC LIMIT 1""",
+        ())[0]
+    set_id, points, set_uuid = db.execute_select(
+        """SELECT id, points, uuid FROM spoke_measurement_sets
+        WHERE spoke_id = ? AND tensiometer_id = ? ORDER BY id LIMIT 1""",
+        (spoke_id, tensiometer_id))[0]
+    measurement_id: int = db.execute_select(
+        "SELECT MIN(id) FROM spoke_measurements WHERE set_id = ?",
+        (set_id,))[0][0]
+    spoke: tuple = db.execute_select(
+        """SELECT manufacturer_id, type_id, name FROM spoke_models
+        WHERE id = ?""", (spoke_id,))[0]
+    hub: tuple = db.execute_select(
+        "SELECT id, manufacturer_id, axle_type_id FROM hub_models LIMIT 1",
+        ())[0]
+    rim: tuple = db.execute_select(
+        "SELECT id, manufacturer_id FROM rim_models LIMIT 1", ())[0]
+    search: str = f'"{spoke[2].split()[0]}"*'
+
+    reads: dict[str, tuple] = {
+        "GET_SETTINGS": (),
+        "GET_SINGLE_SETTING": ("tensiometer_id",),
+        "GET_TENSIOMETERS": (),
+        "GET_SPOKE_MANUFACTURERS": (),
+        "GET_SPOKE_TYPES": (),
+        "GET_SPOKES": (),
+        "GET_SPOKES_BY_MANUFACTURER": (spoke[0],),
+        "GET_SPOKES_BY_ID": (spoke_id,),
+        "GET_MEASUREMENT_SETS": (spoke_id, tensiometer_id),
+        "GET_MEASUREMENT_SETS_GROUPED": (spoke_id, tensiometer_id, 50, 0),
+        "GET_MEASUREMENTS_BY_ID": (set_id,),
+        "GET_MEASUREMENT_POINTS": (set_id,),
+        "GET_MEASUREMENT_SET_UUID": (set_id,),
+        "GET_FIT_CACHE": (set_id, 1, 1),
+        "GET_HUB_MANUFACTURERS": (),
+        "GET_HUBS": (),
+        "GET_HUBS_BY_MANUFACTURER": (hub[1],),
+        "GET_HUBS_BY_ID": (hub[0],),
+        "GET_RIM_MANUFACTURERS": (),
+        "GET_RIMS": (),
+        "GET_RIMS_BY_MANUFACTURER": (rim[1],),
+        "GET_RIMS_BY_ID": (rim[0],),
+        "GET_AXLE_TYPES": (),
+        "GET_BOOST_CLASSIFICATIONS": (),
+        "GET_ETRTO_DESCRIPTIONS": (),
+        "SEARCH_CATALOG": (search, None, None, 50),
+    }
+    writes: dict[str, tuple] = {
+        "ADD_MEASUREMENT": (set_id, 1000, 2.8),
+        "ADD_MEASUREMENT_SET": (spoke_id, tensiometer_id, "benchmark"),
+        "ADD_TENSIOMETER": ("benchmark",),
+        "ADD_SPOKE_MANUFACTURER": ("benchmark",),
+        "ADD_SPOKE": (spoke[0], "benchmark", spoke[1], 14, 6.0, "2.0", ""),
+        "ADD_HUB_MANUFACTURER": ("benchmark",),
+        "ADD_HUB": (hub[1], "benchmark", hub[2], 100, 45.0, 45.0, 30.0,
+                    30.0, 2.5, 2.5, None, True, True, True, True, ""),
+        "ADD_RIM_MANUFACTURER": ("benchmark",),
+        "ADD_RIM": (rim[1], "benchmark", 622, 21, 25.0, 598.0, 0.0, 0.0,
+                    25.0, True, ""),
+        "SET_FIT_CACHE": (1, 1, "{}", set_id, points),
+        "SET_MEASUREMENT_POINTS": (points, set_id),
+        "SET_MEASUREMENT_SET_UUID": (set_uuid, set_id),
+        "MODIFY_SPOKE": ("benchmark", spoke[1], 14, 6.0, "2.0", "",
+                         spoke_id),
+        "MODIFY_HUB": (hub[1], "benchmark", hub[2], 100, 45.0, 45.0, 30.0,
+                       30.0, 2.5, 2.5, None, True, True, True, True, "",
+                       hub[0]),
+        "MODIFY_RIM": (rim[1], "benchmark", 622, 21, 25.0, 598.0, 0.0, 0.0,
+                       25.0, True, "", rim[0]),
+        "DELETE_SPOKE": (spoke_id,),
+        "DELETE_HUB": (hub[0],),
+        "DELETE_RIM": (rim[0],),
+        "DELETE_MEASUREMENT": (measurement_id,),
+        "DELETE_MEASUREMENT_SET": (set_id,),
+        "UPSERT_SETTING": ("spoke_direction", "down"),
+    }
+    missing: set[str] = set(get_sql_queries()) - set(reads) - set(writes)
+    if missing:
+        raise ValueError(
+            f"No benchmark parameters for {', '.join(sorted(missing))}")
+
+    queries: dict[str, str] = get_sql_queries()
+    cases: dict[str, Callable[[], Any]] = {}
+    for name, params in reads.items():
+        cases[name] = (
+            lambda query=queries[name], params=params:
+            db.execute_select(query, params))
+    for name, params in writes.items():
+        cases[name] = (
+            lambda query=queries[name], params=params:
+            rolled_back(db, lambda: db.execute_query(query, params)))
+
+    measurements: list[tuple[float, float]] = db.execute_select(
+        SQLQueries.GET_MEASUREMENTS_BY_ID, (set_id,))
+
+    def save_measurement_set() -> None:
+        # Same statements as saving on the measurement tab
+        new_set_id: int | None = db.execute_query(
+            SQLQueries.ADD_MEASUREMENT_SET,
+            (spoke_id, tensiometer_id, "benchmark"))
+        db.execute_many(
+            SQLQueries.ADD_MEASUREMENT,
+            [(new_set_id, tension, deflection)
+             for tension, deflection in measurements])
+        db.execute_query(
+            SQLQueries.SET_MEASUREMENT_POINTS,
+            (DatabaseModule.pack_points(measurements), new_set_id))
+
+    cases["save_measurement_set"] = (
+        lambda: rolled_back(db, save_measurement_set))
+    cases["get_measurement_points"] = (
+        lambda: db.get_measurement_points(set_id))
+    cases["load_spokes_cached"] = (
+        lambda: db.execute_select_cached(
+            SQLQueries.GET_SPOKES_BY_MANUFACTURER, (spoke[0],)))
+    return cases
+
+
+def benchmark_suite(db_path: str, iterations: int) -> dict[str, float]:
+    """
+    Time every suite case, keeping the fastest of SUITE_REPEATS batches.
+    :return: Mean latency in microseconds by case name.
+    """
+    db = DatabaseModule(db_path)
+    results: dict[str, float] = {}
+    print(f"{'case':<30}{'us':>12}")
+    for name, case in get_suite_cases(db).items():
+        results[name] = min(
+            time_calls(case, iterations) for _ in range(SUITE_REPEATS))
+        print(f"{name:<30}{results[name]:>12.1f}")
+    db.close()
+    return results
+
+
+def compare_with_baseline(results: dict[str, Any],
+                          baseline: dict[str, Any]) -> bool:
+    """
+    Print the suite results next to the baseline.
+    :return: False if a case regressed by more than REGRESSION_FACTOR.
+    """
+    if results["scale"] != baseline["scale"]:
+        print("Warning: the baseline was recorded at a different scale")
+    passed: bool = True
+    print(f"{'case':<30}{'baseline':>12}{'current':>12}{'ratio':>9}")
+    for name, current in results["results"].items():
+        before: float | None = baseline["results"].get(name)
+        if before is None:
+            print(f"{name:<30}{'-':>12}{current:>12.1f}")
+            continue
+        ratio: float = current / before if before else 1.0
+        regressed: bool = (ratio > REGRESSION_FACTOR and
+                           current - before > REGRESSION_MIN_US)
+        if regressed:
+            passed = False
+        print(f"{name:<30}{before:>12.1f}{current:>12.1f}{ratio:>8.2f}x"
+              f"{'  REGRESSION' if regressed else ''}")
+    return passed
+
+
+def run_suite(directory: str, args: argparse.Namespace) -> bool:
+    """
+    Generate the synthetic database, run the suite and handle
+    the JSON results and the baseline.
+    :return: False if the results regressed against the baseline.
+    """
+    db_path: str = os.path.join(directory, "suite.sqlite")
+    start: float = time.perf_counter()
+    generate_database(db_path, get_scale(args), args.seed)
+    print(f"Generated database in {time.perf_counter() - start:.1f} s")
+
+    results: dict[str, Any] = {
+        "sqlite_version": sqlite3.sqlite_version,
+        "scale": asdict(get_scale(args)),
+        "seed": args.seed,
+        "iterations": args.iterations,
+        "results": benchmark_suite(db_path, args.iterations),
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Baseline written to {args.baseline}")
+        return True
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}, "
+              "record one with --save-baseline")
+        return True
+    with open(args.baseline, "r") as f:
+        baseline: dict[str, Any] = json.load(f)
+    print()
+    return compare_with_baseline(results, baseline)
+
+
+def measure_rows(fetch: Callable[[], list[Any]]) -> tuple[int, float]:
+    """
+    Return the memory held by the rows fetch returns, in bytes,
+    and the time the fetch takes, in milliseconds.
+    """
+    start: float = time.perf_counter()
+    fetch()
+    elapsed: float = (time.perf_counter() - start) * 1000
+    tracemalloc.start()
+    try:
+        before: int = tracemalloc.get_traced_memory()[0]
+        rows: list[Any] = fetch()
+        held: int = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    del rows
+    return held, elapsed
+
+
+def benchmark_row_memory(db_path: str) -> None:
+    """
+    Compare memory and fetch time of large result sets as plain
+    tuples, as typed rows and, for spokes, as the (id, list of fields)
+    pairs the spoke list kept before the typed rows.
+    """
+    db = DatabaseModule(db_path)
+    cases: list[tuple[str, str, type[tuple]]] = [
+        ("GET_SPOKES", SQLQueries.GET_SPOKES, SpokeRow),
+        ("GET_HUBS", SQLQueries.GET_HUBS, HubRow),
+        ("GET_RIMS", SQLQueries.GET_RIMS, RimRow),
+        ("all measurements",
+         "SELECT tension, deflection FROM spoke_measurements",
+         MeasurementRow),
+    ]
+    print(f"{'query':<20}{'rows':>10}{'form':>16}{'MiB':>9}{'ms':>9}")
+    for name, query, row_type in cases:
+        count: int = len(db.execute_select(query, ()))
+        forms: dict[str, Callable[[], list[Any]]] = {
+            "tuples": lambda: db.execute_select(query, ()),
+            "typed rows": lambda: db.execute_select(query, (), row_type),
+        }
+        if row_type is SpokeRow:
+            forms["id + list"] = lambda: [
+                (spoke[0], list(spoke[1:]))
+                for spoke in db.execute_select(query, ())]
+        for form, fetch in forms.items():
+            held, elapsed = measure_rows(fetch)
+            print(f"{name:<20}{count:>10}{form:>16}"
+                  f"{held / 2 ** 20:>9.2f}{elapsed:>9.1f}")
+    db.close()
+
+
+def benchmark_query_latency(db_path: str, iterations: int) -> None:
+    """
+    Compare per-query latency of a fresh connection per call
+    against the persistent per-thread connection.
+    """
+    def fresh_connection(query: str, params: tuple) -> list[Any]:
+        with closing(sqlite3.connect(db_path)) as connection:
+            connection.execute("PRAGMA foreign_keys = ON;")
+            return connection.execute(query, params).fetchall()
+
+    db = DatabaseModule(db_path)
+    print(f"{'query':<30}{'fresh (us)':>12}{'pooled (us)':>13}"
+          f"{'speedup':>9}{'cached (us)':>13}")
+    for name, query, params in HOT_QUERIES:
+        before: float = time_calls(
+            lambda: fresh_connection(query, params), iterations)
+        after: float = time_calls(
+            lambda: db.execute_select(query, params), iterations)
+        cached: float = time_calls(
+            lambda: db.execute_select_cached(query, params), iterations)
+        print(f"{name:<30}{before:>12.1f}{after:>13.1f}"
+              f"{before / after:>8.1f}x{cached:>13.1f}")
+    print(f"Query cache: {db.get_cache_stats()}")
+    db.close()
+
+
+def benchmark_pedal_entry(db_path: str, entries: int) -> None:
+    """
+    Measure commits per second for every pragma profile while simulating
+    pedal-driven entry: each pedal press saves a setting and a point.
+    """
+    print(f"{'profile':<12}{'commits/s':>12}")
+    for profile in PragmaProfile:
+        profile_path: str = f"{db_path}.{profile.value}"
+        shutil.copyfile(db_path, profile_path)
+        db = DatabaseModule(profile_path, profile=profile)
+        set_id: int | None = db.execute_query(
+            SQLQueries.ADD_MEASUREMENT_SET, (1, 1, "benchmark"))
+        start: float = time.perf_counter()
+        for entry in range(entries):
+            db.execute_query(
+                SQLQueries.UPSERT_SETTING, ("spoke_direction", "down"))
+            db.execute_query(
+                SQLQueries.ADD_MEASUREMENT, (set_id, entry, entry / 100))
+        elapsed: float = time.perf_counter() - start
+        db.close()
+        print(f"{profile.value:<12}{2 * entries / elapsed:>12.0f}")
+
+
+def benchmark_first_start(directory: str, iterations: int) -> None:
+    """
+    Compare creating a new database from the SQL scripts
+    against cloning the prebuilt template.
+    """
+    schema_file: str = os.path.join(SQL_PATH, "init_schema.sql")
+    data_file: str = os.path.join(SQL_PATH, "standard_data.sql")
+    template_file: str = os.path.join(directory, "template.sqlite")
+    DatabaseModule.build_template(schema_file, data_file, template_file)
+
+    def first_start(template: str) -> None:
+        db_path: str = os.path.join(directory, "first_start.sqlite")
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(db_path + suffix):
+                os.remove(db_path + suffix)
+        db = DatabaseModule(db_path)
+        db.initialize_database(schema_file, data_file, template_file=template)
+        db.close()
+
+    scripts: float = time_calls(
+        lambda: first_start(os.path.join(directory, "missing.sqlite")),
+        iterations) / 1000
+    template: float = time_calls(
+        lambda: first_start(template_file), iterations) / 1000
+    print(f"{'first start':<30}{'ms':>10}")
+    print(f"{'scripts':<30}{scripts:>10.1f}")
+    print(f"{'template':<30}{template:>10.1f}")
+    print(f"{'speedup':<30}{scripts / template:>9.1f}x")
+
+
+def get_sql_queries() -> dict[str, str]:
+    """
+    Return every query constant of SQLQueries.
+    """
+    return {
+        name: value
+        for name, value in vars(SQLQueries).items()
+        if name.isupper() and isinstance(value, str)
+    }
+
+
+def check_query_plans(db_path: str) -> bool:
+    """
+    Run EXPLAIN QUERY PLAN on every SQLQueries constant.
+    Scans of subquery and CTE results are fine, every other SCAN
+    reads a whole table, whether it is aliased or not.
+    :return: False if a hot query falls back to a full table SCAN
+             or cannot be prepared anymore.
+    """
+    passed: bool = True
+    with closing(sqlite3.connect(db_path)) as connection:
+        for name, query in get_sql_queries().items():
+            params: tuple = (1,) * query.count("?")
+            hot: bool = name in HOT_PLAN_QUERIES
+            try:
+                plan: list[Any] = connection.execute(
+                    f"EXPLAIN QUERY PLAN {query}", params).fetchall()
+            except sqlite3.Error as e:
+                if hot:
+                    passed = False
+                print(f"{'ERR':<5}{name:<30}{e}")
+                continue
+            details: list[str] = [row[3] for row in plan]
+            # Subqueries run as co-routines or are materialized
+            # under their alias before they are scanned
+            subqueries: set[str] = {
+                detail.split()[1] for detail in details
+                if detail.startswith(("CO-ROUTINE ", "MATERIALIZE "))}
+            scans: list[str] = [
+                detail for detail in details
+                if detail.startswith("SCAN ")
+                and detail.split()[1] not in subqueries
+                and not detail.startswith(SUBQUERY_SCANS)]
+            status: str = "FAIL" if hot and scans else "ok"
+            if status == "FAIL":
+                passed = False
+            print(f"{status:<5}{name:<30}{'; '.join(details)}")
+    return passed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=1000)
+    parser.add_argument("--entries", type=int, default=200)
+    parser.add_argument("--check-plans", action="store_true",
+                        help="Fail if a hot query does a full table scan")
+    parser.add_argument("--startup", action="store_true",
+                        help="Compare first start from scripts and template")
+    parser.add_argument("--suite", action="store_true",
+                        help="Time every query on a synthetic database")
+    parser.add_argument("--output",
+                        help="Write the suite results as JSON")
+    parser.add_argument("--baseline", default=BASELINE_FILE,
+                        help="Suite results to compare against")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="Store the suite results as the baseline")
+    parser.add_argument("--memory", action="store_true",
+                        help="Compare memory of tuples and typed rows")
+    parser.add_argument("--seed", type=int, default=0)
+    add_scale_arguments(parser)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        if args.startup:
+            benchmark_first_start(directory, args.iterations)
+            return
+        if args.suite:
+            if not run_suite(directory, args):
+                sys.exit(1)
+            return
+        if args.memory:
+            memory_path: str = os.path.join(directory, "memory.sqlite")
+            generate_database(memory_path, get_scale(args), args.seed)
+            benchmark_row_memory(memory_path)
+            return
+        db_path: str = create_database(directory)
+        if args.check_plans:
+            if not check_query_plans(db_path):
+                sys.exit(1)
+            return
+        benchmark_query_latency(db_path, args.iterations)
+        print()
+        benchmark_pedal_entry(db_path, args.entries)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,292 @@
+"""
+Synthetic database generator for Spokeduino Mothership.
+
+Creates a database from the scripts in sql/ and fills it with
+synthetic spokes, tensiometers, hubs, rims and tension/deflection
+measurement sets at a configurable scale, for benchmarking the
+database paths with far more data than sql/testdata.sql holds.
+The same seed always produces the same database.
+
+Usage:
+    python db_generator.py OUTPUT [--spokes N] [--tensiometers N]
+                           [--sets N] [--points N] [--hubs N]
+                           [--rims N] [--seed N]
+"""
+import argparse
+import math
+import os
+import random
+from dataclasses import dataclass
+from typing import Any
+from database_module import DatabaseModule
+from sql_queries import SQLQueries
+
+SQL_PATH: str = os.path.join(
+    os.path.dirname(os.path.realpath(__file__)), "sql")
+
+# Rows passed to a single executemany call
+CHUNK_SIZE: int = 10000
+
+# Measured tension range in Newton, sets step evenly through it
+TENSION_MIN: float = 400.0
+TENSION_MAX: float = 1500.0
+
+# Deflection at TENSION_MAX and exponent of the power law
+# deflection = a * tension^b the synthetic spokes follow,
+# fitted to the sets in sql/testdata.sql
+DEFLECTION_RANGE: tuple[float, float] = (2.6, 3.6)
+EXPONENT_RANGE: tuple[float, float] = (0.2, 0.32)
+# Standard deviation of the reading noise in mm
+DEFLECTION_NOISE: float = 0.02
+
+SPOKE_NAMES: list[str] = [
+    "Race", "Laser", "Leader", "Strong", "Competition", "Champion",
+    "Aerolite", "Revolution", "Alpine", "Superlight", "Aero", "Force"]
+SPOKE_DIMENSIONS: list[tuple[int, float, str]] = [
+    (14, 6.7, "2.0"),
+    (14, 5.7, "2.0/1.8/2.0"),
+    (14, 4.9, "2.0/1.65/2.0"),
+    (15, 4.3, "1.8/1.5/1.8"),
+    (13, 6.6, "2.3/1.8/2.0"),
+    (14, 4.5, "2.0/0.9x2.2/2.0")]
+COMMENTS: list[str] = [
+    "", "", "", "Black", "Silver", "J-bend", "Straightpull",
+    "Measured twice", "New batch", "Worn threads"]
+HUB_NAMES: list[str] = [
+    "240", "350", "180", "Onyx", "Hydra", "Infinity", "CK", "Nova"]
+RIM_NAMES: list[str] = [
+    "XR", "Arch", "Flow", "Crest", "Grail", "Enduro", "Road", "Trail"]
+RIM_SIZES: list[tuple[int, int, float]] = [
+    (622, 19, 602.0), (622, 21, 598.0), (622, 25, 594.0),
+    (584, 25, 560.0), (584, 30, 556.0), (559, 23, 538.0)]
+
+
+@dataclass
+class GeneratorScale:
+    """
+    Amount of rows the generator adds on top of the standard data.
+    """
+    spokes: int = 1000
+    tensiometers: int = 5
+    sets: int = 100000
+    points: int = 12
+    hubs: int = 200
+    rims: int = 200
+
+
+def get_ids(db: DatabaseModule, table: str) -> list[int]:
+    """
+    Return the ids of all rows of a table.
+    """
+    return [row[0] for row in db.execute_select(
+        f"SELECT id FROM {table} ORDER BY id", ())]
+
+
+def insert_chunked(db: DatabaseModule,
+                   query: str,
+                   rows: list[tuple[Any, ...]]) -> None:
+    """
+    Insert rows with executemany in chunks of CHUNK_SIZE.
+    """
+    for start in range(0, len(rows), CHUNK_SIZE):
+        if db.execute_many(query, rows[start:start + CHUNK_SIZE]) is None:
+            raise RuntimeError("Failed to insert into the database")
+
+
+def add_tensiometers(db: DatabaseModule,
+                     rng: random.Random,
+                     count: int) -> None:
+    """
+    Add tensiometers with unique synthetic names.
+    """
+    insert_chunked(db, SQLQueries.ADD_TENSIOMETER, [
+        (f"Synthetic {rng.choice(['TM', 'TL', 'TC'])}-{index}",)
+        for index in range(count)])
+
+
+def add_spokes(db: DatabaseModule,
+               rng: random.Random,
+               count: int) -> None:
+    """
+    Add spokes of the standard manufacturers and types.
+    """
+    manufacturer_ids: list[int] = get_ids(db, "spoke_manufacturers")
+    type_ids: list[int] = get_ids(db, "spoke_types")
+    rows: list[tuple[Any, ...]] = []
+    for index in range(count):
+        gauge, weight, dimensions = rng.choice(SPOKE_DIMENSIONS)
+        rows.append((
+            rng.choice(manufacturer_ids),
+            f"{rng.choice(SPOKE_NAMES)} {index}",
+            rng.choice(type_ids),
+            gauge,
+            round(weight * rng.uniform(0.95, 1.05), 1),
+            dimensions,
+            rng.choice(COMMENTS)))
+    insert_chunked(db, SQLQueries.ADD_SPOKE, rows)
+
+
+def add_hubs(db: DatabaseModule,
+             rng: random.Random,
+             count: int) -> None:
+    """
+    Add hubs of synthetic manufacturers, 20 hubs each.
+    """
+    insert_chunked(db, SQLQueries.ADD_HUB_MANUFACTURER, [
+        (f"Synthetic hubs {index}",) for index in range(max(1, count // 20))])
+    manufacturer_ids: list[int] = get_ids(db, "hub_manufacturers")
+    axle_type_ids: list[int] = get_ids(db, "axle_types")
+    boost_ids: list[Any] = get_ids(db, "boost_classifications") + [None]
+    rows: list[tuple[Any, ...]] = []
+    for index in range(count):
+        is_front: bool = rng.random() < 0.5
+        pcd: float = round(rng.uniform(35.0, 60.0), 1)
+        rows.append((
+            rng.choice(manufacturer_ids),
+            f"{rng.choice(HUB_NAMES)} {index}",
+            rng.choice(axle_type_ids),
+            rng.choice([100, 110] if is_front else [130, 135, 142, 148]),
+            pcd, pcd,
+            round(rng.uniform(20.0, 40.0), 1),
+            round(rng.uniform(20.0, 40.0), 1),
+            2.5, 2.5,
+            rng.choice(boost_ids),
+            is_front,
+            rng.random() < 0.8,
+            rng.random() < 0.5,
+            rng.random() < 0.7,
+            rng.choice(COMMENTS)))
+    insert_chunked(db, SQLQueries.ADD_HUB, rows)
+
+
+def add_rims(db: DatabaseModule,
+             rng: random.Random,
+             count: int) -> None:
+    """
+    Add rims of synthetic manufacturers, 20 rims each.
+    """
+    insert_chunked(db, SQLQueries.ADD_RIM_MANUFACTURER, [
+        (f"Synthetic rims {index}",) for index in range(max(1, count // 20))])
+    manufacturer_ids: list[int] = get_ids(db, "rim_manufacturers")
+    rows: list[tuple[Any, ...]] = []
+    for index in range(count):
+        bsd, width, erd = rng.choice(RIM_SIZES)
+        rows.append((
+            rng.choice(manufacturer_ids),
+            f"{rng.choice(RIM_NAMES)} {index}",
+            bsd, width,
+            width + 4.0,
+            erd + round(rng.uniform(-4.0, 4.0), 1),
+            0.0, 0.0,
+            round(rng.uniform(18.0, 45.0), 1),
+            rng.random() < 0.8,
+            rng.choice(COMMENTS)))
+    insert_chunked(db, SQLQueries.ADD_RIM, rows)
+
+
+def add_measurement_sets(db: DatabaseModule,
+                         rng: random.Random,
+                         count: int,
+                         points: int) -> None:
+    """
+    Add measurement sets spread over all spokes and tensiometers.
+    Every spoke follows its own power law, every set adds reading noise.
+    Sets are stored like the measurement tab saves them, rows and the
+    packed points.
+    """
+    spoke_ids: list[int] = get_ids(db, "spoke_models")
+    tensiometer_ids: list[int] = get_ids(db, "tensiometers")
+    # Power law parameters (a, b) per spoke
+    laws: dict[int, tuple[float, float]] = {}
+    for spoke_id in spoke_ids:
+        exponent: float = rng.uniform(*EXPONENT_RANGE)
+        laws[spoke_id] = (
+            rng.uniform(*DEFLECTION_RANGE) / TENSION_MAX ** exponent,
+            exponent)
+    step: float = (TENSION_MAX - TENSION_MIN) / max(1, points - 1)
+    tensions: list[float] = [
+        round(TENSION_MIN + step * index) for index in range(points)]
+
+    first_id: int = db.execute_select(
+        "SELECT COALESCE(MAX(id), 0) + 1 FROM spoke_measurement_sets",
+        ())[0][0]
+    sets: list[tuple[Any, ...]] = []
+    measurements: list[tuple[Any, ...]] = []
+    packed: list[tuple[bytes, int]] = []
+    for set_id in range(first_id, first_id + count):
+        spoke_id: int = rng.choice(spoke_ids)
+        a, b = laws[spoke_id]
+        sets.append((spoke_id, rng.choice(tensiometer_ids),
+                     rng.choice(COMMENTS)))
+        set_points: list[tuple[float, float]] = [
+            (tension,
+             round(a * math.pow(tension, b)
+                   + rng.gauss(0.0, DEFLECTION_NOISE), 2))
+            for tension in tensions]
+        measurements.extend(
+            (set_id, tension, deflection)
+            for tension, deflection in set_points)
+        packed.append((DatabaseModule.pack_points(set_points), set_id))
+
+    insert_chunked(db, SQLQueries.ADD_MEASUREMENT_SET, sets)
+    insert_chunked(db, SQLQueries.ADD_MEASUREMENT, measurements)
+    insert_chunked(db, SQLQueries.SET_MEASUREMENT_POINTS, packed)
+
+
+def generate_database(db_path: str,
+                      scale: GeneratorScale,
+                      seed: int = 0) -> None:
+    """
+    Create a database at db_path and fill it with synthetic data.
+    :param db_path: Path of the new database, must not exist yet.
+    :param scale: Amount of rows to add.
+    :param seed: Seed of the random generator.
+    """
+    if os.path.exists(db_path):
+        raise FileExistsError(f"{db_path} already exists")
+    rng = random.Random(seed)
+    db = DatabaseModule(db_path)
+    db.initialize_database(
+        os.path.join(SQL_PATH, "init_schema.sql"),
+        os.path.join(SQL_PATH, "standard_data.sql"))
+    with db.transaction():
+        add_tensiometers(db, rng, scale.tensiometers)
+        add_spokes(db, rng, scale.spokes)
+        add_hubs(db, rng, scale.hubs)
+        add_rims(db, rng, scale.rims)
+        add_measurement_sets(db, rng, scale.sets, scale.points)
+    db.run_maintenance()
+    db.close()
+
+
+def add_scale_arguments(parser: argparse.ArgumentParser) -> None:
+    """
+    Add the GeneratorScale fields as command line options.
+    """
+    defaults = GeneratorScale()
+    for name in vars(defaults):
+        parser.add_argument(f"--{name}", type=int,
+                            default=getattr(defaults, name))
+
+
+def get_scale(args: argparse.Namespace) -> GeneratorScale:
+    """
+    Build the GeneratorScale from parsed command line options.
+    """
+    return GeneratorScale(**{
+        name: getattr(args, name) for name in vars(GeneratorScale())})
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("output")
+    add_scale_arguments(parser)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    generate_database(args.output, get_scale(args), args.seed)
+    print(f"Database written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
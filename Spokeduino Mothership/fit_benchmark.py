@@ -0,0 +1,171 @@
+"""
+Fit benchmarks for Spokeduino Mothership.
+
+Times FitModel.invert against a loop of FitModel.tension calls for
+every FitType and checks that both agree within the inverse table
+tolerance. The time to build the inverse
+table, which FitModel.tension looks up, is reported separately.
+Deflections are drawn uniformly from slightly beyond the extrapolation
+range, so some of them have no tension.
+
+With --stream, points are fed one at a time with random edits in
+between, like gauge readings during a measurement. Each step is fitted
+incrementally by fit_stream and in full by fit_data, and the largest
+difference to np.polyfit at the measured tensions is reported.
+
+Usage:
+    python fit_benchmark.py [--sizes N [N ...]] [--seed N]
+    python fit_benchmark.py --stream [--points N] [--seed N]
+"""
+import argparse
+import time
+import numpy as np
+from calculation_module import (
+    FitModel, FitType, InverseTable, TensionDeflectionFitter)
+
+# Measurement set 1 of sql/testdata.sql as (tension, deflection)
+SAMPLE_DATA: list[tuple[float, float]] = [
+    (400, 2.20), (500, 2.34), (600, 2.49), (700, 2.57),
+    (800, 2.67), (900, 2.76), (1000, 2.82), (1100, 2.89),
+    (1200, 2.95), (1300, 3.01), (1400, 3.05), (1500, 3.10)]
+
+# Deflection counts timed by default
+SIZES: list[int] = [10, 1000, 1000000]
+
+# The scalar loop runs on at most this many deflections,
+# larger sizes are extrapolated from it
+SCALAR_SAMPLE: int = 10000
+
+
+def get_deflections(fit_model: FitModel,
+                    size: int,
+                    rng: np.random.Generator) -> np.ndarray:
+    """
+    Draw deflections from the extrapolation range widened by
+    another extrapolation_factor on both sides.
+    """
+    margin: float = 2 * fit_model.extrapolation_factor * (
+        fit_model.d_max - fit_model.d_min)
+    return rng.uniform(fit_model.d_min - margin,
+                       fit_model.d_max + margin, size)
+
+
+def compare(fit_model: FitModel,
+            deflections: np.ndarray) -> tuple[float, float, int]:
+    """
+    Time both paths on the same deflections.
+    :return: Scalar and vectorized time in ms and the number of
+             deflections on which they disagree.
+    """
+    tolerance: float = fit_model.INVERSE_TABLE_TOLERANCE
+    sample: np.ndarray = deflections[:SCALAR_SAMPLE]
+    start: float = time.perf_counter()
+    scalar: list[float | None] = [
+        fit_model.tension(float(deflection))
+        for deflection in sample]
+    scalar_ms: float = ((time.perf_counter() - start) * 1000
+                        * len(deflections) / len(sample))
+
+    start = time.perf_counter()
+    vectorized: np.ndarray = fit_model.invert(deflections)
+    vector_ms: float = (time.perf_counter() - start) * 1000
+
+    expected: np.ndarray = np.array(
+        [np.nan if tension is None else tension for tension in scalar],
+        dtype=float)
+    found: np.ndarray = vectorized[:len(sample)]
+    mismatches: int = int(np.count_nonzero(
+        (np.isnan(expected) != np.isnan(found)) |
+        (np.abs(expected - found) > tolerance)))
+    return scalar_ms, vector_ms, mismatches
+
+
+def benchmark_stream(points: int, rng: np.random.Generator) -> None:
+    """
+    Stream points through fit_stream and fit_data for every
+    polynomial FitType, editing a random point after each new one.
+    """
+    tensions: np.ndarray = np.linspace(400.0, 1500.0, points)
+    readings: np.ndarray = 0.48 * tensions ** 0.25 + rng.normal(
+        0.0, 0.02, points)
+    print(f"{'fit type':<14}{'updates':>9}{'stream (ms)':>13}"
+          f"{'fit_data (ms)':>15}{'max diff (mm)':>15}")
+    for fit_type in (FitType.LINEAR, FitType.QUADRATIC,
+                     FitType.CUBIC, FitType.QUARTIC):
+        fitter = TensionDeflectionFitter()
+        # Every step changes the data, so fit_data never hits its cache
+        batch_fitter = TensionDeflectionFitter()
+        data: list[tuple[float, float]] = []
+        stream_s: float = 0.0
+        batch_s: float = 0.0
+        worst: float = 0.0
+        updates: int = 0
+        for tension, deflection in zip(tensions, readings):
+            data.append((float(tension), float(deflection)))
+            # Time determined fits only
+            if len(data) <= fit_type.value:
+                continue
+            for _ in range(2):
+                start: float = time.perf_counter()
+                streamed: FitModel = fitter.fit_stream(data, fit_type)
+                stream_s += time.perf_counter() - start
+                start = time.perf_counter()
+                batch_fitter.fit_data(data, fit_type)
+                batch_s += time.perf_counter() - start
+                updates += 1
+                measured: np.ndarray = tensions[:len(data)]
+                exact: np.ndarray = np.polyfit(
+                    measured, [point[1] for point in data], fit_type.value)
+                worst = max(worst, float(np.max(np.abs(
+                    streamed.predict(measured)
+                    - np.polyval(exact, measured)))))
+                # Edit a random reading, like a corrected cell
+                index: int = int(rng.integers(len(data)))
+                data[index] = (data[index][0],
+                               data[index][1] + float(rng.normal(0.0, 0.01)))
+        print(f"{fit_type.name:<14}{updates:>9}{stream_s * 1000:>13.2f}"
+              f"{batch_s * 1000:>15.2f}{worst:>15.2e}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--stream", action="store_true",
+                        help="Compare incremental and batch polynomial fits")
+    parser.add_argument("--points", type=int, default=200)
+    args = parser.parse_args()
+
+    rng: np.random.Generator = np.random.default_rng(args.seed)
+    if args.stream:
+        benchmark_stream(args.points, rng)
+        return
+    fitter = TensionDeflectionFitter()
+    print(f"{'fit type':<14}{'table (ms)':>12}{'size':>7}{'bound (N)':>11}")
+    for fit_type in FitType:
+        fit_model: FitModel = fitter.fit_data(SAMPLE_DATA, fit_type)
+        start: float = time.perf_counter()
+        table: InverseTable | None = fit_model.get_inverse_table()
+        if table is not None:
+            print(f"{fit_type.name:<14}"
+                  f"{(time.perf_counter() - start) * 1000:>12.2f}"
+                  f"{len(table):>7}{table.error_bound:>11.2e}")
+    print()
+    print(f"{'fit type':<14}{'points':>10}{'scalar (ms)':>14}"
+          f"{'vector (ms)':>14}{'speedup':>10}{'mismatch':>10}")
+    for fit_type in FitType:
+        fit_model = fitter.fit_data(SAMPLE_DATA, fit_type)
+        fit_model.get_inverse_table()
+        for size in args.sizes:
+            scalar_ms, vector_ms, mismatches = compare(
+                fit_model, get_deflections(fit_model, size, rng))
+            estimated: str = "*" if size > SCALAR_SAMPLE else " "
+            print(f"{fit_type.name:<14}{size:>10}{scalar_ms:>13.2f}"
+                  f"{estimated}{vector_ms:>14.2f}"
+                  f"{scalar_ms / max(vector_ms, 1e-9):>9.0f}x"
+                  f"{mismatches:>10}")
+    print(f"* extrapolated from {SCALAR_SAMPLE} calls")
+
+
+if __name__ == "__main__":
+    main()
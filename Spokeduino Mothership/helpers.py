@@ -1,7 +1,12 @@
+import logging
+from collections.abc import Callable
+from concurrent.futures import Future
 from enum import Enum
 from typing import Any
 from PySide6.QtCore import Qt
 from PySide6.QtCore import QLocale
+from PySide6.QtCore import QObject
+from PySide6.QtCore import Signal
 from PySide6.QtWidgets import QMainWindow
 from PySide6.QtWidgets import QMessageBox
 from PySide6.QtWidgets import QTableWidget
@@ -24,6 +29,19 @@ class Messagebox:
                              QMessageBox.StandardButton.Discard,
                              QMessageBox.StandardButton.Discard)
 
+    def warn(self, text: str) -> None:
+        """
+        Show a warning without blocking the caller.
+        """
+        box = QMessageBox(QMessageBox.Icon.Warning,
+                          "Warning",
+                          text,
+                          QMessageBox.StandardButton.Ok,
+                          self.main_window)
+        box.setModal(False)
+        box.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
+        box.show()
+
 
 class TextChecker:
 
@@ -98,6 +116,45 @@ class Generics:
         return int(measurement_id)
 
 
+class ResultDispatcher(QObject):
+    """
+    Delivers the results of futures completed on worker threads
+    to callbacks running on the GUI thread.
+    """
+    result_ready = Signal(object, object, object)  # callbacks, future
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.result_ready.connect(self.__deliver)
+
+    def dispatch(self,
+                 future: Future,
+                 callback: Callable[[Any], None],
+                 error_callback: Callable[[Exception], None] | None = None
+                 ) -> None:
+        """
+        Call callback with the result once the future is done.
+        Failed futures are logged and the callback is skipped,
+        error_callback is called with the exception instead.
+        """
+        future.add_done_callback(
+            lambda done: self.result_ready.emit(
+                callback, error_callback, done))
+
+    def __deliver(self,
+                  callback: Callable[[Any], None],
+                  error_callback: Callable[[Exception], None] | None,
+                  future: Future) -> None:
+        try:
+            result: Any = future.result()
+        except Exception as ex:
+            logging.error(f"Background task failed: {ex}")
+            if error_callback is not None:
+                error_callback(ex)
+            return
+        callback(result)
+
+
 class SpokeduinoState(Enum):
     WAITING = 1
     MEASURING = 2
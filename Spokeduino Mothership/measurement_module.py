@@ -1,5 +1,8 @@
+import json
 import logging
 import time
+import numpy as np
+from collections.abc import Callable
 from typing import Any, cast
 from PySide6.QtCore import Qt
 from PySide6.QtCore import QModelIndex
@@ -14,13 +17,19 @@ from helpers import TextChecker
 from helpers import StateMachine
 from helpers import SpokeduinoState
 from helpers import MeasurementMode
+from helpers import ResultDispatcher
 from customtablewidget import CustomTableWidget, NumericTableWidgetItem
 from sql_queries import SQLQueries
 from unit_module import UnitEnum, UnitModule
 from database_module import DatabaseModule
+from repository_module import MeasurementRow, MeasurementSetRow
+from repository_module import RepositoryModule
 from tensiometer_module import TensiometerModule
 from visualisation_module import PyQtGraphCanvas, VisualisationModule
-from calculation_module import TensionDeflectionFitter, FitType
+from calculation_module import FitModel, FitType, TensionDeflectionFitter
+
+# Measurement sets fetched per page of the measurement list
+MEASUREMENTS_PAGE_SIZE: int = 50
 
 
 class MeasurementModule:
@@ -41,11 +50,25 @@ class MeasurementModule:
         self.__tensio: TensiometerModule = tensiometer_module
         self.__msgbox: Messagebox = messagebox
         self.__db: DatabaseModule = db
+        self.__repository: RepositoryModule = RepositoryModule(db)
         self.__fitter: TensionDeflectionFitter = fitter
         self.__canvas: PyQtGraphCanvas = canvas
         self.__chart: VisualisationModule = chart
         self.__add_row_signal_connected = False
-
+        self.__dispatcher = ResultDispatcher()
+        # Only the newest measurement request may update the table
+        self.__measurements_request: int = 0
+        self.__measurements_loaded_callback: Callable[[], None] | None = None
+        # Paging state of the measurement list
+        self.__measurements_key: tuple[int, int] = (-1, -1)
+        self.__measurements_offset: int = 0
+        self.__measurements_exhausted: bool = True
+        self.__measurements_fetching: bool = False
+        # Set loaded for editing and its packed points, the plot stores
+        # its fit in the fit cache while the table still matches them
+        self.__edited_set: tuple[int, bytes] | None = None
+        # Fit types of the edited set already sent to the fit cache
+        self.__stored_fits: set[FitType] = set()
 
     def __check_row_data(self, row: int) -> bool:
         view: CustomTableWidget = self.__ui.tableWidgetMeasurements
@@ -79,18 +102,28 @@ class MeasurementModule:
         self.__ui.pushButtonSaveMeasurement.setEnabled(enable_button)
         self.plot_measurements()
 
+    def set_measurements_loaded_callback(
+            self,
+            callback: Callable[[], None]) -> None:
+        """
+        Register a function called after the measurement list
+        has been refreshed from the database.
+        """
+        self.__measurements_loaded_callback = callback
+
     def load_measurements(
             self,
             spoke_id: int | None,
-            tensiometer_id: int | None,
-            list_only: bool) -> list[Any] | None:
+            tensiometer_id: int | None) -> None:
         """
-        Load all measurements for the selected spoke and tensiometer
+        Load the measurements for the selected spoke and tensiometer
         and populate the measurement list.
         Each row corresponds to a measurement set with:
         - The first column as a comment
         - The second as the timestamp (up to minutes)
         - Subsequent columns displaying tension:deflection pairs
+        Only the first page of sets is fetched, further pages
+        follow as the list is scrolled down.
         """
         if spoke_id is None:
             spoke_id = Generics.get_selected_row_id(
@@ -100,80 +133,114 @@ class MeasurementModule:
             tensiometer_id = self.__tensio.get_primary_tensiometer()
         view: QTableWidget = self.__ui.tableWidgetSpokeMeasurements
 
+        # Invalidate pages still in flight
+        self.__measurements_request += 1
+        self.__measurements_key = (spoke_id, tensiometer_id)
+        self.__measurements_offset = 0
+        self.__measurements_exhausted = False
+        self.__measurements_fetching = False
+        view.clearContents()
+        view.setRowCount(0)
+
         if spoke_id < 0 or tensiometer_id < 0:
-            view.clearContents()
-            view.setRowCount(0)
-            return None
-
-        # Fetch measurement sets
-        measurement_sets: list[Any] = self.__db.execute_select(
-            query=SQLQueries.GET_MEASUREMENT_SETS,
-            params=(spoke_id, tensiometer_id)
-        )
+            self.__measurements_exhausted = True
+            self.__notify_measurements_loaded()
+            return
 
-        if not measurement_sets:
-            view.clearContents()
-            view.setRowCount(0)
-            return None
-
-        # Fetch all measurements linked to the retrieved measurement sets
-        set_ids: list[Any] = [ms[0] for ms in measurement_sets]
-        query_string: str = (f"{SQLQueries.GET_MEASUREMENTS} "
-                             f"({', '.join('?' for _ in set_ids)})"
-                             "ORDER BY tension ASC")
-        measurements: list[Any] = self.__db.execute_select(
-            query=query_string,
-            params=set_ids
-        )
+        self.__fetch_measurements_page()
 
-        if not measurements:
-            view.clearContents()
-            view.setRowCount(0)
-            return None
+    def fetch_more_measurements(self) -> None:
+        """
+        Fetch the next page of measurement sets once the
+        measurement list is scrolled close to its end.
+        """
+        if self.__measurements_exhausted or self.__measurements_fetching:
+            return
 
-        if list_only:
-            return measurements
+        scroll_bar = self.__ui.tableWidgetSpokeMeasurements.verticalScrollBar()
+        if scroll_bar.value() < scroll_bar.maximum() - scroll_bar.pageStep():
+            return
 
-        # Prepare rows for the table
-        unit: UnitEnum = self.__unit.get_unit()
+        self.__fetch_measurements_page()
 
-        # Prepare set information and initialize the data structure
-        set_info: dict[Any, Any] = {ms[0]: ms[1:] for ms in measurement_sets}
-        data: list[tuple[Any, list[str]]] = []
+    def __fetch_measurements_page(self) -> None:
+        """
+        Fetch the next page of grouped measurement sets on the worker.
+        """
+        self.__measurements_fetching = True
+        request: int = self.__measurements_request
+        spoke_id, tensiometer_id = self.__measurements_key
+        self.__dispatcher.dispatch(
+            self.__db.submit(
+                self.__repository.get_measurement_sets,
+                spoke_id, tensiometer_id,
+                MEASUREMENTS_PAGE_SIZE, self.__measurements_offset),
+            lambda measurement_sets: self.__show_measurements(
+                request, measurement_sets),
+            lambda _: self.__on_measurements_page_failed(request))
+
+    def __on_measurements_page_failed(self, request: int) -> None:
+        """
+        Allow the failed page to be fetched again on the next scroll.
+        """
+        if request == self.__measurements_request:
+            self.__measurements_fetching = False
 
-        # Organize measurements by set and sort by tension
-        grouped_measurements: dict = {}
-        for set_id, tension, deflection in measurements:
-            if set_id not in grouped_measurements:
-                grouped_measurements[set_id] = []
-            # Convert the tension to the selected unit
-            converted_tensions: tuple[float, float, float] = \
-                self.__unit.convert_units(
-                    value=tension, source=UnitEnum.NEWTON)
-            tension_converted: str = {
-                UnitEnum.NEWTON: f"{converted_tensions[0]:.0f} N",
-                UnitEnum.KGF: TextChecker.check_text(
-                    f"{converted_tensions[1]:.1f}", True) + " kgF",
-                UnitEnum.LBF: TextChecker.check_text(
-                    f"{converted_tensions[2]:.1f}", True) + " lbF"
-            }[unit]
-            # Add the tension-deflection pair to the set's measurements
-            grouped_measurements[set_id].append((
-                tension, f"{tension_converted}: {deflection:.2f} mm"))
-
-        # Build rows for each set, with measurements sorted by tension
-        for set_id, measurements_list in grouped_measurements.items():
-            comment, ts = set_info[set_id]
-            timestamp = ts.rsplit(":", 1)[0]  # Truncate to minutes
-            row_data = [comment, timestamp] + [m[1] for m in measurements_list]
-            data.append((set_id, row_data))
-
-        # Update the table
-        view.clearContents()
-        view.setRowCount(len(data))
-        view.setColumnCount(max(len(row[1]) for row in data))
+    def __format_measurement(self,
+                             unit: UnitEnum,
+                             tension: float,
+                             deflection: float) -> str:
+        """
+        Format a tension:deflection pair in the selected unit.
+        """
+        converted_tensions: tuple[float, float, float] = \
+            self.__unit.convert_units(value=tension, source=UnitEnum.NEWTON)
+        tension_converted: str = {
+            UnitEnum.NEWTON: f"{converted_tensions[0]:.0f} N",
+            UnitEnum.KGF: TextChecker.check_text(
+                f"{converted_tensions[1]:.1f}", True) + " kgF",
+            UnitEnum.LBF: TextChecker.check_text(
+                f"{converted_tensions[2]:.1f}", True) + " lbF"
+        }[unit]
+        return f"{tension_converted}: {deflection:.2f} mm"
+
+    def __show_measurements(
+            self,
+            request: int,
+            measurement_sets: list[MeasurementSetRow]) -> None:
+        """
+        Append a page of grouped measurement sets to the measurement list.
+        Results of outdated requests are discarded.
+        """
+        if request != self.__measurements_request:
+            return
+
+        self.__measurements_fetching = False
+        self.__measurements_offset += len(measurement_sets)
+        if len(measurement_sets) < MEASUREMENTS_PAGE_SIZE:
+            self.__measurements_exhausted = True
+
+        view: QTableWidget = self.__ui.tableWidgetSpokeMeasurements
+        unit: UnitEnum = self.__unit.get_unit()
 
-        for row_idx, (row_id, row_data) in enumerate(data):
+        # Build a row for each set, points are already sorted by tension
+        data: list[tuple[Any, list[str]]] = []
+        for measurement_set in measurement_sets:
+            row_data: list[str] = [
+                measurement_set.comment, measurement_set.ts] + [
+                self.__format_measurement(unit, tension, deflection)
+                for tension, deflection
+                in json.loads(measurement_set.measurements)]
+            data.append((measurement_set.id, row_data))
+
+        # Append the page to the table
+        first_row: int = view.rowCount()
+        view.setRowCount(first_row + len(data))
+        if data:
+            view.setColumnCount(max(
+                view.columnCount(), *(len(row[1]) for row in data)))
+
+        for row_idx, (row_id, row_data) in enumerate(data, first_row):
             for col_idx, cell_data in enumerate(row_data):
                 item = NumericTableWidgetItem(cell_data)
                 item.setFlags(item.flags() & ~Qt.ItemFlag.ItemIsEditable)
@@ -188,7 +255,15 @@ class MeasurementModule:
         # Hide headers
         view.verticalHeader().setVisible(False)
         view.horizontalHeader().setVisible(False)
-        return None
+        self.__notify_measurements_loaded()
+
+        # Keep fetching while the list does not fill the view yet
+        if view.verticalScrollBar().maximum() == 0:
+            self.fetch_more_measurements()
+
+    def __notify_measurements_loaded(self) -> None:
+        if self.__measurements_loaded_callback is not None:
+            self.__measurements_loaded_callback()
 
     def delete_measurement(self) -> None:
         """
@@ -200,21 +275,21 @@ class MeasurementModule:
         measurement_id: int = Generics.get_selected_row_id(view)
         if (measurement_id < 0):
             return
-        # Execute the deletion query
-        try:
-            if self.__db.execute_query(
+        # Execute the deletion query on the database worker
+        self.__dispatcher.dispatch(
+            self.__db.execute_query_async(
                 query=SQLQueries.DELETE_MEASUREMENT_SET,
-                params=(measurement_id,)
-            ) is None:
-                self.__msgbox.err("Failed to delete measurement")
-                return
-        except Exception as e:
-            self.__msgbox.err(f"Failed to delete measurement: {str(e)}")
+                params=(measurement_id,)),
+            self.__on_measurement_deleted)
+
+    def __on_measurement_deleted(self, result: int | None) -> None:
+        if result is None:
+            self.__msgbox.err("Failed to delete measurement")
             return
 
         # Clear selection, update the table, and inform the user
-        view.clearSelection()
-        self.load_measurements(None, None, False)
+        self.__ui.tableWidgetSpokeMeasurements.clearSelection()
+        self.load_measurements(None, None)
         self.__msgbox.info("Measurement deleted.")
 
     def select_measurement_row(self, index: QModelIndex) -> None:
@@ -346,26 +421,21 @@ class MeasurementModule:
                 view.setItem(0, column, item)
                 view.setVerticalHeaderLabels("+")
         else:
-            # Load measurements as a list
+            # Load the measurements of the selected set
             view.setVerticalHeaderLabels("+")
-            measurements = self.load_measurements(
-                spoke_id=None,
-                tensiometer_id=None,
-                list_only=True)
             measurement_id: int = Generics.get_selected_row_id(
                 self.__ui.tableWidgetSpokeMeasurements)
-            if measurement_id < 0 or not measurements:
+            if measurement_id < 0:
                 return
 
-            # Filter measurements for the selected ID
-            filtered_measurements = [
-                (mid, tension, deflection)
-                for mid, tension, deflection in measurements
-                if mid == measurement_id
-            ]
-
+            filtered_measurements: list[MeasurementRow] = \
+                self.__repository.get_measurements(measurement_id)
             if not filtered_measurements:
                 return
+            self.__edited_set = (
+                measurement_id,
+                DatabaseModule.pack_points(filtered_measurements))
+            self.__stored_fits = set()
 
             # Prepare table headers
             view.setRowCount(len(filtered_measurements))
@@ -384,7 +454,7 @@ class MeasurementModule:
             self.__ui.tableWidgetMeasurements.currentCellChanged.disconnect(
                 self.update_measurement_button_states)
 
-            for row, (_, tension, deflection) in enumerate(
+            for row, (tension, deflection) in enumerate(
                  filtered_measurements):
                 # Convert tension to the selected unit
                 converted_tension: float = self.__unit.convert_units(
@@ -540,22 +610,18 @@ class MeasurementModule:
         # Get the comment
         comment: str = self.__ui.lineEditMeasurementComment.text().strip()
 
-        # Check the mode and handle accordingly
+        # Check the mode and handle accordingly,
+        # the user is notified once the database worker is done
         match self.__state_machine.get_mode():
             case MeasurementMode.DEFAULT:
                 # Save default mode measurements
-                res: bool = self.__save_default_mode_measurements(
+                self.__save_default_mode_measurements(
                     view, spoke_id, comment)
             case MeasurementMode.EDIT | MeasurementMode.CUSTOM:
                 # Save edit or custom mode measurements
-                res = self.__save_custom_mode_measurements(
+                self.__save_custom_mode_measurements(
                     view, spoke_id, comment)
 
-        # Notify the user
-        if res:
-            self.__msgbox.info("Measurements saved successfully")
-            self.load_measurements(None, None, False)
-
     def __save_default_mode_measurements(
             self,
             view: CustomTableWidget,
@@ -660,65 +726,109 @@ class MeasurementModule:
         if not data:
             return False
 
-        # Handle EDIT mode: Delete the existing measurement set
+        # Handle EDIT mode: Replace the existing measurement set
+        replace_set_id: int | None = None
         if self.__state_machine.get_mode() == MeasurementMode.EDIT:
             # Get the current measurement set ID
-            measurement_id: int = Generics.get_selected_row_id(
+            replace_set_id = Generics.get_selected_row_id(
                 self.__ui.tableWidgetSpokeMeasurements)
-            if measurement_id < 0:
+            if replace_set_id < 0:
                 self.__msgbox.err("No measurement set selected to overwrite")
                 return False
 
-            # Delete the existing measurement set
-            try:
-                if self.__db.execute_query(
-                    query=SQLQueries.DELETE_MEASUREMENT_SET,
-                    params=(measurement_id,)
-                ) is None:
-                    self.__msgbox.err(
-                        "Failed to delete previous measurement set:")
-                    return False
-            except Exception as ex:
-                self.__msgbox.err(
-                    f"Failed to delete previous measurement set: {str(ex)}")
-                return False
-
         # Save the new data
         return self.__save_measurement_set(
-            spoke_id, tensiometer_id, data, comment)
+            spoke_id, tensiometer_id, data, comment, replace_set_id)
 
     def __save_measurement_set(
             self,
             spoke_id: int,
             tensiometer_id: int,
             data: list[tuple[float, float]],
-            comment: str) -> bool:
+            comment: str,
+            replace_set_id: int | None = None) -> bool:
         """
-        Save a single measurement set and its associated measurements.
+        Queue a measurement set and its associated measurements
+        for saving on the database worker.
+        :return: True if the save has been started.
         """
-        # Save the measurement set
-        set_id: int | None = self.__db.execute_query(
-            query=SQLQueries.ADD_MEASUREMENT_SET,
-            params=(spoke_id, tensiometer_id, comment)
-        )
-        if set_id is None:
-            self.__msgbox.err("Failed to save measurement set")
-            return False
+        self.__dispatcher.dispatch(
+            self.__db.submit(
+                self.__write_measurement_set,
+                spoke_id, tensiometer_id, data, comment, replace_set_id),
+            self.__on_measurement_set_saved)
+        return True
 
-        # Save each measurement
-        for tension, deflection in data:
-            try:
-                if self.__db.execute_query(
+    def __write_measurement_set(
+            self,
+            spoke_id: int,
+            tensiometer_id: int,
+            data: list[tuple[float, float]],
+            comment: str,
+            replace_set_id: int | None) -> str | None:
+        """
+        Save a single measurement set and its associated measurements
+        atomically in one transaction. Runs on the database worker.
+        If replace_set_id is given, that set is deleted in the same
+        transaction so a failed save leaves it untouched.
+        :return: Error message, or None on success.
+        """
+        try:
+            with self.__db.transaction():
+                # Delete the measurement set being edited,
+                # the new set takes over its UUID
+                set_uuid: str | None = None
+                if replace_set_id is not None:
+                    rows: list[Any] = self.__db.execute_select(
+                        query=SQLQueries.GET_MEASUREMENT_SET_UUID,
+                        params=(replace_set_id,))
+                    if rows:
+                        set_uuid = rows[0][0]
+                    if self.__db.execute_query(
+                        query=SQLQueries.DELETE_MEASUREMENT_SET,
+                        params=(replace_set_id,)
+                    ) is None:
+                        raise RuntimeError(
+                            "Failed to delete previous measurement set")
+
+                # Save the measurement set
+                set_id: int | None = self.__db.execute_query(
+                    query=SQLQueries.ADD_MEASUREMENT_SET,
+                    params=(spoke_id, tensiometer_id, comment)
+                )
+                if set_id is None:
+                    raise RuntimeError("Failed to save measurement set")
+                if set_uuid is not None and self.__db.execute_query(
+                    query=SQLQueries.SET_MEASUREMENT_SET_UUID,
+                    params=(set_uuid, set_id)
+                ) is None:
+                    raise RuntimeError("Failed to save measurement set")
+
+                # Save all measurements at once
+                if self.__db.execute_many(
                     query=SQLQueries.ADD_MEASUREMENT,
-                    params=(set_id, tension, deflection)
+                    params_seq=[(set_id, tension, deflection)
+                                for tension, deflection in data]
                 ) is None:
-                    self.__msgbox.err("Failed to save measurement")
-                    return False
+                    raise RuntimeError("Failed to save measurement")
 
-            except Exception as ex:
-                self.__msgbox.err(f"Failed to save measurement: {str(ex)}")
-                return False
-        return True
+                # Store the packed copy right away
+                if self.__db.execute_query(
+                    query=SQLQueries.SET_MEASUREMENT_POINTS,
+                    params=(DatabaseModule.pack_points(
+                        sorted(data, key=lambda point: point[0])), set_id)
+                ) is None:
+                    raise RuntimeError("Failed to save measurement")
+        except Exception as ex:
+            return str(ex)
+        return None
+
+    def __on_measurement_set_saved(self, error: str | None) -> None:
+        if error is not None:
+            self.__msgbox.err(error)
+            return
+        self.__msgbox.info("Measurements saved successfully")
+        self.load_measurements(None, None)
 
     def plot_measurements(self) -> None:
         """
@@ -760,7 +870,16 @@ class MeasurementModule:
 
         data.sort(key=lambda pair: pair[0])
         fit_type, header = self.get_fit()
-        fit_model = self.__fitter.fit_data(data, fit_type)
+        fit_model: FitModel = self.__fitter.fit_stream(data, fit_type)
+        if (self.__state_machine.get_mode() == MeasurementMode.EDIT and
+                self.__edited_set is not None and
+                fit_type not in self.__stored_fits and
+                DatabaseModule.pack_points(data) == self.__edited_set[1]):
+            set_id, packed = self.__edited_set
+            self.__stored_fits.add(fit_type)
+            self.__db.submit(
+                self.__store_fit,
+                set_id, packed, fit_type, fit_model.to_json())
 
         self.__chart.update_fit_plot(
             plot_widget=self.__canvas.plot_widget,
@@ -771,6 +890,78 @@ class MeasurementModule:
             header=f"{header} fit"
         )
 
+    def __store_fit(self,
+                    set_id: int,
+                    packed: bytes,
+                    fit_type: FitType,
+                    params: str) -> None:
+        """
+        Write a model fitted to the points of a stored measurement set
+        into the fit cache, unless the set has been changed since.
+        Runs on the database worker.
+        """
+        if self.__db.get_measurement_points(set_id) != packed:
+            return
+        self.__db.execute_query(
+            query=SQLQueries.SET_FIT_CACHE,
+            params=(fit_type.value, TensionDeflectionFitter.FITTER_VERSION,
+                    params, set_id, packed))
+
+    def fit_measurement_set(
+            self,
+            set_id: int,
+            fit_type: FitType,
+            callback: Callable[[FitModel | None], None]) -> None:
+        """
+        Pass the fitted model of a stored measurement set to callback
+        on the GUI thread. Models are read from the fit cache on the
+        database worker if present, otherwise the set is fitted and the
+        model cached. The cache is only written while the set still
+        holds the fitted points.
+        :param set_id: The measurement set ID.
+        :param fit_type: The model to fit.
+        :param callback: Called with the fitted model, or None if the
+                         set has no points.
+        """
+        self.__dispatcher.dispatch(
+            self.__db.submit(self.__load_fit, set_id, fit_type),
+            lambda loaded: self.__on_fit_loaded(
+                set_id, fit_type, callback, loaded))
+
+    def __load_fit(self, set_id: int, fit_type: FitType) -> FitModel | bytes:
+        """
+        Return the cached model of a measurement set, or its packed
+        points if there is none. Runs on the database worker.
+        """
+        rows: list[Any] = self.__db.execute_select(
+            query=SQLQueries.GET_FIT_CACHE,
+            params=(set_id, fit_type.value,
+                    TensionDeflectionFitter.FITTER_VERSION))
+        if rows:
+            try:
+                return FitModel.from_json(rows[0][0])
+            except (ValueError, KeyError, TypeError) as ex:
+                logging.error(f"Invalid cached fit of set {set_id}: {ex}")
+        return self.__db.get_measurement_points(set_id)
+
+    def __on_fit_loaded(self,
+                        set_id: int,
+                        fit_type: FitType,
+                        callback: Callable[[FitModel | None], None],
+                        loaded: FitModel | bytes) -> None:
+        if isinstance(loaded, FitModel):
+            callback(loaded)
+            return
+        if not loaded:
+            callback(None)
+            return
+        points: np.ndarray = np.frombuffer(
+            loaded, dtype=DatabaseModule.POINTS_DTYPE).reshape(-1, 2)
+        fit_model: FitModel = self.__fitter.fit_data(points, fit_type)
+        self.__db.submit(
+            self.__store_fit, set_id, loaded, fit_type, fit_model.to_json())
+        callback(fit_model)
+
     def get_fit(self) -> tuple[FitType, str]:
         if self.__ui.radioButtonFitQuadratic.isChecked():
             return FitType.QUADRATIC, "Quadratic"
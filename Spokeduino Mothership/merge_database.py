@@ -0,0 +1,47 @@
+"""
+Merge the measurement history of other benches into a database.
+
+Pulls the spokes and measurement sets changed in every source since
+its last merge into the target, see MergeModule. Sources are only read.
+
+Usage:
+    python merge_database.py TARGET SOURCE [SOURCE ...]
+"""
+import argparse
+import os
+import sys
+from database_module import DatabaseModule
+from merge_module import MergeModule
+
+SQL_PATH: str = os.path.join(
+    os.path.dirname(os.path.realpath(__file__)), "sql")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("target")
+    parser.add_argument("sources", nargs="+")
+    args = parser.parse_args()
+
+    if not os.path.isfile(args.target):
+        sys.exit(f"{args.target} does not exist")
+    db = DatabaseModule(args.target)
+    try:
+        # Brings the target up to the change tracking schema
+        db.initialize_database(
+            os.path.join(SQL_PATH, "init_schema.sql"),
+            os.path.join(SQL_PATH, "standard_data.sql"))
+        merger = MergeModule(db)
+        for source in args.sources:
+            counts: dict[str, int] = merger.merge(source)
+            print(f"{source}: " + ", ".join(
+                f"{key.replace('_', ' ')} {value}"
+                for key, value in counts.items()))
+    except (FileNotFoundError, ValueError) as e:
+        sys.exit(str(e))
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
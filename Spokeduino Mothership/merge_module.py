@@ -0,0 +1,331 @@
+import logging
+import os
+import sqlite3
+from typing import Any
+from database_module import DatabaseModule
+
+
+class MergeModule:
+    """
+    Incremental merge of the spokes and measurement sets of another
+    bench's database into this one.
+
+    Every database records the change_seq it last pulled from each
+    source in merge_sources. A merge only reads the spokes and sets
+    changed after that, through the change_seq indexes, so it takes time
+    proportional to the changes instead of the size of the source.
+    Ids differ between databases and are never copied: sets are matched
+    by their UUID, spokes by manufacturer, name and dimensions and
+    tensiometers by name, missing ones are inserted with new ids.
+    A set changed in both databases takes the source version.
+    Sets whose contents already match are left alone, so merging back
+    and forth settles instead of rewriting the same sets every time.
+    Deletions are not merged.
+    Runs on the calling thread, submit it to the database worker
+    when called from the GUI.
+    """
+    # Schema name the source database is attached as
+    SOURCE: str = "merge_source"
+    # First schema version with change tracking
+    MIN_SCHEMA_VERSION: int = 7
+    # Local tables a merge writes through the raw connection
+    MERGED_TABLES: tuple[str, ...] = (
+        "spoke_manufacturers", "spoke_types", "spoke_models",
+        "tensiometers", "spoke_measurement_sets", "spoke_measurements",
+        "merge_sources")
+
+    # Spokes changed since the last merge and spokes of changed sets,
+    # the latter only have to exist
+    STAGE_SPOKES: str = f"""
+                INSERT INTO temp.merge_spokes
+                SELECT
+                    s.id, s.change_seq > :since, m.name, t.type,
+                    s.gauge, s.weight, s.name, s.dimensions, s.comment
+                FROM
+                    {SOURCE}.spoke_models s
+                JOIN {SOURCE}.spoke_manufacturers m
+                ON m.id = s.manufacturer_id
+                JOIN {SOURCE}.spoke_types t ON t.id = s.type_id
+                WHERE
+                    s.id IN (
+                        SELECT id FROM {SOURCE}.spoke_models
+                        WHERE change_seq > :since
+                        UNION
+                        SELECT spoke_id FROM {SOURCE}.spoke_measurement_sets
+                        WHERE change_seq > :since)"""
+    # Staged spokes with the names resolved to local ids
+    RESOLVED_SPOKES: str = """
+                SELECT
+                    d.source_id, d.changed, m.id AS manufacturer_id,
+                    t.id AS type_id, d.gauge, d.weight, d.name,
+                    d.dimensions, d.comment
+                FROM
+                    temp.merge_spokes d
+                JOIN spoke_manufacturers m ON m.name = d.manufacturer
+                JOIN spoke_types t ON t.type = d.type"""
+    UPDATE_SPOKES: str = f"""
+                UPDATE spoke_models AS l
+                SET
+                    type_id = r.type_id, gauge = r.gauge,
+                    weight = r.weight, comment = r.comment
+                FROM
+                    ({RESOLVED_SPOKES}) AS r
+                WHERE
+                    r.changed
+                AND
+                    l.manufacturer_id = r.manufacturer_id AND
+                    l.name = r.name AND l.dimensions = r.dimensions
+                AND (
+                    l.type_id IS NOT r.type_id OR l.gauge IS NOT r.gauge OR
+                    l.weight IS NOT r.weight OR l.comment IS NOT r.comment)"""
+    INSERT_SPOKES: str = f"""
+                INSERT INTO spoke_models (
+                    manufacturer_id, type_id, gauge, weight,
+                    name, dimensions, comment)
+                SELECT
+                    r.manufacturer_id, r.type_id, r.gauge, r.weight,
+                    r.name, r.dimensions, r.comment
+                FROM
+                    ({RESOLVED_SPOKES}) AS r
+                WHERE
+                    NOT EXISTS (
+                        SELECT 1 FROM spoke_models l
+                        WHERE l.manufacturer_id = r.manufacturer_id
+                        AND l.name = r.name
+                        AND l.dimensions = r.dimensions)"""
+    # Sets changed since the last merge, with their spoke and tensiometer
+    # by name and their points as JSON for comparing contents
+    STAGE_SETS: str = f"""
+                INSERT INTO temp.merge_sets (
+                    source_id, uuid, comment, ts, points, measurements,
+                    manufacturer, spoke, dimensions, tensiometer)
+                SELECT
+                    s.id, s.uuid, s.comment, s.ts, s.points,
+                    (SELECT
+                        json_group_array(json_array(tension, deflection))
+                    FROM
+                        (SELECT tension, deflection
+                        FROM {SOURCE}.spoke_measurements
+                        WHERE set_id = s.id
+                        ORDER BY tension, deflection)),
+                    m.name, sp.name, sp.dimensions, t.name
+                FROM
+                    {SOURCE}.spoke_measurement_sets s
+                JOIN {SOURCE}.spoke_models sp ON sp.id = s.spoke_id
+                JOIN {SOURCE}.spoke_manufacturers m
+                ON m.id = sp.manufacturer_id
+                JOIN {SOURCE}.tensiometers t ON t.id = s.tensiometer_id
+                WHERE
+                    s.change_seq > :since"""
+    RESOLVE_SETS: str = """
+                UPDATE temp.merge_sets
+                SET
+                    spoke_id = (
+                        SELECT l.id FROM spoke_models l
+                        JOIN spoke_manufacturers m
+                        ON m.id = l.manufacturer_id
+                        WHERE m.name = merge_sets.manufacturer
+                        AND l.name = merge_sets.spoke
+                        AND l.dimensions = merge_sets.dimensions
+                        ORDER BY l.id LIMIT 1),
+                    tensiometer_id = (
+                        SELECT id FROM tensiometers
+                        WHERE name = merge_sets.tensiometer),
+                    local_id = (
+                        SELECT id FROM spoke_measurement_sets
+                        WHERE uuid = merge_sets.uuid)"""
+    # Sets whose local copy already has the same contents
+    DROP_UNCHANGED_SETS: str = """
+                DELETE FROM temp.merge_sets AS d
+                WHERE EXISTS (
+                    SELECT 1 FROM spoke_measurement_sets l
+                    WHERE l.id = d.local_id
+                    AND l.spoke_id = d.spoke_id
+                    AND l.tensiometer_id = d.tensiometer_id
+                    AND l.comment IS d.comment
+                    AND l.ts IS d.ts
+                    AND d.measurements = (
+                        SELECT
+                            json_group_array(json_array(tension, deflection))
+                        FROM
+                            (SELECT tension, deflection
+                            FROM spoke_measurements
+                            WHERE set_id = l.id
+                            ORDER BY tension, deflection)))"""
+    UPDATE_SETS: str = """
+                UPDATE spoke_measurement_sets AS l
+                SET
+                    spoke_id = d.spoke_id, tensiometer_id = d.tensiometer_id,
+                    comment = d.comment, ts = d.ts
+                FROM
+                    temp.merge_sets d
+                WHERE
+                    l.id = d.local_id"""
+    DELETE_UPDATED_MEASUREMENTS: str = """
+                DELETE FROM spoke_measurements
+                WHERE set_id IN (
+                    SELECT local_id FROM temp.merge_sets
+                    WHERE local_id IS NOT NULL)"""
+    INSERT_SETS: str = """
+                INSERT INTO spoke_measurement_sets (
+                    spoke_id, tensiometer_id, comment, ts, uuid)
+                SELECT
+                    spoke_id, tensiometer_id, comment, ts, uuid
+                FROM
+                    temp.merge_sets
+                WHERE
+                    local_id IS NULL"""
+    RESOLVE_INSERTED_SETS: str = """
+                UPDATE temp.merge_sets
+                SET
+                    local_id = (
+                        SELECT id FROM spoke_measurement_sets
+                        WHERE uuid = merge_sets.uuid)
+                WHERE
+                    local_id IS NULL"""
+    INSERT_MEASUREMENTS: str = f"""
+                INSERT INTO spoke_measurements (set_id, tension, deflection)
+                SELECT
+                    d.local_id, m.tension, m.deflection
+                FROM
+                    temp.merge_sets d
+                JOIN {SOURCE}.spoke_measurements m ON m.set_id = d.source_id"""
+    # Packed points are rebuilt from the rows if the source has none
+    COPY_POINTS: str = """
+                UPDATE spoke_measurement_sets AS l
+                SET
+                    points = d.points
+                FROM
+                    temp.merge_sets d
+                WHERE
+                    l.id = d.local_id AND d.points IS NOT NULL"""
+    UPSERT_MERGE_SOURCE: str = """
+                INSERT INTO
+                    merge_sources (source_uuid, last_seq)
+                VALUES
+                    (?, ?)
+                ON CONFLICT(source_uuid) DO UPDATE SET
+                    last_seq = excluded.last_seq, ts = CURRENT_TIMESTAMP"""
+
+    def __init__(self, db: DatabaseModule) -> None:
+        self.__db: DatabaseModule = db
+
+    def merge(self, source_file: str) -> dict[str, int]:
+        """
+        Pull the spokes and measurement sets changed in another
+        database since the last merge from it, in a single transaction.
+        The source database is only read.
+        :param source_file: Path of the other database.
+        :return: Counts of inserted and updated spokes, inserted,
+                 updated and skipped sets and inserted measurements.
+        :raises FileNotFoundError: If the source does not exist.
+        :raises ValueError: If the source is this database or has
+                            no change tracking yet.
+        """
+        if not os.path.isfile(source_file):
+            raise FileNotFoundError(f"{source_file} does not exist")
+        database_uuid: str = self.__db.get_database_uuid()
+        connection: sqlite3.Connection = self.__db.get_connection()
+        connection.execute(f"ATTACH DATABASE ? AS {self.SOURCE};",
+                           (source_file,))
+        try:
+            version: int = connection.execute(
+                f"PRAGMA {self.SOURCE}.user_version;").fetchone()[0]
+            if version < self.MIN_SCHEMA_VERSION:
+                raise ValueError(
+                    f"{source_file} has schema version {version}, "
+                    "open it once to update it before merging")
+            with self.__db.transaction():
+                self.__db.mark_written(*self.MERGED_TABLES)
+                counts: dict[str, int] = self.__merge(
+                    connection, database_uuid)
+        finally:
+            connection.execute("DROP TABLE IF EXISTS temp.merge_spokes;")
+            connection.execute("DROP TABLE IF EXISTS temp.merge_sets;")
+            connection.execute(f"DETACH DATABASE {self.SOURCE};")
+        if any(counts[key] for key in counts if key != "sets_unchanged"):
+            self.__db.db_changed = True
+        logging.info(f"Merged {source_file}: {counts}")
+        return counts
+
+    def __merge(self,
+                connection: sqlite3.Connection,
+                database_uuid: str) -> dict[str, int]:
+        """
+        Merge the attached source, runs within the merge transaction.
+        """
+        row: Any = connection.execute(
+            f"SELECT value FROM {self.SOURCE}.settings WHERE key = ?;",
+            (DatabaseModule.DATABASE_UUID_SETTING,)).fetchone()
+        # Without a UUID the source cannot be told apart from others,
+        # it is merged in full every time
+        source_uuid: str | None = row[0] if row else None
+        if source_uuid == database_uuid:
+            raise ValueError("Cannot merge a database into itself")
+        since: int = 0
+        if source_uuid is not None:
+            row = connection.execute(
+                "SELECT last_seq FROM merge_sources WHERE source_uuid = ?;",
+                (source_uuid,)).fetchone()
+            since = row[0] if row else 0
+        last_seq: int = connection.execute(
+            f"SELECT seq FROM {self.SOURCE}.change_sequence;").fetchone()[0]
+        counts: dict[str, int] = {}
+
+        # Spokes, with manufacturers and types missing here
+        connection.execute(
+            "CREATE TEMP TABLE merge_spokes (source_id INTEGER PRIMARY KEY, "
+            "changed, manufacturer, type, gauge, weight, name, dimensions, "
+            "comment);")
+        connection.execute(self.STAGE_SPOKES, {"since": since})
+        connection.execute(
+            "INSERT OR IGNORE INTO spoke_manufacturers (name) "
+            "SELECT DISTINCT manufacturer FROM temp.merge_spokes;")
+        connection.execute(
+            "INSERT OR IGNORE INTO spoke_types (type) "
+            "SELECT DISTINCT type FROM temp.merge_spokes;")
+        # The latest of several source spokes with the same key wins
+        connection.execute(
+            "CREATE INDEX temp.merge_spokes_key "
+            "ON merge_spokes (manufacturer, name, dimensions);")
+        connection.execute(
+            "DELETE FROM temp.merge_spokes AS d WHERE EXISTS ("
+            "SELECT 1 FROM temp.merge_spokes later "
+            "WHERE later.manufacturer = d.manufacturer "
+            "AND later.name = d.name AND later.dimensions = d.dimensions "
+            "AND later.source_id > d.source_id);")
+        counts["spokes_updated"] = connection.execute(
+            self.UPDATE_SPOKES).rowcount
+        counts["spokes_inserted"] = connection.execute(
+            self.INSERT_SPOKES).rowcount
+
+        # Measurement sets, with tensiometers missing here
+        connection.execute(
+            "CREATE TEMP TABLE merge_sets (source_id INTEGER PRIMARY KEY, "
+            "uuid, comment, ts, points, measurements, manufacturer, spoke, "
+            "dimensions, tensiometer, spoke_id, tensiometer_id, local_id);")
+        staged: int = connection.execute(
+            self.STAGE_SETS, {"since": since}).rowcount
+        connection.execute(
+            "INSERT OR IGNORE INTO tensiometers (name) "
+            "SELECT DISTINCT tensiometer FROM temp.merge_sets;")
+        connection.execute(self.RESOLVE_SETS)
+        counts["sets_unchanged"] = connection.execute(
+            self.DROP_UNCHANGED_SETS).rowcount
+        counts["sets_updated"] = connection.execute(
+            self.UPDATE_SETS).rowcount
+        connection.execute(self.DELETE_UPDATED_MEASUREMENTS)
+        counts["sets_inserted"] = connection.execute(
+            self.INSERT_SETS).rowcount
+        connection.execute(self.RESOLVE_INSERTED_SETS)
+        counts["measurements_inserted"] = connection.execute(
+            self.INSERT_MEASUREMENTS).rowcount
+        connection.execute(self.COPY_POINTS)
+        if staged != sum(counts[key] for key in (
+                "sets_unchanged", "sets_updated", "sets_inserted")):
+            raise RuntimeError("Measurement sets of the source went missing")
+
+        if source_uuid is not None:
+            connection.execute(
+                self.UPSERT_MERGE_SOURCE, (source_uuid, last_seq))
+        return counts
@@ -3,6 +3,7 @@ import sys
 import threading
 from typing import cast, override
 from PySide6.QtCore import QTimer
+from PySide6.QtCore import Signal
 from PySide6.QtWidgets import QApplication, QStatusBar
 from PySide6.QtWidgets import QLayout
 from PySide6.QtWidgets import QGroupBox
@@ -26,6 +27,9 @@ from helpers import MeasurementMode
 from calculation_module import TensionDeflectionFitter
 from visualisation_module import PyQtGraphCanvas, VisualisationModule
 
+# Interval of the database maintenance, runs only after changes
+MAINTENANCE_INTERVAL_MS: int = 10 * 60 * 1000
+
 
 class Spokeduino(QMainWindow):
     """
@@ -35,6 +39,9 @@ class Spokeduino(QMainWindow):
     and interacts with the SQLite database to populate and
     manage data displayed in the application.
     """
+    # Emitted from the background thread with the integrity problems
+    integrity_checked = Signal(list)
+
     def __init__(self) -> None:
         """
         Initialize the main application window.
@@ -51,9 +58,6 @@ class Spokeduino(QMainWindow):
         self.db = DatabaseModule(self.db_path)
         self.db.initialize_database(schema_file, data_file)
 
-        # For vacuuming on exit
-        self.db_changed: bool = False
-
         self.serial_port = None
         self.waiting_event = threading.Event()
         self.fitter = TensionDeflectionFitter()
@@ -214,6 +218,18 @@ class Spokeduino(QMainWindow):
             self.state_machine.set_mode(MeasurementMode.CUSTOM)
         self.ui.tensioningTab.setEnabled(False)
 
+        # Run the full integrity check once the window is up
+        self.integrity_checked.connect(self.show_integrity_errors)
+        QTimer.singleShot(
+            2000,
+            lambda: self.db.check_integrity_in_background(
+                self.integrity_checked.emit))
+
+        # Periodic database maintenance on the database worker
+        self.maintenance_timer = QTimer(self)
+        self.maintenance_timer.timeout.connect(self.schedule_maintenance)
+        self.maintenance_timer.start(MAINTENANCE_INTERVAL_MS)
+
     def setup_signals_and_slots(self) -> None:
         """
         Connect UI elements to their respective event handlers for both tabs.
@@ -283,8 +299,7 @@ class Spokeduino(QMainWindow):
         self.ui.comboBoxTensiometer.currentIndexChanged.connect(
             self.tensiometer_module.save_tensiometer)
         self.ui.comboBoxTensiometer.currentIndexChanged.connect(
-           lambda: self.measurement_module.load_measurements(
-               None, None, False))
+           lambda: self.measurement_module.load_measurements(None, None))
         self.ui.comboBoxTensiometer.currentIndexChanged.connect(
             self.update_statusbar_tensiometer)
 
@@ -293,6 +308,9 @@ class Spokeduino(QMainWindow):
             self.measurement_module.select_measurement_row)
         self.ui.tableWidgetSpokeMeasurements.clicked.connect(
             self.spoke_module.toggle_spoke_related_buttons)
+        self.ui.tableWidgetSpokeMeasurements.verticalScrollBar(
+            ).valueChanged.connect(
+                lambda _: self.measurement_module.fetch_more_measurements())
         self.ui.pushButtonDeleteMeasurement.clicked.connect(
             self.measurement_module.delete_measurement)
         if self.ui.radioButtonMeasurementCustom.isChecked():
@@ -463,15 +481,25 @@ class Spokeduino(QMainWindow):
         super().resizeEvent(event)
         self.spoke_module.align_filters_with_table()
 
+    def schedule_maintenance(self) -> None:
+        """
+        Queue the database maintenance if the database has been modified.
+        """
+        if self.db.db_changed:
+            self.db.submit(self.db.run_maintenance)
+
     @override
     def closeEvent(self, event) -> None:
         """
         Handle the close event for the main window.
-        Run VACUUM if the database has been modified.
+        Run a bounded maintenance pass if the database has been modified
+        and release the database connections.
         """
+        self.maintenance_timer.stop()
+        self.db.interrupt()
         self.spokeduino_module.close_serial_port()
-        if self.db_changed:
-            self.db.vacuum()
+        self.setup_module.flush_settings(wait=True)
+        self.db.shutdown()
         event.accept()
 
     def tab_index_changed(self) -> None:
@@ -526,6 +554,19 @@ class Spokeduino(QMainWindow):
             self.state_machine.set_mode(
                 MeasurementMode.DEFAULT)
 
+    def show_integrity_errors(self, errors: list[str]) -> None:
+        """
+        Report problems found by the deferred integrity check.
+        """
+        if not errors:
+            return
+        self.status_bar.showMessage("Database integrity check failed")
+        self.messagebox.warn(
+            "The database integrity check found problems:\n\n"
+            + "\n".join(errors[:10])
+            + "\n\nPlease back up spokeduino.sqlite and restore "
+            "it from a previous copy.")
+
     def update_statusbar_unit(self) -> None:
         self.status_label_unit.setText(
             f"Unit: {self.unit_module.get_unit().value}")
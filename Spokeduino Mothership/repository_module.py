@@ -0,0 +1,128 @@
+from typing import NamedTuple
+from database_module import DatabaseModule
+from sql_queries import SQLQueries
+
+
+# Typed rows of the catalog and measurement queries. Being tuples they
+# take no more memory than the plain rows and still unpack by position,
+# their fields follow the column order of the queries.
+class SpokeRow(NamedTuple):
+    id: int
+    name: str
+    type: str
+    gauge: int
+    weight: float
+    dimensions: str
+    comment: str
+
+
+class MeasurementSetRow(NamedTuple):
+    id: int
+    comment: str
+    ts: str
+    # JSON array of [tension, deflection] pairs ordered by tension
+    measurements: str
+
+
+class MeasurementRow(NamedTuple):
+    tension: float
+    deflection: float
+
+
+class HubRow(NamedTuple):
+    id: int
+    name: str
+    manufacturer: str
+    axle_type: str
+    old: int
+    pcd_left: float
+    pcd_right: float
+    wl: float | None
+    wr: float | None
+    spoke_hole_diameter_left: float
+    spoke_hole_diameter_right: float
+    boost_classification: str | None
+    is_front: bool
+    is_disc: bool
+    is_centerlock: bool
+    is_jbend: bool
+    comment: str
+
+
+class RimRow(NamedTuple):
+    id: int
+    name: str
+    manufacturer: str
+    etrto_bsd: int
+    etrto_width: int
+    outer_width: float | None
+    erd: float
+    nipple_offset_left: float
+    nipple_offset_right: float
+    rim_depth: float
+    is_disc: bool
+    comment: str
+
+
+class RepositoryModule:
+    """
+    Typed access to spokes, measurement sets, measurements, hubs and
+    rims. Every method runs one query and returns its rows as the
+    matching row class, an empty list or None if nothing matches
+    or the query fails.
+    Runs on the calling thread, submit it to the database worker
+    when called from the GUI.
+    """
+
+    def __init__(self, db: DatabaseModule) -> None:
+        self.__db: DatabaseModule = db
+
+    def get_spokes_by_manufacturer(
+            self,
+            manufacturer_id: int) -> list[SpokeRow]:
+        return self.__db.execute_select(
+            SQLQueries.GET_SPOKES_BY_MANUFACTURER,
+            (manufacturer_id,), SpokeRow)
+
+    def get_spoke(self, spoke_id: int) -> SpokeRow | None:
+        spokes: list[SpokeRow] = self.__db.execute_select(
+            SQLQueries.GET_SPOKES_BY_ID, (spoke_id,), SpokeRow)
+        return spokes[0] if spokes else None
+
+    def get_measurement_sets(self,
+                             spoke_id: int,
+                             tensiometer_id: int,
+                             limit: int,
+                             offset: int) -> list[MeasurementSetRow]:
+        """
+        Return a page of the non-empty measurement sets
+        of a spoke and tensiometer, with their points.
+        """
+        return self.__db.execute_select(
+            SQLQueries.GET_MEASUREMENT_SETS_GROUPED,
+            (spoke_id, tensiometer_id, limit, offset), MeasurementSetRow)
+
+    def get_measurements(self, set_id: int) -> list[MeasurementRow]:
+        """
+        Return the points of a measurement set ordered by tension.
+        """
+        return self.__db.execute_select(
+            SQLQueries.GET_MEASUREMENTS_BY_ID, (set_id,), MeasurementRow)
+
+    def get_hubs_by_manufacturer(self, manufacturer_id: int) -> list[HubRow]:
+        return self.__db.execute_select(
+            SQLQueries.GET_HUBS_BY_MANUFACTURER, (manufacturer_id,), HubRow)
+
+    def get_hub(self, hub_id: int) -> HubRow | None:
+        hubs: list[HubRow] = self.__db.execute_select(
+            SQLQueries.GET_HUBS_BY_ID, (hub_id,), HubRow)
+        return hubs[0] if hubs else None
+
+    def get_rims_by_manufacturer(self, manufacturer_id: int) -> list[RimRow]:
+        return self.__db.execute_select(
+            SQLQueries.GET_RIMS_BY_MANUFACTURER, (manufacturer_id,), RimRow)
+
+    def get_rim(self, rim_id: int) -> RimRow | None:
+        rims: list[RimRow] = self.__db.execute_select(
+            SQLQueries.GET_RIMS_BY_ID, (rim_id,), RimRow)
+        return rims[0] if rims else None
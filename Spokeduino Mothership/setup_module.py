@@ -2,17 +2,19 @@ import logging
 import os
 import serial
 import serial.tools.list_ports
-from typing import Any
 from serial.tools.list_ports_common import ListPortInfo
 from PySide6.QtCore import QCoreApplication
+from PySide6.QtCore import QTimer
 from PySide6.QtCore import QTranslator
 from PySide6.QtWidgets import QMainWindow
-from database_module import DatabaseModule
+from database_module import DatabaseModule, PragmaProfile
+from helpers import ResultDispatcher
 from sql_queries import SQLQueries
 from ui import Ui_mainWindow
 
 
 class SetupModule:
+    SETTINGS_FLUSH_INTERVAL_MS: int = 2000
 
     def __init__(self,
                  main_window: QMainWindow,
@@ -26,6 +28,18 @@ class SetupModule:
         self.__current_language = "en"
         self.__db: DatabaseModule = db
 
+        # Settings are read once and served from memory, changes are
+        # collected and written in a single transaction by the timer
+        self.__settings: dict[str, str] = {
+            key: value for key, value in self.__db.execute_select(
+                query=SQLQueries.GET_SETTINGS, params=None)}
+        self.__pending_settings: dict[str, str] = {}
+        self.__dispatcher = ResultDispatcher()
+        self.__flush_timer = QTimer()
+        self.__flush_timer.setSingleShot(True)
+        self.__flush_timer.setInterval(self.SETTINGS_FLUSH_INTERVAL_MS)
+        self.__flush_timer.timeout.connect(self.flush_settings)
+
     def setup_language(self) -> None:
         """
         Load initial translations based on current language settings
@@ -82,35 +96,83 @@ class SetupModule:
             self.__ui.comboBoxSpokeduinoPort.addItem(port.device)
 
         # Load settings for selected port
-        spokeduino_port: list[str] = self.__db.execute_select(
-            query=SQLQueries.GET_SINGLE_SETTING,
-            params=("spokeduino_port",),)
+        spokeduino_port: str | None = self.get_setting("spokeduino_port")
         if not spokeduino_port:
             return
 
         index: int = self.__ui.comboBoxSpokeduinoPort.findText(
-            spokeduino_port[0][0])
+            spokeduino_port)
         if index != -1:
             self.__ui.comboBoxSpokeduinoPort.setCurrentIndex(index)
 
+    def get_setting(self,
+                    key: str,
+                    default: str | None = None) -> str | None:
+        """
+        Return a single setting from the in-memory settings cache.
+        """
+        return self.__settings.get(key, default)
+
     def save_setting(self, key: str, value: str) -> None:
         """
-        Save a single setting in the database.
-        If the setting already exists, update it; otherwise, insert it.
+        Save a single setting.
+        The cache is updated immediately, the database write is deferred
+        and coalesced with other changes until the flush timer fires.
+        """
+        if self.__settings.get(key) == value:
+            return
+        self.__settings[key] = value
+        self.__pending_settings[key] = value
+        if not self.__flush_timer.isActive():
+            self.__flush_timer.start()
+
+    def flush_settings(self, wait: bool = False) -> None:
+        """
+        Write all pending settings to the database in one transaction
+        on the database worker. Settings that fail to save stay pending
+        for the next flush.
+        :param wait: Block until the settings are written, used on close.
         """
-        self.__db.execute_query(
-            query=SQLQueries.UPSERT_SETTING,
-            params=(key, value))
+        self.__flush_timer.stop()
+        if not self.__pending_settings:
+            return
+
+        pending: dict[str, str] = self.__pending_settings
+        self.__pending_settings = {}
+        future = self.__db.submit(
+            self.__db.execute_many,
+            SQLQueries.UPSERT_SETTING,
+            list(pending.items()))
+        if wait:
+            self.__on_settings_flushed(pending, future.result())
+        else:
+            self.__dispatcher.dispatch(
+                future,
+                lambda result: self.__on_settings_flushed(pending, result))
+
+    def set_db_profile(self, profile: PragmaProfile) -> None:
+        """
+        Switch the database to another pragma profile.
+        A profile still pending in the settings cache is dropped,
+        so the next flush does not overwrite the new one.
+        """
+        self.__pending_settings.pop(DatabaseModule.PROFILE_SETTING, None)
+        self.__settings[DatabaseModule.PROFILE_SETTING] = profile.value
+        self.__db.set_profile(profile)
+
+    def __on_settings_flushed(self,
+                              pending: dict[str, str],
+                              result: int | None) -> None:
+        if result is None:
+            logging.error("Failed to save settings")
+            # Keep newer values saved in the meantime
+            self.__pending_settings = pending | self.__pending_settings
 
     def load_settings(self) -> None:
         """
-        Load settings from the database and update the UI accordingly.
+        Load settings from the settings cache and update the UI accordingly.
         """
-        settings: list[Any] = self.__db.execute_select(
-            query=SQLQueries.GET_SETTINGS, params=None)
-        settings_dict: dict[str, str] = {
-            key: value for key,
-            value in settings}
+        settings_dict: dict[str, str] = dict(self.__settings)
 
         # Load language selection
         language: str = settings_dict.get("language", "en")
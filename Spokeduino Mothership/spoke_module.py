@@ -9,8 +9,9 @@ from PySide6.QtWidgets import QTableWidgetItem
 from PySide6.QtWidgets import QComboBox
 from database_module import DatabaseModule
 from measurement_module import MeasurementModule
+from repository_module import RepositoryModule, SpokeRow
 from sql_queries import SQLQueries
-from helpers import Messagebox, Generics
+from helpers import Messagebox, Generics, ResultDispatcher
 from ui import Ui_mainWindow
 
 if TYPE_CHECKING:
@@ -30,7 +31,11 @@ class SpokeModule:
         self.__db: DatabaseModule = db
         self.__measurement: MeasurementModule = measurement_module
         self.__msgbox: Messagebox = messagebox
-        self.__current_spokes: list[tuple[Any, list[Any]]]
+        self.__dispatcher = ResultDispatcher()
+        self.__repository: RepositoryModule = RepositoryModule(db)
+        self.__current_spokes: list[SpokeRow] = []
+        # Only the newest spoke request may update the table
+        self.__spokes_request: int = 0
         self.__spoke_headers: list[str] = [
                 "Name",
                 "Type",
@@ -38,19 +43,21 @@ class SpokeModule:
                 "Weight",
                 "Dimensions",
                 "Comment"]
+        self.__measurement.set_measurements_loaded_callback(
+            self.toggle_spoke_related_buttons)
 
-    def update_fields(self, spoke: list[str]) -> None:
+    def update_fields(self, spoke: SpokeRow | None) -> None:
         """
         Update the fields and comboboxes with the provided spoke data.
         If no spoke is provided, clear the fields.
         """
         if spoke:
-            self.__ui.lineEditSpokeName.setText(str(spoke[0]))
-            self.__ui.comboBoxSpokeType.setCurrentText(str(spoke[1]))
-            self.__ui.lineEditSpokeGauge.setText(str(spoke[2]))
-            self.__ui.lineEditSpokeWeight.setText(str(spoke[3]))
-            self.__ui.lineEditSpokeDimension.setText(str(spoke[4]))
-            self.__ui.lineEditSpokeComment.setText(str(spoke[5]))
+            self.__ui.lineEditSpokeName.setText(str(spoke.name))
+            self.__ui.comboBoxSpokeType.setCurrentText(str(spoke.type))
+            self.__ui.lineEditSpokeGauge.setText(str(spoke.gauge))
+            self.__ui.lineEditSpokeWeight.setText(str(spoke.weight))
+            self.__ui.lineEditSpokeDimension.setText(str(spoke.dimensions))
+            self.__ui.lineEditSpokeComment.setText(str(spoke.comment))
             self.__main_window.status_label_spoke.setText(
                 f"{self.__ui.comboBoxSpokeManufacturer.currentText()} "
                 f"{self.__ui.lineEditSpokeName.text()} "
@@ -83,15 +90,12 @@ class SpokeModule:
         if spoke_id < 0:
             return
 
-        spokes: list[Any] = self.__db.execute_select(
-            query=SQLQueries.GET_SPOKES_BY_ID,
-            params=(spoke_id,))
-
-        if not spokes:
+        spoke: SpokeRow | None = self.__repository.get_spoke(spoke_id)
+        if spoke is None:
             return
 
-        self.update_fields(spokes[0][1:])
-        self.__measurement.load_measurements(spoke_id, None, False)
+        self.update_fields(spoke)
+        self.__measurement.load_measurements(spoke_id, None)
 
     def load_manufacturers(self) -> None:
         """
@@ -99,7 +103,7 @@ class SpokeModule:
         the dropdowns. Automatically loads spokes for the first manufacturer.
         """
         # Load manufacturers
-        manufacturers: list[Any] = self.__db.execute_select(
+        manufacturers: list[Any] = self.__db.execute_select_cached(
             query=SQLQueries.GET_SPOKE_MANUFACTURERS, params=None)
         if not manufacturers:
             return
@@ -110,7 +114,7 @@ class SpokeModule:
                 manufacturer[1], manufacturer[0])
 
         # Load types
-        spoke_types: list[Any] = self.__db.execute_select(
+        spoke_types: list[Any] = self.__db.execute_select_cached(
             query=SQLQueries.GET_SPOKE_TYPES, params=None)
         if not spoke_types:
             return
@@ -137,11 +141,23 @@ class SpokeModule:
             return
         manufacturer_id = int(manufacturer_id)
 
-        # Fetch spokes from the database
-        spokes: list[Any] = self.__db.execute_select(
-            query=SQLQueries.GET_SPOKES_BY_MANUFACTURER,
-            params=(manufacturer_id,)
-        )
+        # Fetch spokes on the database worker
+        self.__spokes_request += 1
+        request: int = self.__spokes_request
+        self.__dispatcher.dispatch(
+            self.__db.submit(
+                self.__repository.get_spokes_by_manufacturer,
+                manufacturer_id),
+            lambda spokes: self.__show_spokes(request, spokes))
+
+    def __show_spokes(self, request: int, spokes: list[SpokeRow]) -> None:
+        """
+        Populate the tableWidgetSpokeSelection with fetched spokes.
+        Results of outdated requests are discarded.
+        """
+        if request != self.__spokes_request:
+            return
+
         view: QTableWidget = self.__ui.tableWidgetSpokeSelection
         view.clearContents()  # Clear existing data
         view.setColumnCount(6)  # Set column count for your table structure
@@ -151,21 +167,12 @@ class SpokeModule:
             self.toggle_spoke_related_buttons()
             return
 
-        # Store current spokes with their IDs
-        self.__current_spokes = [
-            (spoke[0], list(spoke[1:]))
-            for spoke in spokes
-        ]
+        # Store current spokes
+        self.__current_spokes = spokes
         view.setRowCount(len(spokes))  # Set row count
 
         # Populate the table widget
-        for row_idx, (spoke_id, spoke_data) in enumerate(self.__current_spokes):
-            for col_idx, cell_data in enumerate(spoke_data):
-                item = QTableWidgetItem(str(cell_data))
-                item.setFlags(item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-                if col_idx == 0:  # Store the spoke ID in the first column
-                    item.setData(Qt.ItemDataRole.UserRole, spoke_id)
-                view.setItem(row_idx, col_idx, item)
+        self.__fill_spoke_table(view, spokes)
 
         # Adjust column widths (QHeaderView methods)
         header: QHeaderView = view.horizontalHeader()
@@ -197,12 +204,12 @@ class SpokeModule:
         to the current dataset in database order.
         """
         # Extract applicable types from current spokes
-        type_ids_in_use: set[Any] = {
-            spoke[1][1]
+        type_ids_in_use: set[str] = {
+            spoke.type
             for spoke in self.__current_spokes}
 
         # Fetch all types from the database
-        types: list[Any] = self.__db.execute_select(
+        types: list[Any] = self.__db.execute_select_cached(
             SQLQueries.GET_SPOKE_TYPES, None)
         if not types:
             return
@@ -227,26 +234,19 @@ class SpokeModule:
         type_filter: str = self.__ui.comboBoxFilterSpokeType.currentText().lower()
         gauge_filter: str = self.__ui.lineEditFilterSpokeGauge.text().lower()
 
-        filtered_spokes: list[tuple[int, list[str]]] = [
+        filtered_spokes: list[SpokeRow] = [
             spoke for spoke in self.__current_spokes
-            if (name_filter in spoke[1][0].lower()) and  # Match Name
-            (type_filter == spoke[1][1].lower()
+            if (name_filter in spoke.name.lower()) and  # Match Name
+            (type_filter == spoke.type.lower()
              if type_filter else True) and  # Match Type
-            (gauge_filter in str(spoke[1][2]).lower()
+            (gauge_filter in str(spoke.gauge).lower()
              if gauge_filter else True)  # Match Gauge
         ]
 
         view: QTableWidget = self.__ui.tableWidgetSpokeSelection
         view.clearContents()
         view.setRowCount(len(filtered_spokes))
-
-        for row_idx, (spoke_id, spoke_data) in enumerate(filtered_spokes):
-            for col_idx, cell_data in enumerate(spoke_data):
-                item = QTableWidgetItem(str(cell_data))
-                item.setFlags(item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-                if col_idx == 0:  # Store the spoke ID in the first column
-                    item.setData(Qt.ItemDataRole.UserRole, spoke_id)
-                view.setItem(row_idx, col_idx, item)
+        self.__fill_spoke_table(view, filtered_spokes)
 
         # Automatically select the first row if data is present
         if filtered_spokes:
@@ -254,6 +254,20 @@ class SpokeModule:
         else:
             view.clearSelection()
 
+    @staticmethod
+    def __fill_spoke_table(view: QTableWidget,
+                           spokes: list[SpokeRow]) -> None:
+        """
+        Write the spokes into the table, one column per field but the ID.
+        """
+        for row_idx, spoke in enumerate(spokes):
+            for col_idx, cell_data in enumerate(spoke[1:]):
+                item = QTableWidgetItem(str(cell_data))
+                item.setFlags(item.flags() & ~Qt.ItemFlag.ItemIsEditable)
+                if col_idx == 0:  # Store the spoke ID in the first column
+                    item.setData(Qt.ItemDataRole.UserRole, spoke.id)
+                view.setItem(row_idx, col_idx, item)
+
     def align_filters_with_table(self) -> None:
         """
         Align filter fields with the columns of tableWidgetSpokeSelection.
@@ -289,7 +303,8 @@ class SpokeModule:
         """
         Sort the tableWidgetSpokeSelection by the specified column.
         """
-        self.__current_spokes.sort(key=lambda x: x[1][column])
+        # Table columns start after the ID field
+        self.__current_spokes.sort(key=lambda spoke: spoke[column + 1])
         self.__ui.tableWidgetSpokeSelection.model().layoutChanged.emit()
 
     def get_spoke_data(self) -> tuple[int, int, float, str, str, str]:
@@ -320,12 +335,12 @@ class SpokeModule:
             spoke_name, dimension, comment = \
             self.get_spoke_data()
 
-        _ = self.__db.execute_query(
-            query=SQLQueries.MODIFY_SPOKE,
-            params=(spoke_name, type_id, gauge, weight,
-                    dimension, comment, spoke_id),
-        )
-        self.load_spokes()
+        self.__dispatcher.dispatch(
+            self.__db.execute_query_async(
+                query=SQLQueries.MODIFY_SPOKE,
+                params=(spoke_name, type_id, gauge, weight,
+                        dimension, comment, spoke_id)),
+            lambda _: self.load_spokes())
 
     def delete_spoke(self) -> None:
         """
@@ -337,11 +352,11 @@ class SpokeModule:
             self.__msgbox.err("spoke not selected")
             return
 
-        _ = self.__db.execute_query(
-            query=SQLQueries.DELETE_SPOKE,
-            params=(spoke_id,)
-        )
-        self.load_spokes()
+        self.__dispatcher.dispatch(
+            self.__db.execute_query_async(
+                query=SQLQueries.DELETE_SPOKE,
+                params=(spoke_id,)),
+            lambda _: self.load_spokes())
 
     def save_as_spoke(self) -> None:
         """
@@ -358,16 +373,13 @@ class SpokeModule:
             spoke_name, dimension, comment = \
             self.get_spoke_data()
 
-        new_spoke_id: int | None = self.__db.execute_query(
-            query=SQLQueries.ADD_SPOKE,
-            params=(manufacturer_id, spoke_name,
-                    type_id, gauge, weight, dimension, comment),
-        )
-        if new_spoke_id is None:
-            return
-        new_spoke_id = int(new_spoke_id)
-
-        self.load_spokes()
+        self.__dispatcher.dispatch(
+            self.__db.execute_query_async(
+                query=SQLQueries.ADD_SPOKE,
+                params=(manufacturer_id, spoke_name,
+                        type_id, gauge, weight, dimension, comment)),
+            lambda new_spoke_id:
+                self.load_spokes() if new_spoke_id is not None else None)
 
     def create_new_manufacturer(self) -> None:
         """
@@ -377,12 +389,19 @@ class SpokeModule:
         if not manufacturer_name:
             return
 
-        new_manufacturer_id: int | None = self.__db.execute_query(
-            query=SQLQueries.ADD_SPOKE_MANUFACTURER,
-            params=(manufacturer_name,),
-        )
-
         self.__ui.lineEditNewSpokeManufacturer.clear()
+        self.__dispatcher.dispatch(
+            self.__db.execute_query_async(
+                query=SQLQueries.ADD_SPOKE_MANUFACTURER,
+                params=(manufacturer_name,)),
+            self.__on_manufacturer_created)
+
+    def __on_manufacturer_created(
+            self,
+            new_manufacturer_id: int | None) -> None:
+        """
+        Reload the manufacturers and select the newly created one.
+        """
         self.load_manufacturers()
 
         if new_manufacturer_id is None:
@@ -1,4 +1,3 @@
-from typing import Any
 import threading
 import time
 import serial
@@ -8,7 +7,6 @@ from database_module import DatabaseModule
 from setup_module import SetupModule
 from tensioning_module import TensioningModule
 from helpers import TextChecker, StateMachine, MeasurementMode, SpokeduinoState
-from sql_queries import SQLQueries
 from unit_module import UnitEnum, UnitModule
 from ui import Ui_mainWindow
 
@@ -64,18 +62,15 @@ class SpokeduinoModule:
 
     def get_spokeduino_enabled(self) -> bool:
         """
-        Fetch the current Spokeduino enabled setting from the database.
+        Fetch the current Spokeduino enabled setting from the settings.
         If not set, initialize it to disabled.
         """
         # Fetch the current spokeduino enabled setting
-        setting: list[Any] = self.__db.execute_select(
-            query=SQLQueries.GET_SINGLE_SETTING,
-            params=("spokeduino_enabled",)
-        )
+        setting: str | None = self.__setup.get_setting("spokeduino_enabled")
         if not setting:
             self.__setup.save_setting("spokeduino_enabled", "0")
             return False
-        return setting[0][0] == "1"
+        return setting == "1"
 
     def update_spokeduino_enabled(self,
                                 current_state: bool,
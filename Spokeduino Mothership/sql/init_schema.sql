@@ -138,3 +138,5 @@ CREATE TABLE settings
 	key TEXT PRIMARY KEY,
 	value TEXT
 );
+
+PRAGMA user_version = 1;
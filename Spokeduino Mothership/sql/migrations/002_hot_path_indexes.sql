@@ -0,0 +1,31 @@
+-- Indexes for the measurement and catalog lookups run on every
+-- spoke selection, tab switch and measurement load.
+
+-- GET_MEASUREMENT_SETS: equality on both columns, the implicit rowid
+-- suffix keeps the rows in id order without a sort
+CREATE INDEX IF NOT EXISTS idx_spoke_measurement_sets_spoke_tensiometer
+    ON spoke_measurement_sets (spoke_id, tensiometer_id);
+
+-- Cascading deletes of tensiometers
+CREATE INDEX IF NOT EXISTS idx_spoke_measurement_sets_tensiometer
+    ON spoke_measurement_sets (tensiometer_id);
+
+-- GET_MEASUREMENTS and GET_MEASUREMENTS_BY_ID: covering,
+-- already ordered by tension within a set
+CREATE INDEX IF NOT EXISTS idx_spoke_measurements_set_tension
+    ON spoke_measurements (set_id, tension, deflection);
+
+-- GET_SPOKES_BY_MANUFACTURER
+CREATE INDEX IF NOT EXISTS idx_spoke_models_manufacturer
+    ON spoke_models (manufacturer_id);
+
+-- Cascading deletes of spoke types
+CREATE INDEX IF NOT EXISTS idx_spoke_models_type
+    ON spoke_models (type_id);
+
+-- GET_HUBS_BY_MANUFACTURER and GET_RIMS_BY_MANUFACTURER
+CREATE INDEX IF NOT EXISTS idx_hub_models_manufacturer
+    ON hub_models (manufacturer_id);
+
+CREATE INDEX IF NOT EXISTS idx_rim_models_manufacturer
+    ON rim_models (manufacturer_id);
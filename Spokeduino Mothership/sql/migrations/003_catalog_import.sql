@@ -0,0 +1,26 @@
+-- GET_HUBS, ADD_HUB and MODIFY_HUB use the boost classification,
+-- which hub_models never had. Hubs without one keep NULL.
+ALTER TABLE hub_models
+    ADD COLUMN boost_classification_id INTEGER
+    REFERENCES boost_classifications(id) ON DELETE SET NULL;
+
+-- Catalog imports match existing models by manufacturer and name,
+-- the manufacturer prefix still serves the *_BY_MANUFACTURER queries
+DROP INDEX IF EXISTS idx_spoke_models_manufacturer;
+CREATE INDEX IF NOT EXISTS idx_spoke_models_manufacturer_name
+    ON spoke_models (manufacturer_id, name);
+
+DROP INDEX IF EXISTS idx_hub_models_manufacturer;
+CREATE INDEX IF NOT EXISTS idx_hub_models_manufacturer_name
+    ON hub_models (manufacturer_id, name);
+
+DROP INDEX IF EXISTS idx_rim_models_manufacturer;
+CREATE INDEX IF NOT EXISTS idx_rim_models_manufacturer_name
+    ON rim_models (manufacturer_id, name);
+
+-- Cascading deletes of axle types and boost classifications
+CREATE INDEX IF NOT EXISTS idx_hub_models_axle_type
+    ON hub_models (axle_type_id);
+
+CREATE INDEX IF NOT EXISTS idx_hub_models_boost_classification
+    ON hub_models (boost_classification_id);
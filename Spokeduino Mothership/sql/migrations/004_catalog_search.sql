@@ -0,0 +1,138 @@
+-- Full-text index over the spoke, hub and rim catalogs.
+-- The rowid encodes the model: id * 4 + 1 for spokes,
+-- id * 4 + 2 for hubs and id * 4 + 3 for rims.
+-- Hubs index their OLD and PCD, rims their ETRTO size and ERD
+-- as dimensions.
+CREATE VIRTUAL TABLE catalog_search USING fts5(
+    name, dimensions, comment, manufacturer,
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '1 2 3'
+);
+
+INSERT INTO catalog_search (rowid, name, dimensions, comment, manufacturer)
+SELECT
+    s.id * 4 + 1, s.name, s.dimensions, s.comment, m.name
+FROM
+    spoke_models s
+JOIN spoke_manufacturers m ON s.manufacturer_id = m.id;
+
+INSERT INTO catalog_search (rowid, name, dimensions, comment, manufacturer)
+SELECT
+    h.id * 4 + 2, h.name,
+    printf('%d OLD %g/%g PCD', h.old, h.pcd_left, h.pcd_right),
+    h.comment, m.name
+FROM
+    hub_models h
+JOIN hub_manufacturers m ON h.manufacturer_id = m.id;
+
+INSERT INTO catalog_search (rowid, name, dimensions, comment, manufacturer)
+SELECT
+    r.id * 4 + 3, r.name,
+    printf('%d-%d %g ERD', r.etrto_width, r.etrto_bsd, r.erd),
+    r.comment, m.name
+FROM
+    rim_models r
+JOIN rim_manufacturers m ON r.manufacturer_id = m.id;
+
+-- Spokes
+CREATE TRIGGER catalog_search_spoke_insert AFTER INSERT ON spoke_models
+BEGIN
+    INSERT INTO catalog_search (rowid, name, dimensions, comment, manufacturer)
+    VALUES (
+        new.id * 4 + 1, new.name, new.dimensions, new.comment,
+        (SELECT name FROM spoke_manufacturers
+         WHERE id = new.manufacturer_id));
+END;
+
+CREATE TRIGGER catalog_search_spoke_update AFTER UPDATE ON spoke_models
+BEGIN
+    DELETE FROM catalog_search WHERE rowid = old.id * 4 + 1;
+    INSERT INTO catalog_search (rowid, name, dimensions, comment, manufacturer)
+    VALUES (
+        new.id * 4 + 1, new.name, new.dimensions, new.comment,
+        (SELECT name FROM spoke_manufacturers
+         WHERE id = new.manufacturer_id));
+END;
+
+CREATE TRIGGER catalog_search_spoke_delete AFTER DELETE ON spoke_models
+BEGIN
+    DELETE FROM catalog_search WHERE rowid = old.id * 4 + 1;
+END;
+
+CREATE TRIGGER catalog_search_spoke_manufacturer
+AFTER UPDATE OF name ON spoke_manufacturers
+BEGIN
+    UPDATE catalog_search SET manufacturer = new.name
+    WHERE rowid IN (
+        SELECT id * 4 + 1 FROM spoke_models WHERE manufacturer_id = new.id);
+END;
+
+-- Hubs
+CREATE TRIGGER catalog_search_hub_insert AFTER INSERT ON hub_models
+BEGIN
+    INSERT INTO catalog_search (rowid, name, dimensions, comment, manufacturer)
+    VALUES (
+        new.id * 4 + 2, new.name,
+        printf('%d OLD %g/%g PCD', new.old, new.pcd_left, new.pcd_right),
+        new.comment,
+        (SELECT name FROM hub_manufacturers WHERE id = new.manufacturer_id));
+END;
+
+CREATE TRIGGER catalog_search_hub_update AFTER UPDATE ON hub_models
+BEGIN
+    DELETE FROM catalog_search WHERE rowid = old.id * 4 + 2;
+    INSERT INTO catalog_search (rowid, name, dimensions, comment, manufacturer)
+    VALUES (
+        new.id * 4 + 2, new.name,
+        printf('%d OLD %g/%g PCD', new.old, new.pcd_left, new.pcd_right),
+        new.comment,
+        (SELECT name FROM hub_manufacturers WHERE id = new.manufacturer_id));
+END;
+
+CREATE TRIGGER catalog_search_hub_delete AFTER DELETE ON hub_models
+BEGIN
+    DELETE FROM catalog_search WHERE rowid = old.id * 4 + 2;
+END;
+
+CREATE TRIGGER catalog_search_hub_manufacturer
+AFTER UPDATE OF name ON hub_manufacturers
+BEGIN
+    UPDATE catalog_search SET manufacturer = new.name
+    WHERE rowid IN (
+        SELECT id * 4 + 2 FROM hub_models WHERE manufacturer_id = new.id);
+END;
+
+-- Rims
+CREATE TRIGGER catalog_search_rim_insert AFTER INSERT ON rim_models
+BEGIN
+    INSERT INTO catalog_search (rowid, name, dimensions, comment, manufacturer)
+    VALUES (
+        new.id * 4 + 3, new.name,
+        printf('%d-%d %g ERD', new.etrto_width, new.etrto_bsd, new.erd),
+        new.comment,
+        (SELECT name FROM rim_manufacturers WHERE id = new.manufacturer_id));
+END;
+
+CREATE TRIGGER catalog_search_rim_update AFTER UPDATE ON rim_models
+BEGIN
+    DELETE FROM catalog_search WHERE rowid = old.id * 4 + 3;
+    INSERT INTO catalog_search (rowid, name, dimensions, comment, manufacturer)
+    VALUES (
+        new.id * 4 + 3, new.name,
+        printf('%d-%d %g ERD', new.etrto_width, new.etrto_bsd, new.erd),
+        new.comment,
+        (SELECT name FROM rim_manufacturers WHERE id = new.manufacturer_id));
+END;
+
+CREATE TRIGGER catalog_search_rim_delete AFTER DELETE ON rim_models
+BEGIN
+    DELETE FROM catalog_search WHERE rowid = old.id * 4 + 3;
+END;
+
+CREATE TRIGGER catalog_search_rim_manufacturer
+AFTER UPDATE OF name ON rim_manufacturers
+BEGIN
+    UPDATE catalog_search SET manufacturer = new.name
+    WHERE rowid IN (
+        SELECT id * 4 + 3 FROM rim_models WHERE manufacturer_id = new.id);
+END;
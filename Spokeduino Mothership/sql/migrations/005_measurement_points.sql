@@ -0,0 +1,27 @@
+-- Points of a measurement set packed as little-endian float64
+-- (tension, deflection) pairs ordered by tension, see
+-- DatabaseModule.get_measurement_points(). NULL until packed.
+ALTER TABLE spoke_measurement_sets ADD COLUMN points BLOB;
+
+-- Any change to the rows drops the packed copy, it is rebuilt
+-- from the rows on the next read
+CREATE TRIGGER spoke_measurements_points_insert
+AFTER INSERT ON spoke_measurements
+BEGIN
+    UPDATE spoke_measurement_sets SET points = NULL
+    WHERE id = new.set_id AND points IS NOT NULL;
+END;
+
+CREATE TRIGGER spoke_measurements_points_update
+AFTER UPDATE ON spoke_measurements
+BEGIN
+    UPDATE spoke_measurement_sets SET points = NULL
+    WHERE id IN (old.set_id, new.set_id) AND points IS NOT NULL;
+END;
+
+CREATE TRIGGER spoke_measurements_points_delete
+AFTER DELETE ON spoke_measurements
+BEGIN
+    UPDATE spoke_measurement_sets SET points = NULL
+    WHERE id = old.set_id AND points IS NOT NULL;
+END;
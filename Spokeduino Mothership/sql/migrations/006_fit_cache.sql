@@ -0,0 +1,34 @@
+-- Fitted models of measurement sets serialized by FitModel.to_json()
+-- and restored by FitModel.from_json(), one per fit type and
+-- fitter version. fit_type holds the FitType value.
+CREATE TABLE fit_cache
+(
+    set_id INTEGER NOT NULL,
+    fit_type INTEGER NOT NULL,
+    fitter_version INTEGER NOT NULL,
+    params TEXT NOT NULL,
+    PRIMARY KEY (set_id, fit_type, fitter_version),
+    FOREIGN KEY (set_id)
+        REFERENCES spoke_measurement_sets(id)
+        ON DELETE CASCADE
+) WITHOUT ROWID;
+
+-- Any change to the rows of a set drops its fitted models,
+-- deleting the set drops them through the foreign key
+CREATE TRIGGER spoke_measurements_fit_cache_insert
+AFTER INSERT ON spoke_measurements
+BEGIN
+    DELETE FROM fit_cache WHERE set_id = new.set_id;
+END;
+
+CREATE TRIGGER spoke_measurements_fit_cache_update
+AFTER UPDATE ON spoke_measurements
+BEGIN
+    DELETE FROM fit_cache WHERE set_id IN (old.set_id, new.set_id);
+END;
+
+CREATE TRIGGER spoke_measurements_fit_cache_delete
+AFTER DELETE ON spoke_measurements
+BEGIN
+    DELETE FROM fit_cache WHERE set_id = old.set_id;
+END;
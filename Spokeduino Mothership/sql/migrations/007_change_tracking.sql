@@ -0,0 +1,133 @@
+-- Change tracking for merging the databases of several benches,
+-- see MergeModule. Every insert or update of a spoke or a measurement
+-- set takes the next value of change_sequence as its change_seq, so a
+-- merge only reads the rows changed after the last value it pulled.
+-- Changing the rows of a set counts as a change of the set.
+CREATE TABLE change_sequence
+(
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    seq INTEGER NOT NULL
+);
+
+-- Last change_seq merged from every other database,
+-- by the database_uuid setting of that database
+CREATE TABLE merge_sources
+(
+    source_uuid TEXT PRIMARY KEY,
+    last_seq INTEGER NOT NULL,
+    ts DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Only the indexed columns touch the search index, change_seq
+-- updates would otherwise index new spokes twice
+DROP TRIGGER catalog_search_spoke_update;
+CREATE TRIGGER catalog_search_spoke_update
+AFTER UPDATE OF manufacturer_id, name, dimensions, comment ON spoke_models
+BEGIN
+    DELETE FROM catalog_search WHERE rowid = old.id * 4 + 1;
+    INSERT INTO catalog_search (rowid, name, dimensions, comment, manufacturer)
+    VALUES (
+        new.id * 4 + 1, new.name, new.dimensions, new.comment,
+        (SELECT name FROM spoke_manufacturers
+         WHERE id = new.manufacturer_id));
+END;
+
+ALTER TABLE spoke_models ADD COLUMN change_seq INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE spoke_measurement_sets
+    ADD COLUMN change_seq INTEGER NOT NULL DEFAULT 0;
+-- Identifies a set across databases, its id differs in every database.
+-- Random version 4 UUID, kept when a set is edited.
+ALTER TABLE spoke_measurement_sets ADD COLUMN uuid TEXT;
+
+UPDATE spoke_models SET change_seq = id;
+UPDATE spoke_measurement_sets SET
+    change_seq = id + (SELECT COALESCE(MAX(id), 0) FROM spoke_models),
+    uuid = lower(
+        hex(randomblob(4)) || '-' || hex(randomblob(2)) || '-4' ||
+        substr(hex(randomblob(2)), 2) || '-' ||
+        substr('89ab', 1 + (abs(random()) % 4), 1) ||
+        substr(hex(randomblob(2)), 2) || '-' || hex(randomblob(6)));
+INSERT INTO change_sequence (id, seq)
+SELECT 1, MAX(
+    (SELECT COALESCE(MAX(change_seq), 0) FROM spoke_models),
+    (SELECT COALESCE(MAX(change_seq), 0) FROM spoke_measurement_sets));
+
+-- Delta reads of a merge
+CREATE INDEX idx_spoke_models_change_seq
+    ON spoke_models (change_seq);
+CREATE INDEX idx_spoke_measurement_sets_change_seq
+    ON spoke_measurement_sets (change_seq);
+CREATE UNIQUE INDEX idx_spoke_measurement_sets_uuid
+    ON spoke_measurement_sets (uuid);
+-- Spokes are matched by manufacturer, name and dimensions
+CREATE INDEX idx_spoke_models_manufacturer_name_dimensions
+    ON spoke_models (manufacturer_id, name, dimensions);
+DROP INDEX IF EXISTS idx_spoke_models_manufacturer_name;
+
+CREATE TRIGGER spoke_models_change_insert
+AFTER INSERT ON spoke_models
+BEGIN
+    UPDATE change_sequence SET seq = seq + 1;
+    UPDATE spoke_models SET change_seq = (SELECT seq FROM change_sequence)
+    WHERE id = new.id;
+END;
+
+CREATE TRIGGER spoke_models_change_update
+AFTER UPDATE OF manufacturer_id, type_id, gauge, weight, name,
+    dimensions, comment ON spoke_models
+BEGIN
+    UPDATE change_sequence SET seq = seq + 1;
+    UPDATE spoke_models SET change_seq = (SELECT seq FROM change_sequence)
+    WHERE id = new.id;
+END;
+
+CREATE TRIGGER spoke_measurement_sets_change_insert
+AFTER INSERT ON spoke_measurement_sets
+BEGIN
+    UPDATE change_sequence SET seq = seq + 1;
+    UPDATE spoke_measurement_sets SET
+        change_seq = (SELECT seq FROM change_sequence),
+        uuid = COALESCE(new.uuid, lower(
+            hex(randomblob(4)) || '-' || hex(randomblob(2)) || '-4' ||
+            substr(hex(randomblob(2)), 2) || '-' ||
+            substr('89ab', 1 + (abs(random()) % 4), 1) ||
+            substr(hex(randomblob(2)), 2) || '-' || hex(randomblob(6))))
+    WHERE id = new.id;
+END;
+
+CREATE TRIGGER spoke_measurement_sets_change_update
+AFTER UPDATE OF spoke_id, tensiometer_id, comment, ts, uuid
+    ON spoke_measurement_sets
+BEGIN
+    UPDATE change_sequence SET seq = seq + 1;
+    UPDATE spoke_measurement_sets SET
+        change_seq = (SELECT seq FROM change_sequence)
+    WHERE id = new.id;
+END;
+
+CREATE TRIGGER spoke_measurements_change_insert
+AFTER INSERT ON spoke_measurements
+BEGIN
+    UPDATE change_sequence SET seq = seq + 1;
+    UPDATE spoke_measurement_sets SET
+        change_seq = (SELECT seq FROM change_sequence)
+    WHERE id = new.set_id;
+END;
+
+CREATE TRIGGER spoke_measurements_change_update
+AFTER UPDATE ON spoke_measurements
+BEGIN
+    UPDATE change_sequence SET seq = seq + 1;
+    UPDATE spoke_measurement_sets SET
+        change_seq = (SELECT seq FROM change_sequence)
+    WHERE id IN (old.set_id, new.set_id);
+END;
+
+CREATE TRIGGER spoke_measurements_change_delete
+AFTER DELETE ON spoke_measurements
+BEGIN
+    UPDATE change_sequence SET seq = seq + 1;
+    UPDATE spoke_measurement_sets SET
+        change_seq = (SELECT seq FROM change_sequence)
+    WHERE id = old.set_id;
+END;
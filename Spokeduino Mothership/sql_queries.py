@@ -58,13 +58,34 @@ class SQLQueries:
                     id
                 ASC"""
 
-    GET_MEASUREMENTS: str = """
+    # One row per non-empty set, its points as a JSON array of
+    # [tension, deflection] pairs ordered by tension, paged by set
+    GET_MEASUREMENT_SETS_GROUPED: str = """
                 SELECT
-                    set_id, tension, deflection
+                    s.id, s.comment, strftime('%Y-%m-%d %H:%M', s.ts) AS ts,
+                    (SELECT
+                        json_group_array(json_array(m.tension, m.deflection))
+                    FROM
+                        (SELECT
+                            tension, deflection
+                        FROM
+                            spoke_measurements
+                        WHERE
+                            set_id = s.id
+                        ORDER BY
+                            tension
+                        ASC) m) AS measurements
                 FROM
-                    spoke_measurements
+                    spoke_measurement_sets s
                 WHERE
-                    set_id IN"""
+                    s.spoke_id = ? AND s.tensiometer_id = ?
+                AND
+                    EXISTS (
+                        SELECT 1 FROM spoke_measurements WHERE set_id = s.id)
+                ORDER BY
+                    s.id
+                ASC
+                LIMIT ? OFFSET ?"""
 
     GET_MEASUREMENTS_BY_ID: str = """
                 SELECT
@@ -77,6 +98,32 @@ class SQLQueries:
                     tension
                 ASC"""
 
+    GET_MEASUREMENT_POINTS: str = """
+                SELECT
+                    points
+                FROM
+                    spoke_measurement_sets
+                WHERE
+                    id = ?"""
+
+    GET_MEASUREMENT_SET_UUID: str = """
+                SELECT
+                    uuid
+                FROM
+                    spoke_measurement_sets
+                WHERE
+                    id = ?"""
+
+    GET_FIT_CACHE: str = """
+                SELECT
+                    params
+                FROM
+                    fit_cache
+                WHERE
+                    set_id = ? AND
+                    fit_type = ? AND
+                    fitter_version = ?"""
+
     GET_HUB_MANUFACTURERS: str = """
                 SELECT
                     id, name
@@ -94,14 +141,14 @@ class SQLQueries:
                     hub_models h
                 JOIN hub_manufacturers hm ON h.manufacturer_id = hm.id
                 JOIN axle_types a ON h.axle_type_id = a.id
-                JOIN boost_classifications b
+                LEFT JOIN boost_classifications b
                 ON h.boost_classification_id = b.id"""
 
     GET_HUBS_BY_MANUFACTURER: str = \
-        GET_HUBS + " WHERE s.manufacturer_id = ?"
+        GET_HUBS + " WHERE h.manufacturer_id = ?"
 
     GET_HUBS_BY_ID: str = \
-        GET_HUBS + " WHERE s.id = ?"
+        GET_HUBS + " WHERE h.id = ?"
 
     GET_RIM_MANUFACTURERS: str = """
                 SELECT
@@ -120,10 +167,10 @@ class SQLQueries:
                 JOIN rim_manufacturers rm ON r.manufacturer_id = rm.id"""
 
     GET_RIMS_BY_MANUFACTURER: str = \
-        GET_RIMS + " WHERE s.manufacturer_id = ?"
+        GET_RIMS + " WHERE r.manufacturer_id = ?"
 
     GET_RIMS_BY_ID: str = \
-        GET_RIMS + " WHERE s.id = ?"
+        GET_RIMS + " WHERE r.id = ?"
 
     GET_AXLE_TYPES: str = """
                 SELECT
@@ -143,6 +190,22 @@ class SQLQueries:
                 FROM
                     etrto_description"""
 
+    # Ranked by bm25 with name matches weighing most, the rowid
+    # encodes the model as id * 4 + kind (1 spoke, 2 hub, 3 rim)
+    SEARCH_CATALOG: str = """
+                SELECT
+                    rowid % 4 AS kind, rowid / 4 AS model_id,
+                    name, dimensions, manufacturer
+                FROM
+                    catalog_search
+                WHERE
+                    catalog_search MATCH ?
+                AND
+                    (? IS NULL OR rowid % 4 = ?)
+                ORDER BY
+                    bm25(catalog_search, 10.0, 2.0, 1.0, 5.0)
+                LIMIT ?"""
+
     ADD_MEASUREMENT: str = """
                 INSERT INTO
                     spoke_measurements (set_id, tension, deflection)
@@ -202,6 +265,33 @@ class SQLQueries:
                     is_disc, comment
                 ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"""
 
+    SET_FIT_CACHE: str = """
+                INSERT OR REPLACE INTO fit_cache
+                    (set_id, fit_type, fitter_version, params)
+                SELECT
+                    id, ?, ?, ?
+                FROM
+                    spoke_measurement_sets
+                WHERE
+                    id = ? AND
+                    points = ?"""
+
+    SET_MEASUREMENT_SET_UUID: str = """
+                UPDATE
+                    spoke_measurement_sets
+                SET
+                    uuid = ?
+                WHERE
+                    id = ?"""
+
+    SET_MEASUREMENT_POINTS: str = """
+                UPDATE
+                    spoke_measurement_sets
+                SET
+                    points = ?
+                WHERE
+                    id = ?"""
+
     MODIFY_SPOKE: str = """
                 UPDATE
                     spoke_models
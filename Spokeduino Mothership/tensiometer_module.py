@@ -34,7 +34,7 @@ class TensiometerModule:
         Load all tensiometers from the database
         and populate comboBoxTensiometer.
         """
-        tensiometers: list[Any] = self.__db.execute_select(
+        tensiometers: list[Any] = self.__db.execute_select_cached(
             query=SQLQueries.GET_TENSIOMETERS, params=None)
         if not tensiometers:
             return
@@ -44,15 +44,13 @@ class TensiometerModule:
             self.__ui.comboBoxTensiometer.addItem(tensiometer[1], tensiometer[0])
 
     def get_primary_tensiometer(self) -> int:
-        # Fetch the primary tensiometer ID from settings
-        primary_tensiometer: list[Any] = self.__db.execute_select(
-            query=SQLQueries.GET_SINGLE_SETTING,
-            params=("tensiometer_id",)
-        )
-        if primary_tensiometer is None or not primary_tensiometer:
+        # Fetch the primary tensiometer ID from the settings cache
+        primary_tensiometer: str | None = self.__setup.get_setting(
+            "tensiometer_id")
+        if not primary_tensiometer:
             self.save_tensiometer()
             return 0
-        return int(primary_tensiometer[0][0])
+        return int(primary_tensiometer)
 
     def get_selected_tensiometers(self) -> list[tuple[int, str]]:
         """
@@ -115,7 +113,7 @@ class TensiometerModule:
             model = QStandardItemModel(self.__ui.comboBoxTensiometer)
             self.__ui.comboBoxTensiometer.setModel(model)  # Set the model early
 
-            for tensiometer in self.__db.execute_select(
+            for tensiometer in self.__db.execute_select_cached(
                     query=SQLQueries.GET_TENSIOMETERS, params=None):
                 item = QStandardItem(tensiometer[1])
                 item.setFlags(
@@ -1,4 +1,4 @@
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING
 import numpy as np
 from PySide6.QtCore import Qt
 from PySide6.QtCore import QTimer
@@ -15,9 +15,8 @@ from helpers import Generics
 from helpers import StateMachine
 from helpers import SpokeduinoState
 from ui import Ui_mainWindow
-from calculation_module import TensionDeflectionFitter
+from calculation_module import FitModel, TensionDeflectionFitter
 from visualisation_module import PyQtGraphCanvas, VisualisationModule
-from sql_queries import SQLQueries
 
 if TYPE_CHECKING:
     from mothership import Spokeduino
@@ -50,8 +49,10 @@ class TensioningModule:
         self.__tensions_right: np.ndarray
         self.__target_left: float = 0.0
         self.__target_right: float = 0.0
-        self.__fit_left: dict[Any, Any] | None = None
-        self.__fit_right: dict[Any, Any] | None = None
+        self.__fit_left: FitModel | None = None
+        self.__fit_right: FitModel | None = None
+        # Only the newest fit requested for a side may be used
+        self.__fit_requests: dict[bool, int] = {True: 0, False: 0}
         self.__cell_changed_signal_connected = False
         self.__clockwise: bool = True
         self.__is_left: bool = False
@@ -395,36 +396,56 @@ class TensioningModule:
             f"{self.__ui.lineEditSpokeComment.text()}\n"
             f"{item.text()}"
         )
+        spoke_label: str = (
+            f"{spoke_name} {self.__ui.lineEditSpokeDimension.text()}")
 
         fit_type, _ = self.__measurement.get_fit()
-        measurements: list[tuple[float, float]] = self.__db.execute_select(
-            query=SQLQueries.GET_MEASUREMENTS_BY_ID,
-            params=(measurement_id,))
-
-        fit_model: dict = self.__fitter.fit_data(measurements, fit_type)
+        self.__fit_requests[is_left] += 1
+        request: int = self.__fit_requests[is_left]
+        self.__measurement.fit_measurement_set(
+            measurement_id, fit_type,
+            lambda fit_model: self.__on_spoke_fitted(
+                is_left, request, spoke_label, spoke_details, fit_model))
+
+    def __on_spoke_fitted(self,
+                          is_left: bool,
+                          request: int,
+                          spoke_label: str,
+                          spoke_details: str,
+                          fit_model: FitModel | None) -> None:
+        """
+        Use the fitted model of the selected measurement for a side.
+        Results of outdated requests are discarded.
+        """
+        if request != self.__fit_requests[is_left] or fit_model is None:
+            return
 
         if is_left:
             self.__ui.plainTextEditSelectedSpokeLeft.setPlainText(spoke_details)
             self.__main_window.status_label_spoke_left.setText(
-                f"<- {spoke_name} {self.__ui.lineEditSpokeDimension.text()}")
+                f"<- {spoke_label}")
             self.__fit_left = fit_model
         else:
             self.__ui.plainTextEditSelectedSpokeRight.setPlainText(spoke_details)
             self.__main_window.status_label_spoke_right.setText(
-                f"{spoke_name} {self.__ui.lineEditSpokeDimension.text()} ->")
+                f"{spoke_label} ->")
             self.__fit_right = fit_model
 
         if self.__fit_left is not None and self.__fit_right is not None:
             self.__ui.tensioningTab.setEnabled(True)
 
-    def calculate_tension(self, fit_model, deflection: float) -> float:
+    def calculate_tension(self,
+                          fit_model: FitModel | None,
+                          deflection: float) -> float:
         """
         Given the string from a cell containing deflection (mm),
         parse and compute tension. If invalid or empty, return 0.
         Replace the formula with your own as needed.
         """
+        if fit_model is None:
+            return 0.0
         try:
-            tension = self.__fitter.calculate_tension(fit_model, deflection)
+            tension = fit_model.tension(deflection)
             if tension is None:
                 return 0.0
             return tension
@@ -1,10 +1,10 @@
-from typing import Any, cast
+from typing import cast
 import numpy as np
 from PySide6.QtCore import Qt
 from PySide6.QtWidgets import QWidget, QVBoxLayout
 import pyqtgraph as pg
 from PySide6.QtCore import QRectF
-from calculation_module import FitType, TensionDeflectionFitter
+from calculation_module import FitModel, TensionDeflectionFitter
 
 
 class PyQtGraphCanvas(QWidget):
@@ -48,64 +48,6 @@ class VisualisationModule:
         self.__deviation_viewbox: pg.ViewBox
         self.__dynamic_items: list = []
 
-    def __predict_deflection(
-        self,
-        fit_type: FitType,
-        model: Any,
-        tensions: np.ndarray
-    ) -> np.ndarray:
-        """
-        Calculate deflection values from a range of tension values,
-        using the given fit type and model.
-
-        :param fit_type: The FitType used (e.g., FitType.LINEAR).
-        :type fit_type: FitType
-        :param model: The fitted model (coeffs, spline object, etc.).
-        :type model: Any
-        :param tensions: Array of tension values (N).
-        :type tensions: np.ndarray
-        :param fit_model: The complete dictionary with scaling_params.
-        :type fit_model: dict
-        :return: An array of deflection values corresponding to `tensions`.
-        :rtype: np.ndarray
-        """
-        if fit_type in (
-                FitType.LINEAR,
-                FitType.QUADRATIC,
-                FitType.CUBIC,
-                FitType.QUARTIC):
-            # model is np.polyfit coefficients
-            poly = np.poly1d(model)
-            return poly(tensions)
-
-        elif fit_type == FitType.SPLINE:
-            # model is a CubicSpline object
-            spline = model
-            return spline(tensions)
-
-        elif fit_type == FitType.EXPONENTIAL:
-            # model = (a, b), y = a * exp(b * x)
-            a, b = model
-            # For deflection: d = a * exp(b * tension)
-            return a * np.exp(b * tensions)
-
-        elif fit_type == FitType.LOGARITHMIC:
-            # model = (a, b), d = a + b * ln(tension)
-            a, b = model
-            safe_tensions = np.where(tensions <= 0, np.nan, tensions)
-            return a + b * np.log(safe_tensions)
-
-        elif fit_type == FitType.POWER_LAW:
-            # model = (a, b), d = a * tension^b
-            a, b = model
-            # If tension < 0, that yields an invalid deflection => produce NaN
-            safe_tensions = np.where(tensions < 0, np.nan, tensions)
-            return a * (safe_tensions ** b)
-
-        else:
-            # Unsupported or unknown fit type => return all zeros or NaNs
-            return np.full_like(tensions, np.nan)
-
     def clear_fit_plot(self, plot_widget: pg.PlotWidget) -> None:
         if hasattr(self, "__deviation_viewbox"):
             self.__deviation_viewbox.clear()
@@ -114,7 +56,7 @@ class VisualisationModule:
     def update_fit_plot(
         self,
         plot_widget: pg.PlotWidget,
-        fit_model: dict,
+        fit_model: FitModel,
         data: list[tuple[float, float]],
         step: float = 100.0,
         deviation_range: tuple[float, float] = (-20, 20),
@@ -164,27 +106,15 @@ class VisualisationModule:
             self.__fit_legend_added = True
             plot_item.addLegend(offset=(10, 10))
 
-        # Extract fit_model info
-        t_min = fit_model["t_min"]
-        t_max = fit_model["t_max"]
-        fit_type = fit_model["fit_type"]
-        model = fit_model["model"]
-
         # Generate tension values (X) and predicted deflections (Y)
-        tensions = np.arange(t_min, t_max + step, step)
-        deflections = self.__predict_deflection(
-            fit_type, model, tensions)
+        tensions = np.arange(fit_model.t_min, fit_model.t_max + step, step)
+        deflections = fit_model.predict(tensions)
 
-        # Calculate deviations
+        # Calculate deviations, NaN where no tension is found
         measured_tensions, measured_deflections = zip(*data)
-        calculated_tensions = [
-            self.fitter.calculate_tension(fit_model, d_meas)
-            for d_meas in measured_deflections
-        ]
-        deviations = [
-            (t_calc - t_meas) if t_calc is not None else np.nan
-            for t_calc, t_meas in zip(calculated_tensions, measured_tensions)
-        ]
+        deviations = fit_model.invert(
+            np.asarray(measured_deflections, dtype=float)
+        ) - np.asarray(measured_tensions, dtype=float)
 
         # Plot main data on the main PlotItem/view
         # Fitted curve (blue)